@@ -0,0 +1,11 @@
+"""
+UAV Threat Classification – track association entry point.
+
+Strips drone ids from a simulated fleet's fixes, re-links them to tracks
+frame by frame and reports how cleanly each drone was re-identified.
+"""
+
+from prediction.association import main
+
+if __name__ == "__main__":
+    main()
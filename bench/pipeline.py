@@ -0,0 +1,241 @@
+"""
+Pipeline benchmarks: time every stage of a run over a matrix of fleet sizes
+and step counts, with fixed seeds, and compare against a saved baseline.
+
+Each case runs the whole pipeline `repeats` times on a fresh fleet, timing
+each stage separately (best and mean wall time, fixes/s where a fix is one
+drone position). Peak memory is measured on one extra traced pass, with
+tracemalloc reset before each stage, so tracing does not slow the timed
+passes. File-writing stages write into a temporary directory. enrich_loop
+(the reference per-position loop) is timed alongside enrich_fleet but left
+out of a case's total.
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from config.constants import NUM_THREAT_DRONES
+from core.utils import base_time, spawn_rngs
+from export.columnar import export_fleet_columnar
+from export.json_export import export_threat_telemetry
+from export.logger import write_logs
+from export.map_builder import build_map
+from metrics.behavior import enrich_positions_with_metrics
+from metrics.fleet import enrich_fleet_metrics
+from metrics.risk_raster import get_risk_raster
+from metrics.rolling import compute_rolling_features
+from metrics.scoring import compute_threat_scores
+from metrics.swarm import compute_swarm_scores
+from simulation.simulator import _create_drones, _run_simulation_loop
+
+DEFAULT_DRONES = (5, 50, 200)
+DEFAULT_STEPS = (80, 1000)
+DEFAULT_SEED = 0
+
+# A stage counts as regressed when its fixes/s drops by more than this
+DEFAULT_TOLERANCE = 0.2
+
+# Stage name -> fn(drones, out_dir); run in this order on one fleet
+StageFn = Callable[[list, str], None]
+
+
+def _threat_drone(drones: list) -> Any:
+    return next((d for d in drones if d.role == "threat"), drones[-1])
+
+
+STAGES: Tuple[Tuple[str, StageFn], ...] = (
+    ("enrich_loop", lambda drones, out: enrich_positions_with_metrics(drones)),
+    ("enrich_fleet", lambda drones, out: enrich_fleet_metrics(drones)),
+    ("rolling", lambda drones, out: compute_rolling_features(drones)),
+    ("scores", lambda drones, out: compute_threat_scores(drones)),
+    ("swarm", lambda drones, out: compute_swarm_scores(drones)),
+    (
+        "write_logs",
+        lambda drones, out: write_logs(
+            drones,
+            os.path.join(out, "drone_log.txt"),
+            os.path.join(out, "drone_metrics.txt"),
+        ),
+    ),
+    ("build_map", lambda drones, out: build_map(drones, os.path.join(out, "map.html"))),
+    (
+        "export_json",
+        lambda drones, out: export_threat_telemetry(
+            _threat_drone(drones), os.path.join(out, "threat_telemetry.json")
+        ),
+    ),
+    (
+        "export_columnar",
+        lambda drones, out: export_fleet_columnar(drones, os.path.join(out, "fleet")),
+    ),
+)
+
+STAGE_NAMES = ("simulate",) + tuple(name for name, _ in STAGES)
+
+# Reference implementations timed for comparison but not part of a real run
+_REFERENCE_STAGES = frozenset({"enrich_loop"})
+
+
+def _run_pipeline(
+    num_drones: int,
+    num_steps: int,
+    num_threats: int,
+    seed: int,
+    out_dir: str,
+    on_stage: Callable[[str], None],
+) -> None:
+    """Run every stage once; on_stage(name) is called after each one."""
+    rngs = spawn_rngs(seed, num_drones + 1)
+    drones = _create_drones(rngs[:num_drones], num_threats)
+    _run_simulation_loop(drones, rngs[num_drones], base_time(seed), num_steps)
+    on_stage("simulate")
+    for name, fn in STAGES:
+        fn(drones, out_dir)
+        on_stage(name)
+
+
+def bench_case(
+    num_drones: int,
+    num_steps: int,
+    num_threats: int = NUM_THREAT_DRONES,
+    seed: int = DEFAULT_SEED,
+    repeats: int = 3,
+) -> Dict[str, Any]:
+    """Time and memory-profile every stage for one fleet size / step count."""
+    num_threats = min(num_threats, num_drones)
+    fixes = num_drones * num_steps
+    times: Dict[str, List[float]] = {name: [] for name in STAGE_NAMES}
+    peaks: Dict[str, int] = {}
+
+    with tempfile.TemporaryDirectory(prefix="uav-bench-") as out_dir:
+        for _ in range(repeats):
+            last = time.perf_counter()
+
+            def timed(name: str) -> None:
+                nonlocal last
+                now = time.perf_counter()
+                times[name].append(now - last)
+                last = time.perf_counter()
+
+            _run_pipeline(num_drones, num_steps, num_threats, seed, out_dir, timed)
+
+        def traced(name: str) -> None:
+            peaks[name] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.reset_peak()
+
+        tracemalloc.start()
+        try:
+            _run_pipeline(num_drones, num_steps, num_threats, seed, out_dir, traced)
+        finally:
+            tracemalloc.stop()
+
+    stages = {}
+    for name in STAGE_NAMES:
+        best = min(times[name])
+        stages[name] = {
+            "best_s": round(best, 6),
+            "mean_s": round(sum(times[name]) / len(times[name]), 6),
+            "fixes_per_s": round(fixes / best, 1) if best > 0 else None,
+            "peak_mib": round(peaks[name] / (1 << 20), 3),
+        }
+    total = sum(
+        stage["best_s"] for name, stage in stages.items() if name not in _REFERENCE_STAGES
+    )
+    return {
+        "drones": num_drones,
+        "threats": num_threats,
+        "steps": num_steps,
+        "fixes": fixes,
+        "total_s": round(total, 6),
+        "fixes_per_s": round(fixes / total, 1) if total > 0 else None,
+        "peak_mib": max(stage["peak_mib"] for stage in stages.values()),
+        "stages": stages,
+    }
+
+
+def run_benchmarks(
+    drone_counts: Sequence[int] = DEFAULT_DRONES,
+    step_counts: Sequence[int] = DEFAULT_STEPS,
+    num_threats: int = NUM_THREAT_DRONES,
+    seed: int = DEFAULT_SEED,
+    repeats: int = 3,
+) -> Dict[str, Any]:
+    """Benchmark every (drones, steps) pair; returns the JSON report."""
+    get_risk_raster()  # build / map the cached raster outside the timings
+    cases = [
+        bench_case(n, steps, num_threats, seed, repeats)
+        for n in drone_counts
+        for steps in step_counts
+    ]
+    return {
+        "seed": seed,
+        "repeats": repeats,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "cases": cases,
+    }
+
+
+def compare(
+    report: Dict[str, Any], baseline: Dict[str, Any], tolerance: float = DEFAULT_TOLERANCE
+) -> List[str]:
+    """
+    Stages whose fixes/s fell more than tolerance below the baseline's, as
+    readable lines. Cases or stages missing from either side are skipped.
+    """
+    base_cases = {(c["drones"], c["threats"], c["steps"]): c for c in baseline["cases"]}
+    regressions = []
+    for case in report["cases"]:
+        base = base_cases.get((case["drones"], case["threats"], case["steps"]))
+        if base is None:
+            continue
+        for name, stage in case["stages"].items():
+            base_rate = base["stages"].get(name, {}).get("fixes_per_s")
+            rate = stage["fixes_per_s"]
+            if base_rate and rate is not None and rate < base_rate * (1 - tolerance):
+                regressions.append(
+                    f"{name} @ {case['drones']} drones x {case['steps']} steps: "
+                    f"{rate:,.0f} fixes/s vs baseline {base_rate:,.0f} "
+                    f"({rate / base_rate - 1:+.0%})"
+                )
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark every pipeline stage.")
+    parser.add_argument("--drones", type=int, nargs="+", default=list(DEFAULT_DRONES))
+    parser.add_argument("--steps", type=int, nargs="+", default=list(DEFAULT_STEPS))
+    parser.add_argument("--threats", type=int, default=NUM_THREAT_DRONES)
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--repeats", type=int, default=3, help="timed passes per case")
+    parser.add_argument("--output", metavar="PATH", help="write the report here (JSON)")
+    parser.add_argument("--baseline", metavar="PATH", help="fail on regressions vs this report")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(
+        args.drones, args.steps, args.threats, args.seed, max(1, args.repeats)
+    )
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    print(json.dumps(report, indent=2))
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
@@ -0,0 +1,10 @@
+"""
+UAV Threat Classification – Benchmark entry point.
+
+Times every pipeline stage over a matrix of fleet sizes and step counts.
+"""
+
+from bench.pipeline import main
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,8 @@ Centralizes numerical parameters used across the simulation.
 """
 
 NUM_DRONES = 5
+# The last NUM_THREAT_DRONES of the fleet are threats; more than one is a swarm
+NUM_THREAT_DRONES = 1
 NUM_STEPS = 80  # More steps for smoother animation
 
 ALTITUDE_MIN = 30.0
@@ -15,6 +17,71 @@ LOG_FILE = "drone_log.txt"
 MAP_FILE = "drone_locations.html"
 METRICS_LOG_FILE = "drone_metrics.txt"
 THREAT_JSON_FILE = "threat_telemetry.json"
+# Whole-fleet columnar telemetry: "columns" (memory-mappable directory),
+# "arrow" or "parquet" (need pyarrow)
+FLEET_COLUMNAR_PATH = "fleet_telemetry"
+FLEET_COLUMNAR_FORMAT = "columns"
+# Streaming mode: every drone's scored fixes as NDJSON, written per step
+FLEET_NDJSON_FILE = "fleet_telemetry.ndjson"
 
-# Simulation timing
+# Run report (stage timings, counters, profile) written by main.py --report
+RUN_REPORT_FILE = "run_report.json"
+
+# Drones listed per step in the map sidebar (ranked by threat_score)
+MAP_TOP_K = 10
+
+# Console output: "rows" (echo every logged row), "summary" or "quiet"
+CONSOLE_MODE = "summary"
+
+# Simulation timing; the clock starts at SIMULATION_EPOCH plus a
+# seed-derived offset (under a year), so a replayed seed has the same
+# timestamps
 SECONDS_PER_STEP = 1.0
+SIMULATION_EPOCH = "2025-01-01T00:00:00"
+
+# Sliding window of the rolling behaviour features (metrics/rolling.py)
+ROLLING_WINDOW_S = 10.0
+
+# Precomputed risk raster: cell size (degrees) and on-disk cache directory
+RISK_RASTER_CELL_DEG = 0.0002
+RISK_RASTER_CACHE_DIR = ".cache/risk_raster"
+
+# Cached per-scenario feature matrices (metrics/features.py)
+FEATURE_CACHE_DIR = ".cache/features"
+
+# Threat asset attraction over large POI catalogues: POIs within the cutoff
+# (in raster cells) are summed exactly, the rest come from a precompiled
+# raster of this cell
+ATTRACTION_CUTOFF_CELLS = 3.0
+ATTRACTION_CELL_DEG = 0.0005
+
+# Swarm score (metrics/swarm.py): weight per neighbour, co-loitering
+# neighbour and other drone converging on the same POI
+SWARM_NEIGHBOUR_WEIGHT = 0.5
+SWARM_COLOITER_WEIGHT = 1.0
+SWARM_CONVERGE_WEIGHT = 1.0
+
+# Streaming service: bounded queue, track table and line size; throughput
+# target for one core (a busy port: hundreds of drones at several Hz)
+STREAM_QUEUE_SIZE = 4096
+STREAM_MAX_TRACKS = 10_000
+STREAM_MAX_LINE_BYTES = 64 * 1024
+STREAM_TAIL_POLL_S = 0.2
+STREAM_TARGET_FIXES_PER_S = 2500
+
+# Track prediction (prediction/kalman.py): constant-velocity Kalman filter
+# noise, launch speed bound, ellipse confidence and default horizon
+PREDICT_ACCEL_NOISE_MPS2 = 5.0
+PREDICT_MEASUREMENT_NOISE_M = 5.0
+PREDICT_MAX_SPEED_MPS = 20.0
+PREDICT_ELLIPSE_CONFIDENCE = 0.95
+PREDICT_HORIZON_S = 30.0
+
+# Detection-to-track association (prediction/association.py): distance gate
+# (also the spatial hash cell) and frames a track may go undetected before
+# it is dropped
+ASSOC_GATE_M = 100.0
+ASSOC_MAX_MISSES = 3
+
+# Live map server (streaming/live_map.py): default port
+LIVE_MAP_PORT = 8765
@@ -7,3 +7,8 @@ RISK_ZONE_RADIUS_KM = 1.0
 
 # Hover detection: distance moved below this (km) counts as hovering
 HOVER_DISTANCE_THRESHOLD_KM = 0.01  # ~10 m
+
+# Swarm detection: drones within this distance (km) of each other are
+# neighbours; drones closing on a POI within this distance (km) converge
+SWARM_RADIUS_KM = 0.2
+SWARM_CONVERGE_KM = 2.0
@@ -2,14 +2,33 @@
 Pure geographic math for UAV simulation.
 
 No simulation logic; only coordinate and distance computations.
+
+Scalar functions take and return floats. The ``*_array`` / ``*_matrix`` /
+``track_*`` variants are NumPy kernels for batch work: they use the same
+formulas in the same operation order, so they agree with the scalar versions
+to within ``ARRAY_DISTANCE_TOLERANCE_KM`` and ``ARRAY_BEARING_TOLERANCE_DEG``
+(NumPy's SIMD ``arctan2`` and its ``x * x`` squaring may differ from libm's
+``atan2`` / ``pow`` by one ulp). Pass ``exact=True`` to route both through
+libm and get bit-identical results, at several times the cost.
 """
 
 import math
+from typing import Union
+
+import numpy as np
+
+ArrayLike = Union[float, np.ndarray]
+
+EARTH_RADIUS_KM = 6371.0
+
+# Max disagreement between the NumPy kernels and the scalar functions
+ARRAY_DISTANCE_TOLERANCE_KM = 1e-9
+ARRAY_BEARING_TOLERANCE_DEG = 1e-9
 
 
 def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     """Great-circle distance between two points (km)."""
-    r = 6371.0
+    r = EARTH_RADIUS_KM
     phi1 = math.radians(lat1)
     phi2 = math.radians(lat2)
     dphi = math.radians(lat2 - lat1)
@@ -38,3 +57,154 @@ def bearing_deg(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
 def clamp(value: float, min_v: float, max_v: float) -> float:
     """Clamp a value into [min_v, max_v]."""
     return max(min_v, min(max_v, value))
+
+
+_libm_atan2 = np.frompyfunc(math.atan2, 2, 1)
+
+
+def _atan2(y: np.ndarray, x: np.ndarray, exact: bool) -> np.ndarray:
+    """Elementwise atan2; libm when exact, NumPy's vectorised loop otherwise."""
+    if exact:
+        return np.asarray(_libm_atan2(y, x), dtype=np.float64)
+    return np.arctan2(y, x)
+
+
+def _square(x: np.ndarray, exact: bool) -> np.ndarray:
+    """Elementwise x ** 2; libm ``pow`` when exact, plain multiply otherwise."""
+    if exact:
+        return np.float_power(x, 2.0)
+    return x * x
+
+
+def haversine_km_array(
+    lat1: ArrayLike,
+    lon1: ArrayLike,
+    lat2: ArrayLike,
+    lon2: ArrayLike,
+    exact: bool = False,
+) -> np.ndarray:
+    """Elementwise great-circle distance (km); inputs broadcast together."""
+    lat1 = np.asarray(lat1, dtype=np.float64)
+    lon1 = np.asarray(lon1, dtype=np.float64)
+    lat2 = np.asarray(lat2, dtype=np.float64)
+    lon2 = np.asarray(lon2, dtype=np.float64)
+    phi1 = np.radians(lat1)
+    phi2 = np.radians(lat2)
+    dphi = np.radians(lat2 - lat1)
+    dlambda = np.radians(lon2 - lon1)
+    a = _square(np.sin(dphi / 2), exact) + np.cos(phi1) * np.cos(phi2) * _square(
+        np.sin(dlambda / 2), exact
+    )
+    c = 2 * _atan2(np.sqrt(a), np.sqrt(1 - a), exact)
+    return EARTH_RADIUS_KM * c
+
+
+def bearing_deg_array(
+    lat1: ArrayLike,
+    lon1: ArrayLike,
+    lat2: ArrayLike,
+    lon2: ArrayLike,
+    exact: bool = False,
+) -> np.ndarray:
+    """Elementwise bearing (degrees, [0, 360)); inputs broadcast together."""
+    phi1 = np.radians(np.asarray(lat1, dtype=np.float64))
+    phi2 = np.radians(np.asarray(lat2, dtype=np.float64))
+    dlambda = np.radians(
+        np.asarray(lon2, dtype=np.float64) - np.asarray(lon1, dtype=np.float64)
+    )
+    x = np.sin(dlambda) * np.cos(phi2)
+    y = np.cos(phi1) * np.sin(phi2) - np.sin(phi1) * np.cos(phi2) * np.cos(dlambda)
+    brng = np.degrees(_atan2(x, y, exact))
+    return (brng + 360.0) % 360.0
+
+
+def haversine_km_matrix(
+    lats1: ArrayLike,
+    lons1: ArrayLike,
+    lats2: ArrayLike,
+    lons2: ArrayLike,
+    exact: bool = False,
+) -> np.ndarray:
+    """Many-to-many distances (km): result[i, j] is from point i of set 1 to point j of set 2."""
+    lats1 = np.asarray(lats1, dtype=np.float64).reshape(-1, 1)
+    lons1 = np.asarray(lons1, dtype=np.float64).reshape(-1, 1)
+    lats2 = np.asarray(lats2, dtype=np.float64).reshape(1, -1)
+    lons2 = np.asarray(lons2, dtype=np.float64).reshape(1, -1)
+    return haversine_km_array(lats1, lons1, lats2, lons2, exact)
+
+
+def bearing_deg_matrix(
+    lats1: ArrayLike,
+    lons1: ArrayLike,
+    lats2: ArrayLike,
+    lons2: ArrayLike,
+    exact: bool = False,
+) -> np.ndarray:
+    """Many-to-many bearings (degrees): result[i, j] is from point i of set 1 to point j of set 2."""
+    lats1 = np.asarray(lats1, dtype=np.float64).reshape(-1, 1)
+    lons1 = np.asarray(lons1, dtype=np.float64).reshape(-1, 1)
+    lats2 = np.asarray(lats2, dtype=np.float64).reshape(1, -1)
+    lons2 = np.asarray(lons2, dtype=np.float64).reshape(1, -1)
+    return bearing_deg_array(lats1, lons1, lats2, lons2, exact)
+
+
+def track_distances_km(
+    lats: ArrayLike, lons: ArrayLike, exact: bool = False
+) -> np.ndarray:
+    """Distance (km) between consecutive points of a track; length n - 1."""
+    lats = np.asarray(lats, dtype=np.float64)
+    lons = np.asarray(lons, dtype=np.float64)
+    return haversine_km_array(lats[:-1], lons[:-1], lats[1:], lons[1:], exact)
+
+
+def track_bearings_deg(
+    lats: ArrayLike, lons: ArrayLike, exact: bool = False
+) -> np.ndarray:
+    """Bearing (degrees) from each point of a track to the next; length n - 1."""
+    lats = np.asarray(lats, dtype=np.float64)
+    lons = np.asarray(lons, dtype=np.float64)
+    return bearing_deg_array(lats[:-1], lons[:-1], lats[1:], lons[1:], exact)
+
+
+def simplify_track(lats: ArrayLike, lons: ArrayLike, tolerance_deg: float) -> np.ndarray:
+    """
+    Douglas-Peucker simplification of a track. Returns the ascending indices
+    of the points to keep (always the first and last); every dropped point
+    lies within tolerance_deg of the kept polyline, measured on a local
+    plane with longitude scaled by cos(latitude).
+    """
+    lats = np.asarray(lats, dtype=np.float64)
+    lons = np.asarray(lons, dtype=np.float64)
+    n = lats.shape[0]
+    if n <= 2:
+        return np.arange(n)
+    y = lats
+    x = lons * math.cos(math.radians(float(lats.mean())))
+
+    keep = np.zeros(n, dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, n - 1)]
+    while stack:
+        start, end = stack.pop()
+        if end - start < 2:
+            continue
+        dx = x[end] - x[start]
+        dy = y[end] - y[start]
+        px = x[start + 1 : end] - x[start]
+        py = y[start + 1 : end] - y[start]
+        seg2 = dx * dx + dy * dy
+        if seg2 == 0.0:
+            dist2 = px * px + py * py
+        else:
+            # Distance to the segment (projection clamped to its ends)
+            t = np.clip((px * dx + py * dy) / seg2, 0.0, 1.0)
+            ex = px - t * dx
+            ey = py - t * dy
+            dist2 = ex * ex + ey * ey
+        worst = int(np.argmax(dist2))
+        if dist2[worst] > tolerance_deg * tolerance_deg:
+            split = start + 1 + worst
+            keep[split] = True
+            stack.append((start, split))
+            stack.append((split, end))
+    return np.flatnonzero(keep)
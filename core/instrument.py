@@ -0,0 +1,192 @@
+"""
+Lightweight run instrumentation: stage timers, work counters and optional
+cProfile / tracemalloc capture, summarised as a JSON-ready run report.
+
+Pipeline code marks stages with `with stage("name"):` and counts work with
+count("name", n). Both report to the active Instrumentation, if any. With
+none active, stage() hands back a shared no-op context and count() returns
+at once, so instrumented code costs a global lookup when disabled.
+"""
+
+import cProfile
+import pstats
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+# Functions listed in a report's profile section (by cumulative time)
+PROFILE_TOP = 25
+
+_ACTIVE: Optional["Instrumentation"] = None
+
+
+class _NullStage:
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *exc: Any) -> bool:
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    """Times one stage; with tracemalloc on, also its peak traced memory."""
+
+    __slots__ = ("run", "name", "start", "child_peak")
+
+    def __init__(self, run: "Instrumentation", name: str) -> None:
+        self.run = run
+        self.name = name
+        self.start = 0.0
+        self.child_peak = 0
+
+    def __enter__(self) -> None:
+        stack = self.run._stack
+        if self.run.trace_memory:
+            # The peak so far belongs to the enclosing stage's window
+            if stack:
+                parent = stack[-1]
+                parent.child_peak = max(parent.child_peak, tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+        stack.append(self)
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc: Any) -> bool:
+        elapsed = time.perf_counter() - self.start
+        stack = self.run._stack
+        stack.pop()
+        entry = self.run.stages.get(self.name)
+        if entry is None:
+            entry = self.run.stages[self.name] = {"seconds": 0.0, "calls": 0}
+        entry["seconds"] += elapsed
+        entry["calls"] += 1
+        if self.run.trace_memory:
+            peak = max(tracemalloc.get_traced_memory()[1], self.child_peak)
+            entry["peak_bytes"] = max(entry.get("peak_bytes", 0), peak)
+            if stack:
+                stack[-1].child_peak = max(stack[-1].child_peak, peak)
+        return False
+
+
+class Instrumentation:
+    """Stage timings, counters and metadata for one instrumented run."""
+
+    def __init__(self, profile: bool = False, trace_memory: bool = False) -> None:
+        self.profile = profile
+        self.trace_memory = trace_memory
+        self.stages: Dict[str, Dict[str, Any]] = {}
+        self.counters: Dict[str, int] = {}
+        self.meta: Dict[str, Any] = {}
+        self.wall_s = 0.0
+        self.profiler: Optional[cProfile.Profile] = None
+        self._stack: List[_Stage] = []
+        self._started = 0.0
+        self._owns_tracemalloc = False
+
+    def start(self) -> None:
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._owns_tracemalloc = True
+        if self.profile:
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+        self._started = time.perf_counter()
+
+    def stop(self) -> None:
+        self.wall_s += time.perf_counter() - self._started
+        if self.profiler is not None:
+            self.profiler.disable()
+        if self._owns_tracemalloc:
+            tracemalloc.stop()
+            self._owns_tracemalloc = False
+
+    def stage(self, name: str) -> _Stage:
+        return _Stage(self, name)
+
+    def count(self, name: str, n: int = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def dump_profile(self, path: str) -> None:
+        """Write raw cProfile stats (pstats / snakeviz format)."""
+        if self.profiler is not None:
+            self.profiler.dump_stats(path)
+
+    def _profile_top(self, top: int) -> List[Dict[str, Any]]:
+        stats = pstats.Stats(self.profiler)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE)
+        rows = []
+        for func in stats.fcn_list[:top]:
+            _, calls, tottime, cumtime, _ = stats.stats[func]
+            filename, line, name = func
+            rows.append(
+                {
+                    "function": f"{filename}:{line}({name})",
+                    "calls": calls,
+                    "tottime_s": round(tottime, 6),
+                    "cumtime_s": round(cumtime, 6),
+                }
+            )
+        return rows
+
+    def report(self, top: int = PROFILE_TOP) -> Dict[str, Any]:
+        """Machine-readable summary: meta, wall time, stages, counters, profile."""
+        stages = {}
+        for name, entry in self.stages.items():
+            out = {"seconds": round(entry["seconds"], 6), "calls": entry["calls"]}
+            if "peak_bytes" in entry:
+                out["peak_mib"] = round(entry["peak_bytes"] / (1 << 20), 3)
+            stages[name] = out
+        report: Dict[str, Any] = dict(self.meta)
+        report["wall_s"] = round(self.wall_s, 6)
+        report["stages"] = stages
+        report["counters"] = dict(self.counters)
+        positions = self.counters.get("positions")
+        if positions and self.wall_s > 0:
+            report["positions_per_s"] = round(positions / self.wall_s, 1)
+        if self.profiler is not None:
+            report["profile"] = self._profile_top(top)
+        return report
+
+
+@contextmanager
+def instrumented(
+    profile: bool = False, trace_memory: bool = False
+) -> Iterator[Instrumentation]:
+    """Make a fresh Instrumentation the active one for the with-block."""
+    global _ACTIVE
+    run = Instrumentation(profile, trace_memory)
+    previous = _ACTIVE
+    _ACTIVE = run
+    run.start()
+    try:
+        yield run
+    finally:
+        run.stop()
+        _ACTIVE = previous
+
+
+def stage(name: str) -> Any:
+    """Context manager timing a stage of the active run (no-op when none)."""
+    run = _ACTIVE
+    if run is None:
+        return _NULL_STAGE
+    return run.stage(name)
+
+
+def count(name: str, n: int = 1) -> None:
+    """Add n to a counter of the active run (no-op when none)."""
+    run = _ACTIVE
+    if run is not None:
+        run.count(name, n)
+
+
+def annotate(**fields: Any) -> None:
+    """Record metadata (seed, fleet size, ...) in the active run's report."""
+    run = _ACTIVE
+    if run is not None:
+        run.meta.update(fields)
@@ -1,21 +1,51 @@
 """
 General utilities for the UAV simulation.
+
+Randomness comes from explicit NumPy Generators: a run's seed feeds a
+SeedSequence whose spawned children give every drone (and the threat swarm)
+an independent stream, and the simulated clock starts at a seed-derived
+time, so a recorded seed replays the run exactly, timestamps included.
 """
 
-import random
 import datetime
+from typing import List
+
+import numpy as np
+
+from config.constants import SIMULATION_EPOCH
+
+_SECONDS_PER_YEAR = 365 * 24 * 3600
+
 
+def new_seed() -> int:
+    """Fresh 63-bit seed from OS entropy, for runs that were not given one."""
+    return int(np.random.SeedSequence().generate_state(1, np.uint64)[0]) >> 1
 
-def generate_drone_id() -> str:
+
+def spawn_rngs(seed: int, count: int) -> List[np.random.Generator]:
+    """count independent Generators derived from seed."""
+    return [np.random.default_rng(s) for s in np.random.SeedSequence(seed).spawn(count)]
+
+
+def generate_drone_id(rng: np.random.Generator) -> str:
     """Generate a DJI-style drone ID."""
-    return f"DJI-{random.randint(100000, 999999)}"
+    return f"DJI-{int(rng.integers(100000, 1000000))}"
 
 
-def generate_altitude(alt_min: float, alt_max: float) -> float:
+def generate_altitude(alt_min: float, alt_max: float, rng: np.random.Generator) -> float:
     """Random altitude within a realistic drone range."""
-    return round(random.uniform(alt_min, alt_max), 4)
+    return round(float(rng.uniform(alt_min, alt_max)), 4)
+
+
+def generate_altitudes(
+    alt_min: float, alt_max: float, count: int, rng: np.random.Generator
+) -> List[float]:
+    """count altitudes at once; the same values count generate_altitude calls give."""
+    return [round(a, 4) for a in rng.uniform(alt_min, alt_max, count).tolist()]
 
 
-def base_time() -> datetime.datetime:
-    """Base timestamp for the simulation."""
-    return datetime.datetime.now()
+def base_time(seed: int) -> datetime.datetime:
+    """Base timestamp of a seeded run: SIMULATION_EPOCH plus a seed-derived offset."""
+    return datetime.datetime.fromisoformat(SIMULATION_EPOCH) + datetime.timedelta(
+        seconds=seed % _SECONDS_PER_YEAR
+    )
@@ -0,0 +1,255 @@
+"""
+Columnar binary export of every drone's enriched track (downstream ML).
+
+Columns carry the telemetry JSON field names (plus seed, -1 when unknown).
+Rows are written in row groups, so long runs can append as they go:
+
+- "columns": a directory of raw little-endian column files plus meta.json.
+  Readers memory-map the columns (load_columnar) without parsing; string
+  fields are int32 codes into per-field dictionaries stored in meta.json.
+- "arrow": Arrow IPC file, one record batch per row group; zero-copy
+  readable via pyarrow.memory_map. Needs pyarrow.
+- "parquet": one Parquet row group per row group. Needs pyarrow.
+"""
+
+import json
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from simulation.drone import Drone
+from simulation.track import Track
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as pa_ipc
+    import pyarrow.parquet as pq
+except ImportError:  # optional: only the arrow / parquet formats need it
+    pa = None
+
+FORMATS = ("columns", "arrow", "parquet")
+
+# Telemetry JSON schema -> on-disk dtype ("U" marks dictionary-encoded strings)
+TELEMETRY_COLUMNS: Dict[str, str] = {
+    "timestamp_utc": "U",
+    "lat": "<f8",
+    "lon": "<f8",
+    "altitude_m": "<f8",
+    "drone_id": "U",
+    "drone_type": "U",
+    "step": "<i8",
+    "heading_deg": "<f8",
+    "ground_speed_mps": "<f8",
+    "in_risk_zone": "u1",
+    "nearest_high_risk": "U",
+    "time_in_risk_zone_s": "<f8",
+    "flight_deviation_deg": "<f8",
+    "hover_flag": "u1",
+    "seed": "<i8",
+}
+
+_STRING_CODE_DTYPE = "<i4"
+
+
+def _column_dtype(name: str) -> str:
+    kind = TELEMETRY_COLUMNS[name]
+    return _STRING_CODE_DTYPE if kind == "U" else kind
+
+
+def track_columns(drone: Drone, seed: Optional[int] = None) -> Dict[str, Any]:
+    """
+    One drone's track as telemetry columns. Numeric fields are arrays (NaN
+    for null headings); string fields are (StringPool, int32 codes) pairs.
+    """
+    track: Track = drone.positions
+    n = len(track)
+    pool = track.pool
+    return {
+        "timestamp_utc": (pool, track.column("timestamp")),
+        "lat": track.column("lat"),
+        "lon": track.column("lon"),
+        "altitude_m": track.column("altitude"),
+        "drone_id": (pool, np.full(n, pool.intern(drone.id), dtype=np.int32)),
+        "drone_type": (pool, np.full(n, pool.intern(drone.role), dtype=np.int32)),
+        "step": track.column("step"),
+        "heading_deg": track.column("heading_deg"),
+        "ground_speed_mps": track.column("ground_speed_mps"),
+        "in_risk_zone": track.column("in_risk_zone"),
+        "nearest_high_risk": (pool, track.column("sensor_target")),
+        "time_in_risk_zone_s": track.column("threat_time_s"),
+        "flight_deviation_deg": track.column("flight_deviation_deg"),
+        "hover_flag": track.column("hovering_duration_s") > 0.0,
+        "seed": np.full(n, -1 if seed is None else seed, dtype=np.int64),
+    }
+
+
+class ColumnarWriter:
+    """Writes telemetry row groups to a columnar file or directory."""
+
+    def __init__(self, path: str, fmt: str = "columns", append: bool = False) -> None:
+        if fmt not in FORMATS:
+            raise ValueError(f"unknown columnar format {fmt!r}; expected one of {FORMATS}")
+        if fmt != "columns" and pa is None:
+            raise RuntimeError(f"the {fmt!r} format needs pyarrow installed")
+        if fmt != "columns" and append:
+            raise ValueError("append=True is only supported for the 'columns' format")
+        self.path = path
+        self.fmt = fmt
+        self.rows = 0
+        self.row_groups: List[int] = []
+        # Per string field: value -> code, and code -> value
+        self._codes: Dict[str, Dict[str, int]] = {}
+        self._dictionaries: Dict[str, List[str]] = {}
+        self._writer: Any = None
+
+        if fmt == "columns":
+            self._open_columns(append)
+
+    def __enter__(self) -> "ColumnarWriter":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def _open_columns(self, append: bool) -> None:
+        meta_path = os.path.join(self.path, "meta.json")
+        if append and os.path.exists(meta_path):
+            with open(meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+            self.rows = meta["rows"]
+            self.row_groups = meta["row_groups"]
+            self._dictionaries = meta["dictionaries"]
+            self._codes = {
+                name: {v: i for i, v in enumerate(values)}
+                for name, values in self._dictionaries.items()
+            }
+            # Drop bytes of any row group written after the last meta update
+            for name in TELEMETRY_COLUMNS:
+                col_path = os.path.join(self.path, f"{name}.bin")
+                with open(col_path, "r+b") as f:
+                    f.truncate(self.rows * np.dtype(_column_dtype(name)).itemsize)
+            return
+        os.makedirs(self.path, exist_ok=True)
+        for name in TELEMETRY_COLUMNS:
+            open(os.path.join(self.path, f"{name}.bin"), "wb").close()
+        self._write_meta()
+
+    def _write_meta(self) -> None:
+        meta = {
+            "rows": self.rows,
+            "row_groups": self.row_groups,
+            "dtypes": {name: _column_dtype(name) for name in TELEMETRY_COLUMNS},
+            "dictionaries": self._dictionaries,
+        }
+        tmp = os.path.join(self.path, "meta.json.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(tmp, os.path.join(self.path, "meta.json"))
+
+    def _encode(self, name: str, pool: Any, codes: np.ndarray) -> np.ndarray:
+        """Re-code StringPool codes into this file's dictionary for name."""
+        lookup = self._codes.setdefault(name, {})
+        table = self._dictionaries.setdefault(name, [])
+        unique, inverse = np.unique(codes, return_inverse=True)
+        mapped = np.empty(len(unique), dtype=np.int32)
+        for i, code in enumerate(unique.tolist()):
+            value = pool.lookup(code)
+            if value is None:
+                mapped[i] = -1
+                continue
+            out = lookup.get(value)
+            if out is None:
+                out = len(table)
+                lookup[value] = out
+                table.append(value)
+            mapped[i] = out
+        return mapped[inverse.ravel()]
+
+    def write(self, groups: List[Dict[str, Any]]) -> None:
+        """Write the concatenation of track_columns() dicts as one row group."""
+        if not groups:
+            return
+        columns: Dict[str, np.ndarray] = {}
+        for name in TELEMETRY_COLUMNS:
+            parts = []
+            for group in groups:
+                value = group[name]
+                if isinstance(value, tuple):
+                    value = self._encode(name, *value)
+                parts.append(np.asarray(value, dtype=_column_dtype(name)))
+            columns[name] = np.concatenate(parts)
+        count = len(columns["lat"])
+        if count == 0:
+            return
+
+        if self.fmt == "columns":
+            for name, values in columns.items():
+                with open(os.path.join(self.path, f"{name}.bin"), "ab") as f:
+                    f.write(values.tobytes())
+            self.rows += count
+            self.row_groups.append(count)
+            self._write_meta()
+            return
+
+        batch = self._record_batch(columns)
+        if self._writer is None:
+            if self.fmt == "arrow":
+                self._writer = pa_ipc.new_file(self.path, batch.schema)
+            else:
+                self._writer = pq.ParquetWriter(self.path, batch.schema)
+        if self.fmt == "arrow":
+            self._writer.write_batch(batch)
+        else:
+            self._writer.write_table(pa.Table.from_batches([batch]))
+        self.rows += count
+        self.row_groups.append(count)
+
+    def _record_batch(self, columns: Dict[str, np.ndarray]) -> Any:
+        arrays = []
+        for name, values in columns.items():
+            kind = TELEMETRY_COLUMNS[name]
+            if kind == "U":
+                table = self._dictionaries[name]
+                arrays.append(pa.array([None if c < 0 else table[c] for c in values.tolist()]))
+            elif name == "heading_deg":
+                arrays.append(pa.array(values, mask=np.isnan(values)))
+            else:
+                arrays.append(pa.array(values))
+        return pa.RecordBatch.from_arrays(arrays, names=list(columns))
+
+    def write_drones(self, drones: List[Drone], seed: Optional[int] = None) -> None:
+        """Write every drone's track as one row group."""
+        self.write([track_columns(drone, seed) for drone in drones])
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+def export_fleet_columnar(
+    drones: List[Drone], path: str, fmt: str = "columns", seed: Optional[int] = None
+) -> None:
+    """Export every drone's enriched track in a columnar format."""
+    with ColumnarWriter(path, fmt) as writer:
+        writer.write_drones(drones, seed)
+
+
+def load_columnar(path: str) -> Tuple[Dict[str, np.ndarray], Dict[str, List[str]]]:
+    """
+    Memory-map a "columns" export. Returns (columns, dictionaries); string
+    columns are int32 codes into dictionaries[name] (-1 for null).
+    """
+    with open(os.path.join(path, "meta.json"), encoding="utf-8") as f:
+        meta = json.load(f)
+    rows = meta["rows"]
+    columns = {}
+    for name, dtype in meta["dtypes"].items():
+        if rows == 0:
+            columns[name] = np.empty(0, dtype=dtype)
+            continue
+        columns[name] = np.memmap(
+            os.path.join(path, f"{name}.bin"), dtype=dtype, mode="r", shape=(rows,)
+        )
+    return columns, meta["dictionaries"]
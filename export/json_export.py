@@ -3,30 +3,57 @@ JSON export for threat drone telemetry (downstream ML / analysis).
 """
 
 import json
+from typing import Any, Dict, Mapping, Optional
 
 from simulation.drone import Drone
 
 
-def export_threat_telemetry(drone: Drone, output_path: str) -> None:
-    """Export threat drone positions to JSON array."""
+def telemetry_record(
+    drone_id: str, drone_type: str, pos: Mapping[str, Any]
+) -> Dict[str, Any]:
+    """One enriched position in the telemetry JSON schema."""
+    return {
+        "timestamp_utc": pos["timestamp"],
+        "lat": pos["lat"],
+        "lon": pos["lon"],
+        "altitude_m": pos["altitude"],
+        "drone_id": drone_id,
+        "drone_type": drone_type,
+        "step": pos["step"],
+        "heading_deg": pos["heading_deg"],
+        "ground_speed_mps": pos["ground_speed_mps"],
+        "in_risk_zone": 1 if pos["in_risk_zone"] else 0,
+        "nearest_high_risk": pos["sensor_target"],
+        "time_in_risk_zone_s": pos["threat_time_s"],
+        "flight_deviation_deg": pos["flight_deviation_deg"],
+        "hover_flag": 1 if pos["hovering_duration_s"] > 0.0 else 0,
+    }
+
+
+def export_threat_telemetry(
+    drone: Drone, output_path: str, seed: Optional[int] = None
+) -> None:
+    """Export threat drone positions to JSON array; seed is added to each record."""
+    track = drone.positions
+    names = (
+        "timestamp",
+        "lat",
+        "lon",
+        "altitude",
+        "step",
+        "heading_deg",
+        "ground_speed_mps",
+        "in_risk_zone",
+        "sensor_target",
+        "threat_time_s",
+        "flight_deviation_deg",
+        "hovering_duration_s",
+    )
     records = []
-    for pos in drone.positions:
-        record = {
-            "timestamp_utc": pos["timestamp"],
-            "lat": pos["lat"],
-            "lon": pos["lon"],
-            "altitude_m": pos["altitude"],
-            "drone_id": drone.id,
-            "drone_type": drone.role,
-            "step": pos["step"],
-            "heading_deg": pos["heading_deg"],
-            "ground_speed_mps": pos["ground_speed_mps"],
-            "in_risk_zone": 1 if pos["in_risk_zone"] else 0,
-            "nearest_high_risk": pos["sensor_target"],
-            "time_in_risk_zone_s": pos["threat_time_s"],
-            "flight_deviation_deg": pos["flight_deviation_deg"],
-            "hover_flag": 1 if pos["hovering_duration_s"] > 0.0 else 0,
-        }
+    for row in zip(*(track.values(name) for name in names)):
+        record = telemetry_record(drone.id, drone.role, dict(zip(names, row)))
+        if seed is not None:
+            record["seed"] = seed
         records.append(record)
 
     with open(output_path, "w", encoding="utf-8") as f:
@@ -1,65 +1,274 @@
 """
 Logging: terminal output and TXT file export.
+
+Console output goes through the "uav" logger: per-row echo at DEBUG
+("rows" mode), run summaries at INFO ("summary", the default) and nothing
+but warnings in "quiet". The per-row echo is checked once per call, so it
+costs nothing unless enabled. The TXT files are formatted in bulk and written
+by a background thread; their bytes do not depend on the console mode.
 """
 
-from typing import List
+import logging
+import queue
+import sys
+import threading
+import time
+from typing import List, Optional, TextIO
 
+from core.instrument import count
 from simulation.drone import Drone
 
+LOGGER = logging.getLogger("uav")
+
+# Console mode -> level of the "uav" logger
+CONSOLE_MODES = {
+    "rows": logging.DEBUG,
+    "summary": logging.INFO,
+    "quiet": logging.WARNING,
+}
+
+# Chunks queued for a BackgroundWriter before producers block
+_WRITER_QUEUE_CHUNKS = 64
+
+
+def configure_console(mode: str = "summary", stream: Optional[TextIO] = None) -> None:
+    """Send "uav" log records to the console (stdout) at the given mode."""
+    if mode not in CONSOLE_MODES:
+        raise ValueError(f"unknown console mode {mode!r}; expected one of {list(CONSOLE_MODES)}")
+    for handler in list(LOGGER.handlers):
+        LOGGER.removeHandler(handler)
+    handler = logging.StreamHandler(sys.stdout if stream is None else stream)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    LOGGER.addHandler(handler)
+    LOGGER.setLevel(CONSOLE_MODES[mode])
+    LOGGER.propagate = False
+
+
+class ProgressLine:
+    """Single-line progress on stderr, redrawn at most once per interval_s."""
+
+    def __init__(self, total: int, label: str, interval_s: float = 0.5) -> None:
+        self.total = total
+        self.label = label
+        self.interval_s = interval_s
+        self._done = 0
+        self._next = 0.0
+
+    def update(self, count: int = 1) -> None:
+        self._done += count
+        now = time.monotonic()
+        if now >= self._next:
+            self._next = now + self.interval_s
+            self._draw()
+
+    def close(self) -> None:
+        self._draw()
+        sys.stderr.write("\n")
+        sys.stderr.flush()
+
+    def _draw(self) -> None:
+        sys.stderr.write(f"\r{self.label}: {self._done}/{self.total}")
+        sys.stderr.flush()
+
+
+class BackgroundWriter:
+    """
+    Text file written by a worker thread. write() queues a chunk and returns;
+    the queue is bounded, so a slow disk throttles the producer. close()
+    drains the queue and re-raises any write error.
+    """
+
+    def __init__(self, path: str) -> None:
+        self._file = open(path, "w", encoding="utf-8")
+        self._queue: "queue.Queue[Optional[str]]" = queue.Queue(_WRITER_QUEUE_CHUNKS)
+        self._error: Optional[BaseException] = None
+        self._thread = threading.Thread(target=self._run, name=f"writer:{path}", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        try:
+            while True:
+                chunk = self._queue.get()
+                if chunk is None:
+                    break
+                self._file.write(chunk)
+        except BaseException as exc:
+            self._error = exc
+            # Keep draining so producers never block on a dead writer
+            while self._queue.get() is not None:
+                pass
+        finally:
+            self._file.close()
+
+    def write(self, chunk: str) -> None:
+        if self._error is not None:
+            raise self._error
+        self._queue.put(chunk)
+
+    def close(self) -> None:
+        self._queue.put(None)
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
+
+# Both logs end with the run seed, so a row can be traced to its replay
+LOG_HEADER = "drone_id,timestamp,latitude,longitude,altitude,drone_type,step,seed\n"
+
+METRICS_HEADER = (
+    "drone_id,timestamp,latitude,longitude,drone_type,step,"
+    "in_risk_zone,flight_deviation_deg,hovering_duration_s,"
+    "sensor_orientation_deg,sensor_target,heading_deg,ground_speed_mps,"
+    "threat_time_s,seed\n"
+)
+
+
+def log_csv_line(
+    drone_id: str,
+    drone_type: str,
+    ts_str: str,
+    lat: float,
+    lon: float,
+    altitude: float,
+    step: int,
+    seed: str = "",
+) -> str:
+    """One drone_log.txt row; seed is the run seed, pre-formatted."""
+    return f"{drone_id},{ts_str},{lat},{lon},{altitude},{drone_type},{step},{seed}\n"
+
+
+def metrics_csv_line(
+    drone_id: str,
+    drone_type: str,
+    ts_str: str,
+    lat: float,
+    lon: float,
+    step: int,
+    in_risk_zone: bool,
+    flight_deviation_deg: float,
+    hovering_duration_s: float,
+    sensor_orientation_deg: Optional[float],
+    sensor_target: Optional[str],
+    heading_deg: Optional[float],
+    ground_speed_mps: float,
+    threat_time_s: float,
+    seed: str = "",
+) -> str:
+    """One drone_metrics.txt row; seed is the run seed, pre-formatted."""
+    return (
+        f"{drone_id},{ts_str},{lat},{lon},{drone_type},{step},"
+        f"{int(in_risk_zone)},"
+        f"{round(flight_deviation_deg, 2)},"
+        f"{round(hovering_duration_s, 1)},"
+        f"{'' if sensor_orientation_deg is None else round(sensor_orientation_deg, 1)},"
+        f"{'' if sensor_target is None else sensor_target},"
+        f"{'' if heading_deg is None else round(heading_deg, 1)},"
+        f"{round(ground_speed_mps, 2)},"
+        f"{round(threat_time_s, 1)},{seed}\n"
+    )
+
 
 def write_logs(
     drones: List[Drone],
     log_file: str,
     metrics_log_file: str,
+    seed: Optional[int] = None,
+    progress: bool = False,
 ) -> None:
-    """Write main drone log and metrics log to TXT files and terminal."""
-    with (
-        open(log_file, "w", encoding="utf-8") as f_main,
-        open(metrics_log_file, "w", encoding="utf-8") as f_metrics,
-    ):
-        header = "drone_id,timestamp,latitude,longitude,altitude,drone_type,step\n"
-        f_main.write(header)
-
-        metrics_header = (
-            "drone_id,timestamp,latitude,longitude,drone_type,step,"
-            "in_risk_zone,flight_deviation_deg,hovering_duration_s,"
-            "sensor_orientation_deg,sensor_target,heading_deg,ground_speed_mps,"
-            "threat_time_s\n"
-        )
-        f_metrics.write(metrics_header)
+    """
+    Write main drone log and metrics log to TXT files; echo rows to the
+    console in "rows" mode. Every row ends with seed (empty when None).
+    progress shows a per-drone progress line.
+    """
+    seed_str = "" if seed is None else str(seed)
+    echo_rows = LOGGER.isEnabledFor(logging.DEBUG)
+    progress_line = ProgressLine(len(drones), "Writing logs") if progress else None
+    f_main = BackgroundWriter(log_file)
+    f_metrics = BackgroundWriter(metrics_log_file)
+    rows_written = 0
+    try:
+        f_main.write(LOG_HEADER)
+        f_metrics.write(METRICS_HEADER)
 
         for drone in drones:
-            for pos in drone.positions:
-                lat = pos["lat"]
-                lon = pos["lon"]
-                altitude = pos["altitude"]
-                ts_str = pos["timestamp"]
-                step = pos["step"]
-
-                log_line = (
-                    f"Drone ID: {drone.id}, "
-                    f"Type: {drone.role}, "
-                    f"Step: {step}, "
-                    f"Timestamp: {ts_str}, "
-                    f"Latitude: {lat}, Longitude: {lon}, Altitude: {altitude}"
+            track = drone.positions
+            rows = zip(
+                track.values("lat"),
+                track.values("lon"),
+                track.values("altitude"),
+                track.values("timestamp"),
+                track.values("step"),
+                track.values("in_risk_zone"),
+                track.values("flight_deviation_deg"),
+                track.values("hovering_duration_s"),
+                track.values("sensor_orientation_deg"),
+                track.values("sensor_target"),
+                track.values("heading_deg"),
+                track.values("ground_speed_mps"),
+                track.values("threat_time_s"),
+            )
+            main_lines = []
+            metrics_lines = []
+            for (
+                lat,
+                lon,
+                altitude,
+                ts_str,
+                step,
+                in_risk_zone,
+                flight_deviation_deg,
+                hovering_duration_s,
+                sensor_orientation_deg,
+                sensor_target,
+                heading_deg,
+                ground_speed_mps,
+                threat_time_s,
+            ) in rows:
+                if echo_rows:
+                    LOGGER.debug(
+                        "Drone ID: %s, Type: %s, Step: %s, Timestamp: %s, "
+                        "Latitude: %s, Longitude: %s, Altitude: %s",
+                        drone.id,
+                        drone.role,
+                        step,
+                        ts_str,
+                        lat,
+                        lon,
+                        altitude,
+                    )
+                main_lines.append(
+                    log_csv_line(
+                        drone.id, drone.role, ts_str, lat, lon, altitude, step, seed_str
+                    )
                 )
-                print(log_line)
-
-                csv_line = (
-                    f"{drone.id},{ts_str},{lat},{lon},{altitude},"
-                    f"{drone.role},{step}\n"
-                )
-                f_main.write(csv_line)
-
-                metrics_line = (
-                    f"{drone.id},{ts_str},{lat},{lon},{drone.role},{step},"
-                    f"{int(pos['in_risk_zone'])},"
-                    f"{round(pos['flight_deviation_deg'], 2)},"
-                    f"{round(pos['hovering_duration_s'], 1)},"
-                    f"{'' if pos['sensor_orientation_deg'] is None else round(pos['sensor_orientation_deg'], 1)},"
-                    f"{'' if pos['sensor_target'] is None else pos['sensor_target']},"
-                    f"{'' if pos['heading_deg'] is None else round(pos['heading_deg'], 1)},"
-                    f"{round(pos['ground_speed_mps'], 2)},"
-                    f"{round(pos['threat_time_s'], 1)}\n"
+                metrics_lines.append(
+                    metrics_csv_line(
+                        drone.id,
+                        drone.role,
+                        ts_str,
+                        lat,
+                        lon,
+                        step,
+                        in_risk_zone,
+                        flight_deviation_deg,
+                        hovering_duration_s,
+                        sensor_orientation_deg,
+                        sensor_target,
+                        heading_deg,
+                        ground_speed_mps,
+                        threat_time_s,
+                        seed_str,
+                    )
                 )
-                f_metrics.write(metrics_line)
+            f_main.write("".join(main_lines))
+            f_metrics.write("".join(metrics_lines))
+            rows_written += len(main_lines)
+            if progress_line is not None:
+                progress_line.update()
+    finally:
+        f_main.close()
+        f_metrics.close()
+        if progress_line is not None:
+            progress_line.close()
+
+    count("rows_logged", rows_written)
+    LOGGER.info("Logged %d positions for %d drones", rows_written, len(drones))
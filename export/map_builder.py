@@ -3,9 +3,18 @@ Build animated Leaflet HTML map for UAV simulation.
 
 Heatmap: dark, red-dominant, larger radius.
 Polylines reset when simulation loops.
+
+Tracks are embedded as compact columns (delta-encoded quantized lat/lon, a
+sensor_target string table) and decoded into typed arrays in the page.
+Trails are drawn from per-zoom simplified vertex lists, so large fleets stay
+light to load and animate.
 """
 
 import json
+import math
+from typing import Any, Dict, List, Optional
+
+import numpy as np
 
 from config.port_botany import (
     PORT_BOTANY_CENTER_LAT,
@@ -15,48 +24,132 @@ from config.port_botany import (
     CRANE_1,
     CRANE_2,
 )
+from config.constants import MAP_TOP_K
+from core.geo import simplify_track
+from metrics.ranking import rank_steps
 from metrics.risk import generate_risk_heat_points
+from metrics.scoring import THREAT_HEADLINES
+
+# Tracks are embedded column-wise: lat/lon as deltas of integer multiples of
+# 1/LATLON_SCALE degrees (lossless: positions are logged at 4 decimals), other
+# displayed fields as integers of 1/VALUE_SCALE (the sidebar shows 1 decimal)
+# and sensor_target as an index into a string table (-1 for none).
+_LATLON_SCALE = 10_000
+_VALUE_SCALE = 10
+# threat_score is only displayed (ranking and headline come precomputed)
+_SCORE_SCALE = 100
+_VALUE_FIELDS = (
+    "altitude",
+    "flight_deviation_deg",
+    "hovering_duration_s",
+    "threat_time_s",
+    "sensor_orientation_deg",
+)
 
+# Simplified polylines for zooms up to each of these; finer zooms draw every
+# point. Dropped points stay within _LOD_TOLERANCE_PX screen pixels.
+_LOD_ZOOMS = (10, 12, 14, 16)
+_LOD_TOLERANCE_PX = 1.0
 
-def build_map(drones: list, output_path: str) -> None:
-    """Generate animated Leaflet map HTML."""
-    colors = ["blue", "green", "orange", "purple", "red"]
 
-    js_drones = []
-    for idx, drone in enumerate(drones):
-        positions_js = []
-        for pos in drone.positions:
-            positions_js.append(
-                {
-                    "lat": pos["lat"],
-                    "lon": pos["lon"],
-                    "altitude": pos["altitude"],
-                    "timestamp": pos["timestamp"],
-                    "step": pos["step"],
-                    "in_risk_zone": pos["in_risk_zone"],
-                    "flight_deviation_deg": pos["flight_deviation_deg"],
-                    "hovering_duration_s": pos["hovering_duration_s"],
-                    "sensor_orientation_deg": pos["sensor_orientation_deg"],
-                    "sensor_target": pos["sensor_target"],
-                    "heading_deg": pos["heading_deg"],
-                    "ground_speed_mps": pos["ground_speed_mps"],
-                    "threat_time_s": pos["threat_time_s"],
-                    "threat_score": pos.get("threat_score", 0),
-                }
-            )
-
-        js_drones.append(
-            {
-                "id": drone.id,
-                "type": drone.role,
-                "color": colors[idx % len(colors)],
-                "positions": positions_js,
-            }
-        )
+def _lod_tolerance_deg(zoom: int) -> float:
+    """Degrees per _LOD_TOLERANCE_PX pixels at a Web Mercator zoom level."""
+    return _LOD_TOLERANCE_PX * 360.0 / (256 * 2**zoom)
 
-    heat_points = generate_risk_heat_points()
 
-    drones_json = json.dumps(js_drones)
+def _quantize(values: np.ndarray, scale: int) -> List[Optional[int]]:
+    """Round to integers of 1/scale; NaN becomes None."""
+    q = np.rint(values * scale)
+    missing = np.isnan(q)
+    if not missing.any():
+        return q.astype(np.int64).tolist()
+    return [None if m else int(v) for m, v in zip(missing.tolist(), q.tolist())]
+
+
+def _encode_ranking(drones: list, top_k: int) -> Optional[Dict[str, Any]]:
+    """Per-step top-k drone indices (flattened, -1 pads) and headline codes."""
+    if not all(d.positions.has_column("threat_score") for d in drones):
+        return None
+    ranking = rank_steps(drones, top_k)
+    return {
+        "k": int(ranking.top.shape[1]),
+        "top": ranking.top.ravel().tolist(),
+        "headline": ranking.headline.tolist(),
+        "headlines": [list(h) for h in THREAT_HEADLINES],
+    }
+
+
+def _encode_tracks(drones: list, top_k: int = MAP_TOP_K) -> Dict[str, Any]:
+    """Compact columnar encoding of every drone's track for the page."""
+    colors = ["blue", "green", "orange", "purple", "red"]
+    targets: Dict[str, int] = {}
+    encoded = []
+    lat_min = lon_min = math.inf
+    lat_max = lon_max = -math.inf
+    for idx, drone in enumerate(drones):
+        track = drone.positions
+        n = len(track)
+        lat = track.column("lat") if n else np.zeros(0)
+        lon = track.column("lon") if n else np.zeros(0)
+        if n:
+            lat_min = min(lat_min, float(lat.min()))
+            lat_max = max(lat_max, float(lat.max()))
+            lon_min = min(lon_min, float(lon.min()))
+            lon_max = max(lon_max, float(lon.max()))
+
+        entry: Dict[str, Any] = {
+            "id": drone.id,
+            "type": drone.role,
+            "color": colors[idx % len(colors)],
+            "length": n,
+            "lat": np.diff(np.rint(lat * _LATLON_SCALE).astype(np.int64), prepend=0).tolist(),
+            "lon": np.diff(np.rint(lon * _LATLON_SCALE).astype(np.int64), prepend=0).tolist(),
+            "in_risk_zone": track.column("in_risk_zone").astype(np.int8).tolist()
+            if track.has_column("in_risk_zone")
+            else [0] * n,
+        }
+        for name in _VALUE_FIELDS:
+            values = track.column(name) if track.has_column(name) else np.zeros(n)
+            entry[name] = _quantize(values, _VALUE_SCALE)
+        if track.has_column("threat_score"):
+            entry["threat_score"] = _quantize(track.column("threat_score"), _SCORE_SCALE)
+        else:
+            entry["threat_score"] = [0] * n
+        if track.has_column("sensor_target"):
+            entry["sensor_target"] = [
+                -1 if name is None else targets.setdefault(name, len(targets))
+                for name in track.values("sensor_target")
+            ]
+        else:
+            entry["sensor_target"] = [-1] * n
+        entry["lod"] = [
+            simplify_track(lat, lon, _lod_tolerance_deg(zoom)).tolist()
+            for zoom in _LOD_ZOOMS
+        ]
+        encoded.append(entry)
+
+    return {
+        "steps": max((d["length"] for d in encoded), default=0),
+        "latlon_scale": _LATLON_SCALE,
+        "value_scale": _VALUE_SCALE,
+        "score_scale": _SCORE_SCALE,
+        "lod_zooms": list(_LOD_ZOOMS),
+        "sensor_targets": list(targets),
+        "bounds": [[lat_min, lon_min], [lat_max, lon_max]] if encoded else None,
+        "drones": encoded,
+        "ranking": _encode_ranking(drones, top_k),
+    }
+
+
+def build_map(
+    drones: list, output_path: str, seed: Optional[int] = None, top_k: int = MAP_TOP_K
+) -> None:
+    """
+    Generate animated Leaflet map HTML; seed is recorded as SEED. The
+    sidebar lists the top_k drones of each step, ranked in advance.
+    """
+    tracks_json = json.dumps(_encode_tracks(drones, top_k), separators=(",", ":"))
+    heat_points = generate_risk_heat_points()
     heat_json = json.dumps(heat_points)
 
     html = f"""<!DOCTYPE html>
@@ -110,10 +203,81 @@ def build_map(drones: list, output_path: str) -> None:
   <script src="https://cdn.jsdelivr.net/npm/leaflet@1.9.3/dist/leaflet.js"></script>
   <script src="https://unpkg.com/leaflet.heat/dist/leaflet-heat.js"></script>
   <script>
-    const DRONES = {drones_json};
+    const TRACKS = {tracks_json};
     const HEAT_POINTS = {heat_json};
+    const SEED = {json.dumps(seed)};
     const CENTER = [{PORT_BOTANY_CENTER_LAT}, {PORT_BOTANY_CENTER_LON}];
 
+    // Decode compact columns into typed arrays (NaN where a value is missing)
+    function decodeTracks(t) {{
+      const scaled = (arr, scale) => Float64Array.from(arr, (v) => (v === null ? NaN : v / scale));
+      const undelta = (arr) => {{
+        const out = new Float64Array(arr.length);
+        let q = 0;
+        for (let i = 0; i < arr.length; i++) {{
+          q += arr[i];
+          out[i] = q / t.latlon_scale;
+        }}
+        return out;
+      }};
+      return t.drones.map((d) => ({{
+        id: d.id,
+        type: d.type,
+        color: d.color,
+        length: d.length,
+        lat: undelta(d.lat),
+        lon: undelta(d.lon),
+        altitude: scaled(d.altitude, t.value_scale),
+        flight_deviation_deg: scaled(d.flight_deviation_deg, t.value_scale),
+        hovering_duration_s: scaled(d.hovering_duration_s, t.value_scale),
+        threat_time_s: scaled(d.threat_time_s, t.value_scale),
+        sensor_orientation_deg: scaled(d.sensor_orientation_deg, t.value_scale),
+        threat_score: scaled(d.threat_score, t.score_scale),
+        in_risk_zone: Uint8Array.from(d.in_risk_zone),
+        sensor_target: Int32Array.from(d.sensor_target),
+        lod: d.lod.map((idx) => Int32Array.from(idx)),
+      }}));
+    }}
+
+    const DRONES = decodeTracks(TRACKS);
+    const SENSOR_TARGETS = TRACKS.sensor_targets;
+    const RANKING = TRACKS.ranking && {{
+      k: TRACKS.ranking.k,
+      top: Int32Array.from(TRACKS.ranking.top),
+      headline: Uint8Array.from(TRACKS.ranking.headline),
+      headlines: TRACKS.ranking.headlines,
+    }};
+
+    // Drone indices ranked at a step, best first
+    function rankedAt(stepIdx) {{
+      if (!RANKING) return DRONES.map((_, i) => i);
+      const out = [];
+      for (let r = 0; r < RANKING.k; r++) {{
+        const idx = RANKING.top[stepIdx * RANKING.k + r];
+        if (idx >= 0) out.push(idx);
+      }}
+      return out;
+    }}
+
+    // Record view of one step, for the sidebar
+    function positionAt(drone, i) {{
+      if (i >= drone.length) return null;
+      const orientation = drone.sensor_orientation_deg[i];
+      const target = drone.sensor_target[i];
+      return {{
+        lat: drone.lat[i],
+        lon: drone.lon[i],
+        altitude: drone.altitude[i],
+        in_risk_zone: drone.in_risk_zone[i],
+        flight_deviation_deg: drone.flight_deviation_deg[i],
+        hovering_duration_s: drone.hovering_duration_s[i],
+        threat_time_s: drone.threat_time_s[i],
+        threat_score: drone.threat_score[i],
+        sensor_orientation_deg: Number.isNaN(orientation) ? null : orientation,
+        sensor_target: target < 0 ? null : SENSOR_TARGETS[target],
+      }};
+    }}
+
     const map = L.map('map').setView(CENTER, 12);
 
     L.tileLayer('https://{{s}}.tile.openstreetmap.org/{{z}}/{{x}}/{{y}}.png', {{
@@ -143,8 +307,7 @@ def build_map(drones: list, output_path: str) -> None:
     const droneLabels = [];
 
     DRONES.forEach((drone) => {{
-      const first = drone.positions[0];
-      const marker = L.circleMarker([first.lat, first.lon], {{
+      const marker = L.circleMarker([drone.lat[0], drone.lon[0]], {{
         radius: 6,
         color: drone.color,
         fillColor: drone.color,
@@ -153,7 +316,7 @@ def build_map(drones: list, output_path: str) -> None:
       }}).addTo(map);
       marker.bindPopup(drone.id + ' (' + (drone.type === 'threat' ? 'THREAT' : 'INSPECTION') + ')');
 
-      const poly = L.polyline([[first.lat, first.lon]], {{
+      const poly = L.polyline([[drone.lat[0], drone.lon[0]]], {{
         color: drone.color,
         weight: 3,
         opacity: 0.8
@@ -164,14 +327,10 @@ def build_map(drones: list, output_path: str) -> None:
       droneLabels.push((drone.type === 'threat' ? 'Threat' : 'Inspection') + ' – ' + drone.id);
     }});
 
-    const allCoords = [];
-    DRONES.forEach((drone) => {{
-      drone.positions.forEach((p) => allCoords.push([p.lat, p.lon]));
-    }});
-    map.fitBounds(allCoords);
+    if (TRACKS.bounds) map.fitBounds(TRACKS.bounds);
 
     let step = 0;
-    const maxSteps = DRONES[0].positions.length;
+    const maxSteps = TRACKS.steps;
     let intervalMs = 300;
     let timerId = null;
 
@@ -183,44 +342,20 @@ def build_map(drones: list, output_path: str) -> None:
     function renderMetrics(stepIdx) {{
       let html = '<div style="font-weight:bold;margin-bottom:4px;">Step ' + (stepIdx + 1) + '/' + maxSteps + '</div>';
 
-      // Rank ALL drones by threat_score; headline = highest current threat (no role assumption)
-      const orderedIdx = DRONES.map((_, i) => i).sort((a, b) => {{
-        const pa = DRONES[a].positions[stepIdx] || {{}};
-        const pb = DRONES[b].positions[stepIdx] || {{}};
-        const sa = typeof pa.threat_score === 'number' ? pa.threat_score : 0;
-        const sb = typeof pb.threat_score === 'number' ? pb.threat_score : 0;
-        return sb - sa;
-      }});
-
-      const topDrone = DRONES[orderedIdx[0]];
-      const topPos = topDrone && topDrone.positions[stepIdx];
+      // Top-K drones by threat_score and the leader's headline (no role
+      // assumption), precomputed in Python: just index them
+      const orderedIdx = rankedAt(stepIdx);
+      const [level, action] = RANKING ? RANKING.headlines[RANKING.headline[stepIdx]] : ['NONE', ''];
       let threatHeadline = 'Threat status: No active threat detected.';
-      if (topPos && (topPos.threat_score || 0) > 2) {{
-        const tt = typeof topPos.threat_time_s === 'number' ? topPos.threat_time_s : 0;
-        const inRisk = !!topPos.in_risk_zone;
-        let level = 'LOW';
-        let action = 'Monitoring from command centre.';
-        if (inRisk && tt >= 5 && tt < 15) {{
-          level = 'ELEVATED';
-          action = 'Dispatching friendly drones to shadow and inspect behaviour.';
-        }} else if (inRisk && tt >= 15 && tt < 30) {{
-          level = 'HIGH';
-          action = 'Authorising intercept; EW / jamming or non‑kinetic effects.';
-        }} else if (inRisk && tt >= 30) {{
-          level = 'CRITICAL';
-          action = 'Air strike / hard‑kill option on table; neutralise immediately.';
-        }} else if ((topPos.threat_score || 0) > 5) {{
-          level = 'ELEVATED';
-          action = 'Investigating suspicious behaviour.';
-        }}
-        threatHeadline = 'Highest threat: ' + topDrone.id + ' – ' + level + '. ' + action;
+      if (level !== 'NONE' && orderedIdx.length) {{
+        threatHeadline = 'Highest threat: ' + DRONES[orderedIdx[0]].id + ' – ' + level + '. ' + action;
       }}
 
       html += '<div style="margin-bottom:8px;padding:6px 8px;background:#111;color:#fff;border-radius:4px;font-size:12px;">' + threatHeadline + '</div>';
 
       orderedIdx.forEach((idx) => {{
         const drone = DRONES[idx];
-        const pos = drone.positions[stepIdx];
+        const pos = positionAt(drone, stepIdx);
         if (!pos) return;
         const riskBadge = pos.in_risk_zone
           ? '<span style="color:#b30000;font-weight:bold;">HIGH‑RISK ZONE</span>'
@@ -244,13 +379,53 @@ def build_map(drones: list, output_path: str) -> None:
       metricsDiv.innerHTML = html;
     }}
 
+    // Level of detail: trails use the simplified vertex list for the current
+    // zoom (null = every point), plus the drone's current position as head
+    function lodIndices(drone) {{
+      const zoom = map.getZoom();
+      const tier = TRACKS.lod_zooms.findIndex((z) => zoom <= z);
+      return tier < 0 ? null : drone.lod[tier];
+    }}
+
+    function trailLatLngs(drone, upTo) {{
+      const idx = lodIndices(drone);
+      const pts = [];
+      if (idx === null) {{
+        for (let i = 0; i <= upTo && i < drone.length; i++) pts.push([drone.lat[i], drone.lon[i]]);
+        return pts;
+      }}
+      for (let k = 0; k < idx.length && idx[k] <= upTo; k++) pts.push([drone.lat[idx[k]], drone.lon[idx[k]]]);
+      const head = Math.min(upTo, drone.length - 1);
+      if (head >= 0 && (pts.length === 0 || idx[pts.length - 1] !== head)) {{
+        pts.push([drone.lat[head], drone.lon[head]]);
+      }}
+      return pts;
+    }}
+
+    function lodHas(idxList, i) {{
+      let lo = 0;
+      let hi = idxList.length - 1;
+      while (lo <= hi) {{
+        const mid = (lo + hi) >> 1;
+        if (idxList[mid] === i) return true;
+        if (idxList[mid] < i) lo = mid + 1;
+        else hi = mid - 1;
+      }}
+      return false;
+    }}
+
+    function redrawTrails() {{
+      DRONES.forEach((drone, idx) => dronePolylines[idx].setLatLngs(trailLatLngs(drone, step)));
+    }}
+
     function resetPolylines() {{
       DRONES.forEach((drone, idx) => {{
-        const first = drone.positions[0];
-        dronePolylines[idx].setLatLngs([[first.lat, first.lon]]);
+        dronePolylines[idx].setLatLngs([[drone.lat[0], drone.lon[0]]]);
       }});
     }}
 
+    map.on('zoomend', redrawTrails);
+
     function update() {{
       step++;
       if (step >= maxSteps) {{
@@ -259,18 +434,28 @@ def build_map(drones: list, output_path: str) -> None:
       }}
 
       DRONES.forEach((drone, idx) => {{
-        const pos = drone.positions[step];
-        if (!pos) return;
-        const latlng = [pos.lat, pos.lon];
+        if (step >= drone.length) return;
+        const latlng = [drone.lat[step], drone.lon[step]];
         droneMarkers[idx].setLatLng(latlng);
-        const isRisk = !!pos.in_risk_zone;
+        const isRisk = !!drone.in_risk_zone[step];
         droneMarkers[idx].setStyle({{
           radius: isRisk ? 8 : 6,
           weight: isRisk ? 3 : 2,
           color: drone.color,
           fillColor: drone.color,
         }});
-        dronePolylines[idx].addLatLng(latlng);
+        // Keep the previous head only if it is a vertex at this zoom
+        const poly = dronePolylines[idx];
+        const idxList = lodIndices(drone);
+        const prev = step - 1;
+        if (idxList !== null && prev > 0 && !lodHas(idxList, prev)) {{
+          const pts = poly.getLatLngs();
+          pts.pop();
+          pts.push(L.latLng(latlng));
+          poly.setLatLngs(pts);
+        }} else {{
+          poly.addLatLng(latlng);
+        }}
       }});
       renderMetrics(step);
     }}
@@ -0,0 +1,127 @@
+"""
+Streaming export sinks: write each simulation step's rows as they are produced.
+
+simulation.simulator.stream_simulation calls write_step once per step with
+that step's enriched records, so nothing is held for the whole run and the
+first rows are on disk before the run ends. Each sink formats a step's rows
+into one string and hands it to a large write buffer (one write call per
+step, flushed to the OS every OUTPUT_BUFFER_BYTES).
+"""
+
+import json
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from core.instrument import count
+from export.json_export import telemetry_record
+from export.logger import LOG_HEADER, METRICS_HEADER, log_csv_line, metrics_csv_line
+from simulation.drone import Drone
+
+# Write buffer per output file
+OUTPUT_BUFFER_BYTES = 1 << 20
+
+# One step's output: (drone, enriched record incl. threat_score) per drone
+StepRows = Sequence[Tuple[Drone, Dict[str, Any]]]
+
+
+class StepSink(ABC):
+    """Base sink: receives every step's rows in order, then close()."""
+
+    @abstractmethod
+    def write_step(self, rows: StepRows) -> None:
+        """Write one step's rows."""
+
+    def close(self) -> None:
+        pass
+
+
+class CsvLogSink(StepSink):
+    """drone_log.txt and drone_metrics.txt, same format as export.logger.write_logs."""
+
+    def __init__(self, log_file: str, metrics_log_file: str, seed: Optional[int] = None):
+        self._seed = "" if seed is None else str(seed)
+        self._main = open(log_file, "w", encoding="utf-8", buffering=OUTPUT_BUFFER_BYTES)
+        self._metrics = open(
+            metrics_log_file, "w", encoding="utf-8", buffering=OUTPUT_BUFFER_BYTES
+        )
+        self._main.write(LOG_HEADER)
+        self._metrics.write(METRICS_HEADER)
+
+    def write_step(self, rows: StepRows) -> None:
+        main_lines: List[str] = []
+        metrics_lines: List[str] = []
+        for drone, pos in rows:
+            main_lines.append(
+                log_csv_line(
+                    drone.id,
+                    drone.role,
+                    pos["timestamp"],
+                    pos["lat"],
+                    pos["lon"],
+                    pos["altitude"],
+                    pos["step"],
+                    self._seed,
+                )
+            )
+            metrics_lines.append(
+                metrics_csv_line(
+                    drone.id,
+                    drone.role,
+                    pos["timestamp"],
+                    pos["lat"],
+                    pos["lon"],
+                    pos["step"],
+                    pos["in_risk_zone"],
+                    pos["flight_deviation_deg"],
+                    pos["hovering_duration_s"],
+                    pos["sensor_orientation_deg"],
+                    pos["sensor_target"],
+                    pos["heading_deg"],
+                    pos["ground_speed_mps"],
+                    pos["threat_time_s"],
+                    self._seed,
+                )
+            )
+        count("rows_logged", len(main_lines))
+        self._main.write("".join(main_lines))
+        self._metrics.write("".join(metrics_lines))
+
+    def close(self) -> None:
+        self._main.close()
+        self._metrics.close()
+
+
+class NdjsonSink(StepSink):
+    """
+    One telemetry JSON record per line (threat_telemetry.json schema plus
+    threat_score, swarm_score and seed). roles limits output, e.g. ("threat",).
+    """
+
+    def __init__(
+        self,
+        path: str,
+        seed: Optional[int] = None,
+        roles: Optional[Sequence[str]] = None,
+    ):
+        self._file = open(path, "w", encoding="utf-8", buffering=OUTPUT_BUFFER_BYTES)
+        self._seed = seed
+        self._roles = None if roles is None else frozenset(roles)
+        self._encode = json.JSONEncoder(separators=(",", ":")).encode
+
+    def write_step(self, rows: StepRows) -> None:
+        lines = []
+        for drone, pos in rows:
+            if self._roles is not None and drone.role not in self._roles:
+                continue
+            record = telemetry_record(drone.id, drone.role, pos)
+            record["threat_score"] = pos["threat_score"]
+            record["swarm_score"] = pos["swarm_score"]
+            if self._seed is not None:
+                record["seed"] = self._seed
+            lines.append(self._encode(record))
+        if lines:
+            lines.append("")
+            self._file.write("\n".join(lines))
+
+    def close(self) -> None:
+        self._file.close()
@@ -0,0 +1,10 @@
+"""
+UAV Threat Classification – Live map entry point.
+
+Serves a map that follows a running simulation in real time (Server-Sent Events).
+"""
+
+from streaming.live_map import main
+
+if __name__ == "__main__":
+    main()
@@ -2,9 +2,58 @@
 UAV Threat Classification & Simulation – Entry point.
 
 Single entry point for the Port Botany drone simulation.
+Pass --seed N to replay a recorded run; --stream writes logs step by step;
+--report writes per-stage timings and counters as JSON.
 """
 
+import argparse
+import json
+
+from config.constants import CONSOLE_MODE, RUN_REPORT_FILE
+from core.instrument import instrumented
+from export.logger import CONSOLE_MODES, LOGGER, configure_console
 from simulation.simulator import run_simulation
 
 if __name__ == "__main__":
-    run_simulation()
+    parser = argparse.ArgumentParser(description="Port Botany drone simulation.")
+    parser.add_argument("--seed", type=int, help="replay a run (seed is in every export)")
+    parser.add_argument(
+        "--stream", action="store_true", help="write logs per step; no map or JSON"
+    )
+    parser.add_argument(
+        "--console",
+        choices=list(CONSOLE_MODES),
+        default=CONSOLE_MODE,
+        help="rows echoes every logged position (slow at fleet scale)",
+    )
+    parser.add_argument("--progress", action="store_true", help="show a progress line")
+    parser.add_argument(
+        "--report",
+        nargs="?",
+        const=RUN_REPORT_FILE,
+        metavar="PATH",
+        help=f"write a JSON run report (default {RUN_REPORT_FILE})",
+    )
+    parser.add_argument(
+        "--profile", metavar="PATH", help="run under cProfile; save stats here"
+    )
+    parser.add_argument(
+        "--trace-memory", action="store_true", help="record peak memory per stage"
+    )
+    args = parser.parse_args()
+    configure_console(args.console)
+
+    report_path = args.report
+    if report_path is None and (args.profile or args.trace_memory):
+        report_path = RUN_REPORT_FILE
+    if report_path is None:
+        run_simulation(seed=args.seed, stream=args.stream, progress=args.progress)
+    else:
+        with instrumented(bool(args.profile), args.trace_memory) as run:
+            run_simulation(seed=args.seed, stream=args.stream, progress=args.progress)
+        if args.profile:
+            run.dump_profile(args.profile)
+            LOGGER.info("Profile saved to %s", args.profile)
+        with open(report_path, "w", encoding="utf-8") as f:
+            json.dump(run.report(), f, indent=2)
+        LOGGER.info("Run report saved to %s", report_path)
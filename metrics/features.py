@@ -0,0 +1,187 @@
+"""
+Per-fix feature matrix of enriched fleets, cached on disk.
+
+A FeatureMatrix holds one row per fix, with the linear scorer's
+SCORE_FEATURES first, then the rolling-window features and swarm_score. Rows
+are grouped by drone in step order, with each drone's role as its label.
+Building one means simulating and enriching a fleet. get_feature_matrix
+keeps the result under FEATURE_CACHE_DIR, keyed by scenario, the POI set
+and the thresholds and constants the features depend on, so weight sweeps
+and model fitting reuse features without rerunning the simulation.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from dataclasses import dataclass
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+from config.constants import (
+    ATTRACTION_CELL_DEG,
+    ATTRACTION_CUTOFF_CELLS,
+    FEATURE_CACHE_DIR,
+    NUM_STEPS,
+    ROLLING_WINDOW_S,
+    SECONDS_PER_STEP,
+    SWARM_COLOITER_WEIGHT,
+    SWARM_CONVERGE_WEIGHT,
+    SWARM_NEIGHBOUR_WEIGHT,
+)
+from config.port_botany import LAT_MIN, LAT_MAX, LON_MIN, LON_MAX
+from config.thresholds import (
+    HOVER_DISTANCE_THRESHOLD_KM,
+    RISK_ZONE_RADIUS_KM,
+    SWARM_CONVERGE_KM,
+    SWARM_RADIUS_KM,
+)
+from metrics.poi_index import get_poi_index
+from metrics.rolling import ROLLING_FIELDS
+from metrics.scoring import SCORE_FEATURES, score_features
+from simulation.simulator import simulate_fleet
+
+FEATURE_NAMES: Tuple[str, ...] = SCORE_FEATURES + ROLLING_FIELDS + ("swarm_score",)
+
+# Bump when the features, their order or the movement code change;
+# invalidates cached files
+_FORMAT_VERSION = 2
+
+
+@dataclass
+class FeatureMatrix:
+    """Feature rows of a fleet (or several), grouped by drone."""
+
+    values: np.ndarray  # (fixes, FEATURE_NAMES)
+    drone: np.ndarray  # drone index per row
+    step: np.ndarray  # step per row
+    drone_ids: np.ndarray  # per drone
+    threat: np.ndarray  # per drone: True for role "threat"
+
+    @property
+    def starts(self) -> np.ndarray:
+        """First row of each drone."""
+        return np.searchsorted(self.drone, np.arange(self.drone_ids.shape[0]))
+
+    def save(self, path: str) -> None:
+        """Write to an .npz file (atomically replaced)."""
+        parent = os.path.dirname(os.path.abspath(path))
+        os.makedirs(parent, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=parent, suffix=".npz")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez(
+                    f,
+                    values=self.values,
+                    drone=self.drone,
+                    step=self.step,
+                    drone_ids=self.drone_ids,
+                    threat=self.threat,
+                    names=np.array(FEATURE_NAMES),
+                )
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    @classmethod
+    def load(cls, path: str) -> "FeatureMatrix":
+        with np.load(path) as data:
+            if tuple(data["names"].tolist()) != FEATURE_NAMES:
+                raise ValueError(f"{path} holds different features")
+            return cls(
+                data["values"], data["drone"], data["step"], data["drone_ids"], data["threat"]
+            )
+
+
+def build_feature_matrix(drones: list) -> FeatureMatrix:
+    """Feature rows of an enriched, scored and swarm-scored fleet."""
+    drones = [d for d in drones if len(d.positions)]
+    blocks = []
+    for drone in drones:
+        track = drone.positions
+        extra = [track.column(name) for name in ROLLING_FIELDS + ("swarm_score",)]
+        blocks.append(np.column_stack([score_features(track)] + extra))
+    lengths = [len(d.positions) for d in drones]
+    return FeatureMatrix(
+        values=np.concatenate(blocks) if blocks else np.zeros((0, len(FEATURE_NAMES))),
+        drone=np.repeat(np.arange(len(drones)), lengths),
+        step=np.concatenate([d.positions.column("step") for d in drones])
+        if drones
+        else np.zeros(0, dtype=np.int64),
+        drone_ids=np.array([d.id for d in drones], dtype=str),
+        threat=np.array([d.role == "threat" for d in drones], dtype=bool),
+    )
+
+
+def concat_feature_matrices(matrices: Sequence[FeatureMatrix]) -> FeatureMatrix:
+    """One matrix over several fleets; drone indices are renumbered."""
+    offsets = np.cumsum([0] + [m.drone_ids.shape[0] for m in matrices])
+    return FeatureMatrix(
+        values=np.concatenate([m.values for m in matrices]),
+        drone=np.concatenate([m.drone + offsets[k] for k, m in enumerate(matrices)]),
+        step=np.concatenate([m.step for m in matrices]),
+        drone_ids=np.concatenate([m.drone_ids for m in matrices]),
+        threat=np.concatenate([m.threat for m in matrices]),
+    )
+
+
+def feature_key(seed: int, num_drones: int, num_threats: int, num_steps: int = NUM_STEPS) -> str:
+    """Content hash identifying a scenario's features for the current POI set."""
+    index = get_poi_index()
+    payload = json.dumps(
+        {
+            "version": _FORMAT_VERSION,
+            "scenario": [seed, num_drones, num_threats, num_steps],
+            "pois": [index.lat.tolist(), index.lon.tolist(), index.weight.tolist()],
+            "thresholds": [
+                HOVER_DISTANCE_THRESHOLD_KM,
+                RISK_ZONE_RADIUS_KM,
+                SWARM_RADIUS_KM,
+                SWARM_CONVERGE_KM,
+            ],
+            "rolling_window_s": ROLLING_WINDOW_S,
+            "swarm_weights": [
+                SWARM_NEIGHBOUR_WEIGHT,
+                SWARM_COLOITER_WEIGHT,
+                SWARM_CONVERGE_WEIGHT,
+            ],
+            "movement": [
+                SECONDS_PER_STEP,
+                [LAT_MIN, LAT_MAX, LON_MIN, LON_MAX],
+                ATTRACTION_CUTOFF_CELLS,
+                ATTRACTION_CELL_DEG,
+            ],
+        }
+    )
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def get_feature_matrix(
+    seed: int, num_drones: int, num_threats: int, cache: bool = True
+) -> FeatureMatrix:
+    """Features of one seeded scenario, from the cache or by simulating it."""
+    path = os.path.join(FEATURE_CACHE_DIR, feature_key(seed, num_drones, num_threats) + ".npz")
+    if cache:
+        try:
+            return FeatureMatrix.load(path)
+        except (OSError, ValueError, KeyError):
+            pass
+    matrix = build_feature_matrix(simulate_fleet(seed, num_drones, num_threats))
+    if cache:
+        try:
+            matrix.save(path)
+        except OSError:
+            pass
+    return matrix
+
+
+def scenario_features(
+    seeds: Sequence[int], num_drones: int, num_threats: int, cache: bool = True
+) -> FeatureMatrix:
+    """Features of several seeded scenarios in one matrix."""
+    matrices: List[FeatureMatrix] = [
+        get_feature_matrix(seed, num_drones, num_threats, cache) for seed in seeds
+    ]
+    return concat_feature_matrices(matrices)
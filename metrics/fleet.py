@@ -0,0 +1,137 @@
+"""
+Whole-fleet vectorised metrics: the same per-step metrics as
+metrics.behavior.enrich_positions_with_metrics, computed as array operations
+over every drone and step at once.
+
+All tracks are concatenated into flat arrays with segment boundaries. Hover
+streaks and cumulative risk time become run-length / cumulative counts, mapped
+through a table of repeated SECONDS_PER_STEP additions so the floats match the
+loop's running sums exactly. By default trigonometry uses core.geo's exact
+(libm) mode, so output is bit-identical to the reference loop; exact=False
+switches to NumPy's SIMD kernels (within core.geo's documented tolerance)
+for several times more throughput.
+"""
+
+from typing import List
+
+import numpy as np
+
+from config.constants import SECONDS_PER_STEP
+from config.thresholds import HOVER_DISTANCE_THRESHOLD_KM
+from core.geo import bearing_deg_array, haversine_km_array
+from core.instrument import count
+from metrics.risk_raster import get_risk_raster
+from simulation.track import Track
+
+# Positions per vectorised batch; bounds temporary memory for huge fleets
+_BATCH_POSITIONS = 1 << 20
+
+
+def _step_sum_table(max_count: int) -> np.ndarray:
+    """table[k] == 0.0 + SECONDS_PER_STEP + ... (k times), summed in order."""
+    table = np.empty(max_count + 1, dtype=np.float64)
+    table[0] = 0.0
+    # add.accumulate is sequential, matching the loop's running +=
+    np.cumsum(np.full(max_count, SECONDS_PER_STEP), out=table[1:])
+    return table
+
+
+def enrich_fleet_metrics(drones: list, exact: bool = True) -> None:
+    """
+    Compute per-step metrics for all drones, in batches of whole tracks.
+    Writes the metric columns of each drone.positions in place.
+    """
+    batch: List[Track] = []
+    batch_len = 0
+    for drone in drones:
+        count("positions_enriched", len(drone.positions))
+        batch.append(drone.positions)
+        batch_len += len(drone.positions)
+        if batch_len >= _BATCH_POSITIONS:
+            _enrich_tracks(batch, exact)
+            batch = []
+            batch_len = 0
+    if batch:
+        _enrich_tracks(batch, exact)
+
+
+def _enrich_tracks(tracks: List[Track], exact: bool) -> None:
+    """Vectorised metrics over the concatenation of tracks."""
+    lengths = np.array([len(t) for t in tracks], dtype=np.int64)
+    n = int(lengths.sum())
+    if n == 0:
+        return
+
+    lat = np.concatenate([t.column("lat") for t in tracks])
+    lon = np.concatenate([t.column("lon") for t in tracks])
+    idx = np.arange(n)
+    starts = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+    seg_start = np.repeat(starts, lengths)
+    first = idx == seg_start
+
+    # Step distance and heading (undefined at track start or when stationary)
+    distance = np.zeros(n)
+    distance[1:] = haversine_km_array(lat[:-1], lon[:-1], lat[1:], lon[1:], exact)
+    distance[first] = 0.0
+    heading = np.full(n, np.nan)
+    moved = distance > 0.0
+    moved_idx = np.flatnonzero(moved)
+    heading[moved] = bearing_deg_array(
+        lat[moved_idx - 1], lon[moved_idx - 1], lat[moved], lon[moved], exact
+    )
+
+    # Hover streak: length of the current run of sub-threshold steps
+    hovering = distance < HOVER_DISTANCE_THRESHOLD_KM
+    breaks = np.where(~hovering, idx, np.where(first, idx - 1, -1))
+    hover_count = idx - np.maximum.accumulate(breaks)
+
+    # Risk zone and sensor target from one batched nearest-POI query
+    count("poi_lookups", n)
+    raster = get_risk_raster()
+    poi_idx, in_risk = raster.classify_many(lat, lon, exact)
+    risk_cum = np.cumsum(in_risk)
+    risk_count = risk_cum - (risk_cum[seg_start] - in_risk[seg_start])
+
+    table = _step_sum_table(int(max(hover_count.max(), risk_count.max())))
+    hover_s = table[hover_count]
+    threat_time_s = table[risk_count]
+
+    # Deviation against the last defined heading earlier in the same track
+    has_heading = ~np.isnan(heading)
+    last_heading_idx = np.maximum.accumulate(np.where(has_heading, idx, -1))
+    prev_idx = np.full(n, -1)
+    prev_idx[1:] = last_heading_idx[:-1]
+    turned = has_heading & (prev_idx >= seg_start)
+    diff = np.abs(heading[turned] - heading[prev_idx[turned]])
+    deviation = np.zeros(n)
+    deviation[turned] = np.where(diff > 180.0, 360.0 - diff, diff)
+
+    has_poi = poi_idx >= 0
+    orientation = np.full(n, np.nan)
+    orientation[has_poi] = bearing_deg_array(
+        lat[has_poi],
+        lon[has_poi],
+        raster.index.lat[poi_idx[has_poi]],
+        raster.index.lon[poi_idx[has_poi]],
+        exact,
+    )
+    speed = distance * 1000.0 / SECONDS_PER_STEP
+
+    # POI index -> string code per pool; index -1 (no POI) maps to code -1
+    names: List[str] = raster.index.names
+    pool_codes = {}
+    for track, start, length in zip(tracks, starts.tolist(), lengths.tolist()):
+        sl = slice(start, start + length)
+        name_codes = pool_codes.get(id(track.pool))
+        if name_codes is None:
+            name_codes = np.append(track.pool.intern_many(names), np.int32(-1))
+            pool_codes[id(track.pool)] = name_codes
+        track.set_column("in_risk_zone", in_risk[sl])
+        track.set_column("distance_km", distance[sl])
+        track.set_column("hovering_duration_s", hover_s[sl])
+        track.set_column("flight_deviation_deg", deviation[sl])
+        track.set_column("sensor_orientation_deg", orientation[sl])
+        track.set_column("sensor_target", name_codes[poi_idx[sl]])
+        track.set_column("heading_deg", heading[sl])
+        track.set_column("ground_speed_mps", speed[sl])
+        track.set_column("threat_time_s", threat_time_s[sl])
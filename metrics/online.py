@@ -0,0 +1,157 @@
+"""
+Online metrics and scoring for live telemetry.
+
+TrackState carries the running state of one track (last fix, last heading,
+hover streak, risk time, rolling window) and turns each incoming fix into
+the enriched record plus threat_score in O(1), using the same rules as the
+batch path (metrics.behavior.step_metrics, metrics.rolling and
+metrics.scoring.compute_threat_score).
+OnlineTracker keeps one TrackState per drone id with a bounded table, and
+both record per-fix latency.
+"""
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from core.instrument import count
+from metrics.behavior import MetricState, step_metrics
+from metrics.rolling import RollingState
+from metrics.scoring import compute_threat_score
+
+# Latency histogram: bucket k counts fixes that took [2^k, 2^(k+1)) ns
+_LATENCY_BUCKETS = 40
+
+
+@dataclass
+class LatencyStats:
+    """Fixed-size latency summary (count, mean, max, log2 histogram)."""
+
+    count: int = 0
+    total_ns: int = 0
+    max_ns: int = 0
+    buckets: List[int] = field(default_factory=lambda: [0] * _LATENCY_BUCKETS)
+
+    def record(self, elapsed_ns: int) -> None:
+        self.count += 1
+        self.total_ns += elapsed_ns
+        if elapsed_ns > self.max_ns:
+            self.max_ns = elapsed_ns
+        bucket = min(max(elapsed_ns, 1).bit_length() - 1, _LATENCY_BUCKETS - 1)
+        self.buckets[bucket] += 1
+
+    def merge(self, other: "LatencyStats") -> None:
+        self.count += other.count
+        self.total_ns += other.total_ns
+        self.max_ns = max(self.max_ns, other.max_ns)
+        for k, n in enumerate(other.buckets):
+            self.buckets[k] += n
+
+    @property
+    def mean_ns(self) -> float:
+        return self.total_ns / self.count if self.count else 0.0
+
+    def percentile_ns(self, q: float) -> int:
+        """Upper bound of the histogram bucket holding the q-th percentile."""
+        if not self.count:
+            return 0
+        target = q / 100.0 * self.count
+        seen = 0
+        for k, n in enumerate(self.buckets):
+            seen += n
+            if seen >= target:
+                return min(2 ** (k + 1), self.max_ns)
+        return self.max_ns
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "fixes": self.count,
+            "mean_us": round(self.mean_ns / 1000.0, 3),
+            "p50_us": round(self.percentile_ns(50) / 1000.0, 3),
+            "p99_us": round(self.percentile_ns(99) / 1000.0, 3),
+            "max_us": round(self.max_ns / 1000.0, 3),
+        }
+
+
+class TrackState:
+    """Incremental metrics and threat score for one track."""
+
+    __slots__ = ("metrics", "rolling", "fixes", "latency")
+
+    def __init__(self) -> None:
+        self.metrics = MetricState()
+        self.rolling = RollingState()
+        self.fixes = 0
+        self.latency = LatencyStats()
+
+    def update(
+        self,
+        lat: float,
+        lon: float,
+        altitude: float,
+        timestamp: str,
+        step: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Consume one fix; return its enriched record with threat_score."""
+        start_ns = time.perf_counter_ns()
+        record: Dict[str, Any] = {
+            "lat": lat,
+            "lon": lon,
+            "altitude": altitude,
+            "timestamp": timestamp,
+            "step": self.fixes if step is None else step,
+        }
+        record.update(step_metrics(self.metrics, lat, lon))
+        record.update(self.rolling.update(record))
+        record["threat_score"] = compute_threat_score(record)
+        self.fixes += 1
+        count("positions_enriched")
+        self.latency.record(time.perf_counter_ns() - start_ns)
+        return record
+
+
+class OnlineTracker:
+    """
+    TrackState per drone id. At most max_tracks are kept; the least recently
+    updated track is evicted first, so memory stays bounded.
+    """
+
+    def __init__(self, max_tracks: int = 10_000) -> None:
+        self.max_tracks = max_tracks
+        self.tracks: "OrderedDict[str, TrackState]" = OrderedDict()
+        self.evicted = 0
+        self._evicted_latency = LatencyStats()
+
+    def __len__(self) -> int:
+        return len(self.tracks)
+
+    def update(
+        self,
+        drone_id: str,
+        lat: float,
+        lon: float,
+        altitude: float,
+        timestamp: str,
+        step: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Route a fix to its track (creating it if new) and return the record."""
+        state = self.tracks.get(drone_id)
+        if state is None:
+            state = TrackState()
+            self.tracks[drone_id] = state
+            if len(self.tracks) > self.max_tracks:
+                _, old = self.tracks.popitem(last=False)
+                self._evicted_latency.merge(old.latency)
+                self.evicted += 1
+        else:
+            self.tracks.move_to_end(drone_id)
+        return state.update(lat, lon, altitude, timestamp, step)
+
+    def latency(self) -> LatencyStats:
+        """Latency over every fix seen, including evicted tracks."""
+        total = LatencyStats()
+        total.merge(self._evicted_latency)
+        for state in self.tracks.values():
+            total.merge(state.latency)
+        return total
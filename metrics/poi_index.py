@@ -0,0 +1,243 @@
+"""
+Spatial index over risk POIs: nearest-POI and within-radius queries.
+
+POIs are projected onto a local equirectangular plane (km) around the
+catalogue centre and bucketed into a uniform grid. Queries visit grid rings
+outward from the query cell and compare candidates with exact haversine
+distances, so answers (including ties, which go to the lower POI index)
+match a linear scan over the catalogue. Small catalogues skip the grid and
+scan the cached arrays directly.
+"""
+
+import math
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from config.port_botany import get_risk_pois
+from config.thresholds import RISK_ZONE_RADIUS_KM
+from core.geo import EARTH_RADIUS_KM, haversine_km, haversine_km_matrix
+from core.instrument import count
+
+KM_PER_DEG = EARTH_RADIUS_KM * math.pi / 180.0
+
+# Projected distances may under/over-estimate great-circle distance by this
+# fraction over a regional (port-scale, a few hundred km) catalogue
+_PROJECTION_SLACK = 0.05
+
+# Catalogues up to this size are scanned linearly instead of via the grid
+_LINEAR_SCAN_MAX = 32
+
+# Rows per block when evaluating query x candidate distance matrices
+_BATCH_ROWS = 16384
+
+
+class PoiIndex:
+    """Prebuilt grid index over a POI catalogue."""
+
+    def __init__(
+        self, pois: Sequence[Dict[str, Any]], cell_km: float = RISK_ZONE_RADIUS_KM
+    ) -> None:
+        self.pois: List[Dict[str, Any]] = list(pois)
+        self.lat = np.array([p["lat"] for p in self.pois], dtype=np.float64)
+        self.lon = np.array([p["lon"] for p in self.pois], dtype=np.float64)
+        self.weight = np.array([p["weight"] for p in self.pois], dtype=np.float64)
+        self.names: List[str] = [p["name"] for p in self.pois]
+        self.cell_km = cell_km
+        self._coords: List[Tuple[float, float]] = list(
+            zip(self.lat.tolist(), self.lon.tolist())
+        )
+
+        if self.pois:
+            self._lat0 = float(self.lat.mean())
+            self._lon0 = float(self.lon.mean())
+        else:
+            self._lat0 = self._lon0 = 0.0
+        self._kx = KM_PER_DEG * math.cos(math.radians(self._lat0))
+
+        cx, cy = self._cells(self.lat, self.lon)
+        buckets: Dict[Tuple[int, int], List[int]] = {}
+        for i, key in enumerate(zip(cx.tolist(), cy.tolist())):
+            buckets.setdefault(key, []).append(i)
+        self._cell_keys = np.array(list(buckets), dtype=np.int64).reshape(-1, 2)
+        self._cell_members = [np.array(v, dtype=np.int64) for v in buckets.values()]
+        self._buckets = dict(zip(buckets, self._cell_members))
+
+    def __len__(self) -> int:
+        return len(self.pois)
+
+    def _cells(self, lats: Any, lons: Any) -> Tuple[np.ndarray, np.ndarray]:
+        lats = np.asarray(lats, dtype=np.float64)
+        lons = np.asarray(lons, dtype=np.float64)
+        x = (lons - self._lon0) * self._kx
+        y = (lats - self._lat0) * KM_PER_DEG
+        return (
+            np.floor(x / self.cell_km).astype(np.int64),
+            np.floor(y / self.cell_km).astype(np.int64),
+        )
+
+    def _rings(self, cx: int, cy: int) -> Iterator[Tuple[int, np.ndarray]]:
+        """Yield (ring, poi_indices) for occupied cells, nearest Chebyshev ring first."""
+        n_cells = len(self._cell_members)
+        visited = 0
+        r = 0
+        # Dense rings: probe each cell of the ring in the bucket dict
+        while visited < n_cells and max(1, 8 * r) <= n_cells:
+            members = [
+                self._buckets[key]
+                for key in _ring_cells(cx, cy, r)
+                if key in self._buckets
+            ]
+            if members:
+                visited += len(members)
+                yield r, np.concatenate(members)
+            r += 1
+        if visited == n_cells:
+            return
+
+        # Sparse rings: jump straight between the remaining occupied cells
+        ring = np.maximum(
+            np.abs(self._cell_keys[:, 0] - cx), np.abs(self._cell_keys[:, 1] - cy)
+        )
+        remaining = np.flatnonzero(ring >= r)
+        order = remaining[np.argsort(ring[remaining], kind="stable")]
+        ring_sorted = ring[order].tolist()
+        order = order.tolist()
+        start = 0
+        while start < len(order):
+            r = ring_sorted[start]
+            stop = start + 1
+            while stop < len(order) and ring_sorted[stop] == r:
+                stop += 1
+            members = [self._cell_members[c] for c in order[start:stop]]
+            yield r, np.concatenate(members)
+            start = stop
+
+    def _ring_floor_km(self, r: int) -> float:
+        """Lower bound on true distance to any POI in ring r."""
+        return max(0, r - 1) * self.cell_km * (1.0 - _PROJECTION_SLACK)
+
+    def nearest(self, lat: float, lon: float) -> Tuple[int, float]:
+        """Return (poi_index, distance_km); (-1, inf) for an empty catalogue."""
+        count("poi_index_lookups")
+        best_i = -1
+        best_d = float("inf")
+        if len(self.pois) <= _LINEAR_SCAN_MAX:
+            for i, (plat, plon) in enumerate(self._coords):
+                d = haversine_km(lat, lon, plat, plon)
+                if d < best_d:
+                    best_d = d
+                    best_i = i
+            return best_i, best_d
+
+        cx, cy = self._cells(lat, lon)
+        for r, members in self._rings(int(cx), int(cy)):
+            if best_i >= 0 and best_d < self._ring_floor_km(r):
+                break
+            for i in np.sort(members).tolist():
+                plat, plon = self._coords[i]
+                d = haversine_km(lat, lon, plat, plon)
+                if d < best_d or (d == best_d and i < best_i):
+                    best_d = d
+                    best_i = i
+        return best_i, best_d
+
+    def nearest_many(
+        self, lats: Any, lons: Any, exact: bool = False
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Batch nearest POI. Returns (poi_index int64[n], distance_km float64[n]).
+        exact=True makes distances bit-identical to haversine_km.
+        """
+        lats = np.asarray(lats, dtype=np.float64).ravel()
+        lons = np.asarray(lons, dtype=np.float64).ravel()
+        n = lats.shape[0]
+        count("poi_index_lookups", n)
+        best_i = np.full(n, -1, dtype=np.int64)
+        best_d = np.full(n, np.inf)
+        if not self.pois or n == 0:
+            return best_i, best_d
+
+        if len(self.pois) <= _LINEAR_SCAN_MAX:
+            for start in range(0, n, _BATCH_ROWS):
+                sl = slice(start, start + _BATCH_ROWS)
+                d = haversine_km_matrix(lats[sl], lons[sl], self.lat, self.lon, exact)
+                best_i[sl] = np.argmin(d, axis=1)
+                best_d[sl] = d[np.arange(d.shape[0]), best_i[sl]]
+            return best_i, best_d
+
+        cx, cy = self._cells(lats, lons)
+        cells, inverse = np.unique(np.stack([cx, cy], axis=1), axis=0, return_inverse=True)
+        inverse = inverse.ravel()
+        order = np.argsort(inverse, kind="stable")
+        bounds = np.searchsorted(inverse[order], np.arange(len(cells) + 1))
+        for k, (qx, qy) in enumerate(cells.tolist()):
+            rows = order[bounds[k] : bounds[k + 1]]
+            candidates = np.empty(0, dtype=np.int64)
+            for r, members in self._rings(qx, qy):
+                if candidates.size and best_d[rows].max() < self._ring_floor_km(r):
+                    break
+                candidates = np.sort(np.concatenate([candidates, members]))
+                d = haversine_km_matrix(
+                    lats[rows], lons[rows], self.lat[candidates], self.lon[candidates], exact
+                )
+                j = np.argmin(d, axis=1)
+                best_i[rows] = candidates[j]
+                best_d[rows] = d[np.arange(len(rows)), j]
+        return best_i, best_d
+
+    def within_radius(self, lat: float, lon: float, radius_km: float) -> List[int]:
+        """Indices of all POIs within radius_km of (lat, lon), ascending."""
+        count("poi_index_lookups")
+        if len(self.pois) <= _LINEAR_SCAN_MAX:
+            candidates = range(len(self.pois))
+        else:
+            cx, cy = self._cells(lat, lon)
+            reach = math.ceil(radius_km * (1.0 + _PROJECTION_SLACK) / self.cell_km)
+            found = [np.empty(0, dtype=np.int64)]
+            for r, members in self._rings(int(cx), int(cy)):
+                if r > reach:
+                    break
+                found.append(members)
+            candidates = np.sort(np.concatenate(found)).tolist()
+        return [
+            i
+            for i in candidates
+            if haversine_km(lat, lon, *self._coords[i]) <= radius_km
+        ]
+
+    def within_radius_many(
+        self, lats: Any, lons: Any, radius_km: float, exact: bool = False
+    ) -> np.ndarray:
+        """Boolean mask: is any POI within radius_km of each query point."""
+        _, dist = self.nearest_many(lats, lons, exact)
+        return dist <= radius_km
+
+    def distance_km(self, index: int, lat: float, lon: float) -> float:
+        """Exact distance (km) from (lat, lon) to POI index."""
+        plat, plon = self._coords[index]
+        return haversine_km(lat, lon, plat, plon)
+
+    def poi(self, index: int) -> Optional[Dict[str, Any]]:
+        """POI dict for an index returned by a query (None for -1)."""
+        return None if index < 0 else self.pois[index]
+
+
+def _ring_cells(cx: int, cy: int, r: int) -> Iterator[Tuple[int, int]]:
+    """Grid cells at Chebyshev distance exactly r from (cx, cy)."""
+    if r == 0:
+        yield cx, cy
+        return
+    for x in range(cx - r, cx + r + 1):
+        yield x, cy - r
+        yield x, cy + r
+    for y in range(cy - r + 1, cy + r):
+        yield cx - r, y
+        yield cx + r, y
+
+
+@lru_cache(maxsize=1)
+def get_poi_index() -> PoiIndex:
+    """Process-wide index over get_risk_pois(), built on first use."""
+    return PoiIndex(get_risk_pois())
@@ -0,0 +1,131 @@
+"""
+Per-step threat ranking: the top-K drones by threat_score at every step and
+the headline (level + action) of the leader, computed once on the Python side.
+
+rank_steps handles a finished run in step blocks: argpartition gives each
+step's top K in O(N), and only those K are sorted. TopKTracker handles live
+updates: scores arrive one drone at a time and a lazy-deletion heap answers
+top-K without re-sorting the fleet. Both order by score descending, ties by
+lower drone index, like the page's former stable sort.
+"""
+
+import heapq
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from metrics.scoring import threat_headline_codes
+
+# Steps per block when building step x drone score matrices
+_STEP_BLOCK = 256
+
+
+@dataclass
+class StepRanking:
+    """
+    top[s] holds the drone indices ranked at step s, best first (-1 pads);
+    headline[s] indexes THREAT_HEADLINES for the leader.
+    """
+
+    top: np.ndarray  # int32 (steps, k)
+    headline: np.ndarray  # int8 (steps,)
+
+
+def _rank_block(scores: np.ndarray, k: int) -> np.ndarray:
+    """Top-k column indices per row of scores, best first; -1 where -inf."""
+    n = scores.shape[1]
+    if k < n:
+        part = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        part_scores = np.take_along_axis(scores, part, axis=1)
+        # Ties straddling the k-th place: argpartition may keep a higher
+        # index, so those rows fall back to a stable full sort
+        kth = part_scores.min(axis=1, keepdims=True)
+        tied = (scores == kth).sum(axis=1) > (part_scores == kth).sum(axis=1)
+        if tied.any():
+            part[tied] = np.argsort(-scores[tied], axis=1, kind="stable")[:, :k]
+            part_scores[tied] = np.take_along_axis(scores[tied], part[tied], axis=1)
+    else:
+        part = np.broadcast_to(np.arange(n), scores.shape).copy()
+        part_scores = scores.copy()
+    # Sort by (-score, index): lexsort's last key is the primary one
+    order = np.lexsort((part, -part_scores), axis=1)
+    top = np.take_along_axis(part, order, axis=1)
+    top_scores = np.take_along_axis(part_scores, order, axis=1)
+    top[np.isneginf(top_scores)] = -1
+    return top.astype(np.int32)
+
+
+def rank_steps(drones: list, k: int) -> StepRanking:
+    """Top-k ranking and leader headline for every step of scored tracks."""
+    n = len(drones)
+    steps = max((len(d.positions) for d in drones), default=0)
+    k = min(k, n)
+    top = np.full((steps, k), -1, dtype=np.int32)
+    headline = np.zeros(steps, dtype=np.int8)
+    if steps == 0 or k == 0:
+        return StepRanking(top, headline)
+
+    scores_by_drone = [d.positions.column("threat_score") for d in drones]
+    headlines_by_drone = [threat_headline_codes(d.positions) for d in drones]
+    for start in range(0, steps, _STEP_BLOCK):
+        stop = min(start + _STEP_BLOCK, steps)
+        # Drones without a position at a step rank last (-inf)
+        scores = np.full((stop - start, n), -np.inf)
+        codes = np.zeros((stop - start, n), dtype=np.int8)
+        for j, (score, code) in enumerate(zip(scores_by_drone, headlines_by_drone)):
+            m = min(len(score), stop) - start
+            if m > 0:
+                scores[:m, j] = score[start : start + m]
+                codes[:m, j] = code[start : start + m]
+        block_top = _rank_block(scores, k)
+        top[start:stop] = block_top
+        leader = block_top[:, 0]
+        rows = np.flatnonzero(leader >= 0)
+        headline[start + rows] = codes[rows, leader[rows]]
+    return StepRanking(top, headline)
+
+
+class TopKTracker:
+    """
+    Live top-K over drones whose scores change one at a time. update() is
+    O(log N); top() is O(K log N) amortised, skipping superseded entries.
+    """
+
+    def __init__(self) -> None:
+        self._heap: List[Tuple[float, int, int]] = []
+        self._version: Dict[int, int] = {}
+        self._score: Dict[int, float] = {}
+
+    def __len__(self) -> int:
+        return len(self._score)
+
+    def update(self, drone: int, score: float) -> None:
+        version = self._version.get(drone, 0) + 1
+        self._version[drone] = version
+        self._score[drone] = score
+        heapq.heappush(self._heap, (-score, drone, version))
+        # Rebuild once stale entries dominate, so memory stays O(N)
+        if len(self._heap) > 4 * len(self._score) + 64:
+            self._heap = [(-s, d, self._version[d]) for d, s in self._score.items()]
+            heapq.heapify(self._heap)
+
+    def remove(self, drone: int) -> None:
+        if drone in self._score:
+            del self._score[drone]
+            self._version[drone] = self._version.get(drone, 0) + 1
+
+    def top(self, k: int) -> List[Tuple[int, float]]:
+        """(drone, score) of the k best, score descending then drone ascending."""
+        out: List[Tuple[int, float]] = []
+        popped = []
+        while self._heap and len(out) < k:
+            entry = heapq.heappop(self._heap)
+            neg_score, drone, version = entry
+            if self._version.get(drone) != version or drone not in self._score:
+                continue  # superseded
+            out.append((drone, -neg_score))
+            popped.append(entry)
+        for entry in popped:
+            heapq.heappush(self._heap, entry)
+        return out
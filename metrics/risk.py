@@ -4,22 +4,16 @@ Risk zone detection: distance to POIs, weighted risk bubbles.
 
 from typing import Tuple, Dict, Any, Optional, List
 
-from config.port_botany import get_risk_pois
-from config.thresholds import RISK_ZONE_RADIUS_KM
-from core.geo import haversine_km
+from core.instrument import count
+from metrics.risk_raster import get_risk_raster
 
 
 def nearest_poi(lat: float, lon: float) -> Tuple[Optional[Dict[str, Any]], float]:
     """Return (poi, distance_km) for the closest high-risk POI."""
-    pois = get_risk_pois()
-    closest = None
-    best_d = float("inf")
-    for poi in pois:
-        d = haversine_km(lat, lon, poi["lat"], poi["lon"])
-        if d < best_d:
-            best_d = d
-            closest = poi
-    return closest, best_d
+    count("poi_lookups")
+    raster = get_risk_raster()
+    i, best_d = raster.nearest_poi(lat, lon)
+    return raster.index.poi(i), best_d
 
 
 def is_high_risk_zone(lat: float, lon: float) -> bool:
@@ -27,14 +21,14 @@ def is_high_risk_zone(lat: float, lon: float) -> bool:
     Drone is in a high-risk zone when within RISK_ZONE_RADIUS_KM
     of any high-weight POI.
     """
-    _, dist_km = nearest_poi(lat, lon)
-    return dist_km <= RISK_ZONE_RADIUS_KM
+    count("poi_lookups")
+    return get_risk_raster().in_risk_zone(lat, lon)
 
 
 def generate_risk_heat_points() -> List[Dict[str, Any]]:
     """Return POIs as heatmap points for map display."""
     points = []
-    for poi in get_risk_pois():
+    for poi in get_risk_raster().index.pois:
         points.append(
             {
                 "lat": poi["lat"],
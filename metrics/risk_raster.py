@@ -0,0 +1,290 @@
+"""
+Precomputed risk-field raster over the Port Botany bounding box.
+
+Each cell stores the nearest POI index, the distance from the cell centre to
+it, and a zone flag (1 inside RISK_ZONE_RADIUS_KM, 0 outside). Cells where the
+answer could change inside the cell (near a zone boundary, or where two POIs
+are almost equidistant) are marked unresolved (-1) and callers fall back to
+the exact PoiIndex query, so lookups never disagree with the exact path.
+
+Rasters are keyed by the POI set and grid parameters, saved as .npy files in
+RISK_RASTER_CACHE_DIR and memory-mapped on later runs.
+"""
+
+import hashlib
+import json
+import math
+import os
+import shutil
+import tempfile
+from functools import lru_cache
+from typing import Any, Tuple
+
+import numpy as np
+
+from config.constants import RISK_RASTER_CACHE_DIR, RISK_RASTER_CELL_DEG
+from config.port_botany import LAT_MIN, LAT_MAX, LON_MIN, LON_MAX
+from config.thresholds import RISK_ZONE_RADIUS_KM
+from core.geo import haversine_km_array, haversine_km_matrix
+from metrics.poi_index import PoiIndex, get_poi_index
+
+# Bump when the on-disk layout or classification rules change
+_FORMAT_VERSION = 1
+
+# Absorbs floating-point error in the triangle-inequality margins (km)
+_MARGIN_EPS_KM = 1e-9
+
+# Cells per block when building
+_BUILD_BLOCK = 65536
+
+UNRESOLVED = -1
+
+
+class RiskRaster:
+    """Grid of nearest-POI ids, centre distances and risk-zone flags."""
+
+    def __init__(
+        self,
+        index: PoiIndex,
+        lat_min: float,
+        lon_min: float,
+        cell_deg: float,
+        radius_km: float,
+        nearest: np.ndarray,
+        distance_km: np.ndarray,
+        zone: np.ndarray,
+    ) -> None:
+        self.index = index
+        self.lat_min = lat_min
+        self.lon_min = lon_min
+        self.cell_deg = cell_deg
+        self.radius_km = radius_km
+        self.nearest = nearest
+        self.distance_km = distance_km
+        self.zone = zone
+        self.rows, self.cols = nearest.shape
+
+    @classmethod
+    def build(
+        cls,
+        index: PoiIndex,
+        lat_min: float = LAT_MIN,
+        lat_max: float = LAT_MAX,
+        lon_min: float = LON_MIN,
+        lon_max: float = LON_MAX,
+        cell_deg: float = RISK_RASTER_CELL_DEG,
+        radius_km: float = RISK_ZONE_RADIUS_KM,
+    ) -> "RiskRaster":
+        """Evaluate every cell centre against the full POI set."""
+        rows = int((lat_max - lat_min) / cell_deg) + 1
+        cols = int((lon_max - lon_min) / cell_deg) + 1
+        lat_c = lat_min + (np.arange(rows) + 0.5) * cell_deg
+        lon_c = lon_min + (np.arange(cols) + 0.5) * cell_deg
+
+        # Great-circle half-diagonal per row bounds how far any point in a
+        # cell can be from its centre (widest corner, toward the equator)
+        half = cell_deg / 2
+        half_diag = np.maximum(
+            haversine_km_array(lat_c, 0.0, lat_c + half, half),
+            haversine_km_array(lat_c, 0.0, lat_c - half, half),
+        )
+
+        cell_lat = np.repeat(lat_c, cols)
+        cell_lon = np.tile(lon_c, rows)
+        cell_h = np.repeat(half_diag, cols) + _MARGIN_EPS_KM
+        n = rows * cols
+        nearest = np.full(n, UNRESOLVED, dtype=np.int32)
+        distance = np.full(n, np.inf, dtype=np.float32)
+        zone = np.zeros(n, dtype=np.int8)
+
+        if len(index):
+            for start in range(0, n, _BUILD_BLOCK):
+                sl = slice(start, start + _BUILD_BLOCK)
+                d = haversine_km_matrix(cell_lat[sl], cell_lon[sl], index.lat, index.lon)
+                i1 = np.argmin(d, axis=1)
+                d1 = d[np.arange(d.shape[0]), i1]
+                if d.shape[1] > 1:
+                    d2 = np.partition(d, 1, axis=1)[:, 1]
+                else:
+                    d2 = np.full_like(d1, np.inf)
+                h = cell_h[sl]
+                # i1 is nearest everywhere in the cell only if it wins by 2h
+                nearest[sl] = np.where(d2 - d1 > 2 * h, i1, UNRESOLVED)
+                distance[sl] = d1
+                zone[sl] = np.where(
+                    d1 + h < radius_km, 1, np.where(d1 - h > radius_km, 0, UNRESOLVED)
+                )
+
+        return cls(
+            index,
+            lat_min,
+            lon_min,
+            cell_deg,
+            radius_km,
+            nearest.reshape(rows, cols),
+            distance.reshape(rows, cols),
+            zone.reshape(rows, cols),
+        )
+
+    def _cell(self, lat: float, lon: float) -> Tuple[int, int]:
+        if not (math.isfinite(lat) and math.isfinite(lon)):
+            return -1, -1
+        r = math.floor((lat - self.lat_min) / self.cell_deg)
+        c = math.floor((lon - self.lon_min) / self.cell_deg)
+        if 0 <= r < self.rows and 0 <= c < self.cols:
+            return r, c
+        return -1, -1
+
+    def nearest_poi(self, lat: float, lon: float) -> Tuple[int, float]:
+        """
+        (poi_index, distance_km), exact; same answer as PoiIndex.nearest.
+        Non-finite coordinates have no nearest POI: (UNRESOLVED, inf).
+        """
+        if not (math.isfinite(lat) and math.isfinite(lon)):
+            return UNRESOLVED, math.inf
+        r, c = self._cell(lat, lon)
+        i = int(self.nearest[r, c]) if r >= 0 else UNRESOLVED
+        if i == UNRESOLVED:
+            return self.index.nearest(lat, lon)
+        return i, self.index.distance_km(i, lat, lon)
+
+    def in_risk_zone(self, lat: float, lon: float) -> bool:
+        """True within radius_km of any POI; exact check on boundary cells."""
+        r, c = self._cell(lat, lon)
+        flag = int(self.zone[r, c]) if r >= 0 else UNRESOLVED
+        if flag == UNRESOLVED:
+            return self.nearest_poi(lat, lon)[1] <= self.radius_km
+        return flag == 1
+
+    def _lookup_many(
+        self, lats: np.ndarray, lons: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Raw (nearest, zone) cell values; UNRESOLVED outside the box."""
+        fr = (lats - self.lat_min) / self.cell_deg
+        fc = (lons - self.lon_min) / self.cell_deg
+        # Non-finite points count as outside (NaN compares False)
+        inside = (fr >= 0) & (fr < self.rows) & (fc >= 0) & (fc < self.cols)
+        r = np.floor(np.where(inside, fr, 0.0)).astype(np.int64)
+        c = np.floor(np.where(inside, fc, 0.0)).astype(np.int64)
+        idx = np.full(lats.shape[0], UNRESOLVED, dtype=np.int64)
+        idx[inside] = self.nearest[r[inside], c[inside]]
+        flag = np.full(lats.shape[0], UNRESOLVED, dtype=np.int8)
+        flag[inside] = self.zone[r[inside], c[inside]]
+        return idx, flag
+
+    def nearest_many(
+        self, lats: Any, lons: Any, exact: bool = False
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Batch nearest_poi; unresolved or out-of-box points use PoiIndex."""
+        lats = np.asarray(lats, dtype=np.float64).ravel()
+        lons = np.asarray(lons, dtype=np.float64).ravel()
+        idx, _ = self._lookup_many(lats, lons)
+
+        dist = np.empty(lats.shape[0], dtype=np.float64)
+        hit = idx != UNRESOLVED
+        dist[hit] = haversine_km_array(
+            lats[hit], lons[hit], self.index.lat[idx[hit]], self.index.lon[idx[hit]], exact
+        )
+        finite = np.isfinite(lats) & np.isfinite(lons)
+        dist[~finite] = np.inf
+        miss = ~hit & finite
+        if miss.any():
+            idx[miss], dist[miss] = self.index.nearest_many(lats[miss], lons[miss], exact)
+        return idx, dist
+
+    def classify_many(
+        self, lats: Any, lons: Any, exact: bool = False
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Batch (nearest poi index, in-zone mask). Distances are only computed
+        for points whose cell leaves either answer unresolved.
+        """
+        lats = np.asarray(lats, dtype=np.float64).ravel()
+        lons = np.asarray(lons, dtype=np.float64).ravel()
+        idx, flag = self._lookup_many(lats, lons)
+        in_zone = flag == 1
+        need = (idx == UNRESOLVED) | (flag == UNRESOLVED)
+        if need.any():
+            idx[need], dist = self.nearest_many(lats[need], lons[need], exact)
+            in_zone[need] = dist <= self.radius_km
+        return idx, in_zone
+
+    def save(self, path: str) -> None:
+        """Write arrays to directory path (atomically replaced)."""
+        parent = os.path.dirname(os.path.abspath(path))
+        os.makedirs(parent, exist_ok=True)
+        tmp = tempfile.mkdtemp(dir=parent)
+        try:
+            np.save(os.path.join(tmp, "nearest.npy"), self.nearest)
+            np.save(os.path.join(tmp, "distance_km.npy"), self.distance_km)
+            np.save(os.path.join(tmp, "zone.npy"), self.zone)
+            with open(os.path.join(tmp, "meta.json"), "w", encoding="utf-8") as f:
+                json.dump(
+                    {
+                        "lat_min": self.lat_min,
+                        "lon_min": self.lon_min,
+                        "cell_deg": self.cell_deg,
+                        "radius_km": self.radius_km,
+                    },
+                    f,
+                )
+            if os.path.isdir(path):
+                shutil.rmtree(path)
+            os.replace(tmp, path)
+        except BaseException:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+
+    @classmethod
+    def load(cls, path: str, index: PoiIndex) -> "RiskRaster":
+        """Memory-map a raster previously written by save()."""
+        with open(os.path.join(path, "meta.json"), encoding="utf-8") as f:
+            meta = json.load(f)
+        return cls(
+            index,
+            meta["lat_min"],
+            meta["lon_min"],
+            meta["cell_deg"],
+            meta["radius_km"],
+            np.load(os.path.join(path, "nearest.npy"), mmap_mode="r"),
+            np.load(os.path.join(path, "distance_km.npy"), mmap_mode="r"),
+            np.load(os.path.join(path, "zone.npy"), mmap_mode="r"),
+        )
+
+
+def raster_key(
+    index: PoiIndex,
+    lat_min: float = LAT_MIN,
+    lat_max: float = LAT_MAX,
+    lon_min: float = LON_MIN,
+    lon_max: float = LON_MAX,
+    cell_deg: float = RISK_RASTER_CELL_DEG,
+    radius_km: float = RISK_ZONE_RADIUS_KM,
+) -> str:
+    """Content hash identifying a raster for a POI set and grid."""
+    payload = json.dumps(
+        {
+            "version": _FORMAT_VERSION,
+            "pois": [index.lat.tolist(), index.lon.tolist()],
+            "grid": [lat_min, lat_max, lon_min, lon_max, cell_deg],
+            "radius_km": radius_km,
+        }
+    )
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+
+@lru_cache(maxsize=1)
+def get_risk_raster() -> RiskRaster:
+    """Process-wide raster for the current POI set; built once, then mmapped."""
+    index = get_poi_index()
+    path = os.path.join(RISK_RASTER_CACHE_DIR, raster_key(index))
+    try:
+        return RiskRaster.load(path, index)
+    except (OSError, ValueError, KeyError):
+        pass
+    raster = RiskRaster.build(index)
+    try:
+        raster.save(path)
+    except OSError:
+        return raster
+    return RiskRaster.load(path, index)
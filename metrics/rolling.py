@@ -0,0 +1,179 @@
+"""
+Sliding-window behaviour features over the last ROLLING_WINDOW_S of a track:
+
+- heading_change_mean_deg / heading_change_var_deg2: mean and variance of
+  flight_deviation_deg, so one sharp turn and a persistent weave differ;
+- hover_fraction: share of fixes with a hover streak;
+- fixation_dwell_s: time the sensor has pointed at the current
+  sensor_target;
+- speed_jitter_mps: standard deviation of ground_speed_mps.
+
+Windows hold the fix itself and up to window - 1 fixes before it (shorter at
+the start of a track). The batch path takes window sums as differences of
+cumulative sums over whole tracks; RollingState keeps ring buffers and
+running sums for live tracks, re-summed from the buffers once per window so
+rounding error does not build up on long-lived tracks. Both cost O(1) per
+fix (amortised) whatever the window.
+"""
+
+import math
+from collections import Counter
+from typing import Any, Dict, Hashable, List
+
+import numpy as np
+
+from config.constants import ROLLING_WINDOW_S, SECONDS_PER_STEP
+from core.instrument import count
+
+# Fields produced per fix, in record order
+ROLLING_FIELDS = (
+    "heading_change_mean_deg",
+    "heading_change_var_deg2",
+    "hover_fraction",
+    "fixation_dwell_s",
+    "speed_jitter_mps",
+)
+
+
+def window_steps(window_s: float = ROLLING_WINDOW_S) -> int:
+    """Fixes per window (at least one)."""
+    return max(1, int(round(window_s / SECONDS_PER_STEP)))
+
+
+def _window_sums(x: np.ndarray, window: int) -> np.ndarray:
+    """Sum of x over each fix's window."""
+    c = np.concatenate([[0.0], np.cumsum(x)])
+    k = np.arange(1, x.shape[0] + 1)
+    return c[k] - c[np.maximum(k - window, 0)]
+
+
+def _window_matches(codes: np.ndarray, window: int) -> np.ndarray:
+    """Fixes in each fix's window with the same code (0 where code < 0)."""
+    n = codes.shape[0]
+    idx = np.arange(n, dtype=np.int64)
+    keys = codes.astype(np.int64) * (n + 1) + idx
+    sorted_keys = np.sort(keys)
+    start = codes.astype(np.int64) * (n + 1) + np.maximum(idx - window + 1, 0)
+    matches = np.searchsorted(sorted_keys, keys, side="right") - np.searchsorted(
+        sorted_keys, start, side="left"
+    )
+    return np.where(codes >= 0, matches, 0)
+
+
+def rolling_columns(track: Any, window: int) -> Dict[str, np.ndarray]:
+    """ROLLING_FIELDS columns for one enriched track."""
+    n = len(track)
+    filled = np.minimum(np.arange(1, n + 1), window).astype(np.float64)
+
+    deviation = track.column("flight_deviation_deg")
+    mean = _window_sums(deviation, window) / filled
+    var = np.maximum(_window_sums(deviation * deviation, window) / filled - mean * mean, 0.0)
+
+    hovering = (track.column("hovering_duration_s") > 0.0).astype(np.float64)
+    speed = track.column("ground_speed_mps")
+    speed_mean = _window_sums(speed, window) / filled
+    speed_var = _window_sums(speed * speed, window) / filled - speed_mean * speed_mean
+
+    dwell = _window_matches(track.column("sensor_target"), window) * SECONDS_PER_STEP
+    return {
+        "heading_change_mean_deg": mean,
+        "heading_change_var_deg2": var,
+        "hover_fraction": _window_sums(hovering, window) / filled,
+        "fixation_dwell_s": dwell.astype(np.float64),
+        "speed_jitter_mps": np.sqrt(np.maximum(speed_var, 0.0)),
+    }
+
+
+def compute_rolling_features(drones: list, window_s: float = ROLLING_WINDOW_S) -> None:
+    """
+    Attach the sliding-window features to every position of enriched
+    tracks. Writes the ROLLING_FIELDS columns of drone.positions in place.
+    """
+    window = window_steps(window_s)
+    for drone in drones:
+        track = drone.positions
+        count("positions_windowed", len(track))
+        if len(track) == 0:
+            continue
+        for name, values in rolling_columns(track, window).items():
+            track.set_column(name, values)
+
+
+class RollingState:
+    """Ring buffers and running sums for one live track's window."""
+
+    __slots__ = (
+        "window", "filled", "head", "deviation", "hovering", "speed", "targets",
+        "sum_dev", "sum_dev2", "sum_hover", "sum_speed", "sum_speed2", "target_counts",
+    )
+
+    def __init__(self, window_s: float = ROLLING_WINDOW_S) -> None:
+        self.window = window_steps(window_s)
+        self.filled = 0
+        self.head = 0
+        self.deviation: List[float] = [0.0] * self.window
+        self.hovering: List[float] = [0.0] * self.window
+        self.speed: List[float] = [0.0] * self.window
+        self.targets: List[Hashable] = [None] * self.window
+        self.sum_dev = 0.0
+        self.sum_dev2 = 0.0
+        self.sum_hover = 0.0
+        self.sum_speed = 0.0
+        self.sum_speed2 = 0.0
+        self.target_counts: Counter = Counter()
+
+    def update(self, record: Dict[str, Any]) -> Dict[str, float]:
+        """Slide the window over one enriched record; return its features."""
+        deviation = record["flight_deviation_deg"]
+        hovering = 1.0 if record["hovering_duration_s"] > 0.0 else 0.0
+        speed = record["ground_speed_mps"]
+        target = record["sensor_target"]
+
+        k = self.head
+        if self.filled == self.window:
+            old_dev, old_speed, old_target = self.deviation[k], self.speed[k], self.targets[k]
+            self.sum_dev -= old_dev
+            self.sum_dev2 -= old_dev * old_dev
+            self.sum_hover -= self.hovering[k]
+            self.sum_speed -= old_speed
+            self.sum_speed2 -= old_speed * old_speed
+            if old_target is not None:
+                self.target_counts[old_target] -= 1
+                if not self.target_counts[old_target]:
+                    del self.target_counts[old_target]
+        else:
+            self.filled += 1
+        self.deviation[k], self.hovering[k], self.speed[k] = deviation, hovering, speed
+        self.targets[k] = target
+        self.sum_dev += deviation
+        self.sum_dev2 += deviation * deviation
+        self.sum_hover += hovering
+        self.sum_speed += speed
+        self.sum_speed2 += speed * speed
+        if target is not None:
+            self.target_counts[target] += 1
+        self.head = (k + 1) % self.window
+        if self.head == 0:
+            self._resum()
+
+        n = self.filled
+        mean = self.sum_dev / n
+        speed_mean = self.sum_speed / n
+        speed_var = self.sum_speed2 / n - speed_mean * speed_mean
+        return {
+            "heading_change_mean_deg": mean,
+            "heading_change_var_deg2": max(self.sum_dev2 / n - mean * mean, 0.0),
+            "hover_fraction": self.sum_hover / n,
+            "fixation_dwell_s": (
+                self.target_counts[target] * SECONDS_PER_STEP if target is not None else 0.0
+            ),
+            "speed_jitter_mps": max(speed_var, 0.0) ** 0.5,
+        }
+
+    def _resum(self) -> None:
+        """Recompute the running sums from the buffers (drops drift)."""
+        self.sum_dev = math.fsum(self.deviation)
+        self.sum_dev2 = math.fsum(d * d for d in self.deviation)
+        self.sum_hover = math.fsum(self.hovering)
+        self.sum_speed = math.fsum(self.speed)
+        self.sum_speed2 = math.fsum(v * v for v in self.speed)
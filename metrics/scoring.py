@@ -2,10 +2,35 @@
 Unified dynamic threat score: risk zone time, hovering, deviation, sensor fixation.
 
 Used for telemetry ranking and threat headline. No hard-coding of threat drone.
+The score is linear in SCORE_FEATURES; score_features / linear_scores give
+the column form, also for many weight sets at once (metrics.sweep).
 """
 
+from typing import Any, Tuple
 
-def _compute_threat_score(pos: dict) -> float:
+import numpy as np
+
+from core.instrument import count
+
+# Headline levels, lowest first; "NONE" means no active threat
+THREAT_LEVELS = ("NONE", "LOW", "ELEVATED", "HIGH", "CRITICAL")
+
+# Linear score terms, summed in this order: risk-zone time (0 outside the
+# zone), hover streak, heading change, sensor fixed on a POI (0 / 1)
+SCORE_FEATURES = (
+    "risk_time_s",
+    "hovering_duration_s",
+    "flight_deviation_deg",
+    "sensor_fixated",
+)
+RISK_TIME_WEIGHT = 0.5
+HOVER_WEIGHT = 0.3
+DEVIATION_WEIGHT = 0.02
+SENSOR_WEIGHT = 2.0
+SCORE_WEIGHTS = np.array([RISK_TIME_WEIGHT, HOVER_WEIGHT, DEVIATION_WEIGHT, SENSOR_WEIGHT])
+
+
+def compute_threat_score(pos: dict) -> float:
     """
     Combine risk zone time, hovering, flight deviation, sensor fixation
     into a single threat score.
@@ -13,20 +38,116 @@ def _compute_threat_score(pos: dict) -> float:
     score = 0.0
 
     if pos.get("in_risk_zone"):
-        score += pos.get("threat_time_s", 0) * 0.5
-    score += pos.get("hovering_duration_s", 0) * 0.3
-    score += pos.get("flight_deviation_deg", 0) * 0.02
+        score += pos.get("threat_time_s", 0) * RISK_TIME_WEIGHT
+    score += pos.get("hovering_duration_s", 0) * HOVER_WEIGHT
+    score += pos.get("flight_deviation_deg", 0) * DEVIATION_WEIGHT
     if pos.get("sensor_target"):
-        score += 2.0
+        score += SENSOR_WEIGHT
+
+    return score
 
+
+def score_features(track: Any) -> np.ndarray:
+    """(positions, SCORE_FEATURES) matrix of an enriched track."""
+    features = np.empty((len(track), len(SCORE_FEATURES)))
+    features[:, 0] = np.where(track.column("in_risk_zone"), track.column("threat_time_s"), 0.0)
+    features[:, 1] = track.column("hovering_duration_s")
+    features[:, 2] = track.column("flight_deviation_deg")
+    features[:, 3] = track.column("sensor_target") >= 0
+    return features
+
+
+def linear_scores(features: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """
+    Scores of feature rows under one weight vector (shape (n,)) or many
+    (shape (sets, n) from weights (sets, features)). Terms are added in
+    column order, so SCORE_WEIGHTS reproduces compute_threat_score exactly.
+    """
+    weights = np.asarray(weights, dtype=np.float64)
+    if weights.ndim == 1:
+        score = features[:, 0] * weights[0]
+        for j in range(1, features.shape[1]):
+            score = score + features[:, j] * weights[j]
+        return score
+    score = weights[:, 0:1] * features[:, 0]
+    for j in range(1, features.shape[1]):
+        score += weights[:, j : j + 1] * features[:, j]
     return score
 
 
 def compute_threat_scores(drones: list) -> None:
     """
     Attach threat_score to each position for ranking.
-    Modifies drone.positions in place.
+    Writes the threat_score column of drone.positions in place.
     """
     for drone in drones:
-        for pos in drone.positions:
-            pos["threat_score"] = _compute_threat_score(pos)
+        track = drone.positions
+        count("positions_scored", len(track))
+        track.set_column("threat_score", linear_scores(score_features(track), SCORE_WEIGHTS))
+
+
+# Headline (level, action) per rule of threat_level, in the order tested
+THREAT_HEADLINES = (
+    ("NONE", "No active threat detected."),
+    ("ELEVATED", "Dispatching friendly drones to shadow and inspect behaviour."),
+    ("HIGH", "Authorising intercept; EW / jamming or non\u2011kinetic effects."),
+    ("CRITICAL", "Air strike / hard\u2011kill option on table; neutralise immediately."),
+    ("ELEVATED", "Investigating suspicious behaviour."),
+    ("LOW", "Monitoring from command centre."),
+)
+
+# THREAT_LEVELS index of each headline
+_HEADLINE_LEVEL = np.array(
+    [THREAT_LEVELS.index(level) for level, _ in THREAT_HEADLINES], dtype=np.int8
+)
+
+
+def threat_level(pos: dict) -> Tuple[str, str]:
+    """
+    Headline level and recommended action for a scored position.
+    Same rules as the map sidebar headline.
+    """
+    score = pos.get("threat_score") or 0
+    if score <= 2:
+        return THREAT_HEADLINES[0]
+
+    tt = pos.get("threat_time_s") or 0
+    in_risk = bool(pos.get("in_risk_zone"))
+    if in_risk and 5 <= tt < 15:
+        return THREAT_HEADLINES[1]
+    if in_risk and 15 <= tt < 30:
+        return THREAT_HEADLINES[2]
+    if in_risk and tt >= 30:
+        return THREAT_HEADLINES[3]
+    if score > 5:
+        return THREAT_HEADLINES[4]
+    return THREAT_HEADLINES[5]
+
+
+def threat_headline_codes(track) -> np.ndarray:
+    """
+    threat_level for every position of a scored track, as indices into
+    THREAT_HEADLINES.
+    """
+    score = track.column("threat_score")
+    tt = track.column("threat_time_s")
+    in_risk = track.column("in_risk_zone")
+    return np.select(
+        [
+            score <= 2,
+            in_risk & (tt >= 5) & (tt < 15),
+            in_risk & (tt >= 15) & (tt < 30),
+            in_risk & (tt >= 30),
+            score > 5,
+        ],
+        [0, 1, 2, 3, 4],
+        default=5,
+    ).astype(np.int8)
+
+
+def threat_level_codes(track) -> np.ndarray:
+    """
+    threat_level for every position of a scored track, as indices into
+    THREAT_LEVELS.
+    """
+    return _HEADLINE_LEVEL[threat_headline_codes(track)]
@@ -0,0 +1,209 @@
+"""
+Swarm / coordination metrics: how each drone relates to the rest of the
+fleet at the same step.
+
+- nearest_drone_m: separation to the closest other drone within
+  SWARM_RADIUS_KM (None when there is none);
+- neighbours: drones within SWARM_RADIUS_KM;
+- co-loitering: neighbours hovering while this drone hovers too;
+- converging: other drones closing on the same POI within
+  SWARM_CONVERGE_KM while this one is.
+
+Neighbours come from a uniform grid with cells SWARM_RADIUS_KM across,
+keyed by (step, row, col), so every step of a run is one sort and nine
+searches rather than an all-pairs distance matrix per step; cost grows with
+fixes times local density. swarm_score weighs the three counts.
+"""
+
+import math
+from dataclasses import dataclass
+from typing import Tuple
+
+import numpy as np
+
+from config.constants import (
+    SWARM_COLOITER_WEIGHT,
+    SWARM_CONVERGE_WEIGHT,
+    SWARM_NEIGHBOUR_WEIGHT,
+)
+from config.port_botany import PORT_BOTANY_CENTER_LAT, PORT_BOTANY_CENTER_LON
+from config.thresholds import SWARM_CONVERGE_KM, SWARM_RADIUS_KM
+from core.instrument import count
+from metrics.poi_index import KM_PER_DEG, get_poi_index
+
+# Local plane: equirectangular around the port centre (km), fixed so batch
+# and streaming distances agree (same plane as prediction.kalman.to_local)
+_KX = KM_PER_DEG * math.cos(math.radians(PORT_BOTANY_CENTER_LAT))
+_KY = KM_PER_DEG
+
+# Positions per grid batch (whole steps); bounds temporary memory
+_BATCH_POSITIONS = 1 << 20
+
+
+@dataclass
+class SwarmFeatures:
+    """Per-fix swarm features, aligned with the input fixes."""
+
+    nearest_drone_m: np.ndarray  # NaN when no drone within SWARM_RADIUS_KM
+    neighbours: np.ndarray
+    co_loitering: np.ndarray
+    converging: np.ndarray
+    swarm_score: np.ndarray
+
+
+def swarm_score(
+    neighbours: np.ndarray, co_loitering: np.ndarray, converging: np.ndarray
+) -> np.ndarray:
+    """Weighted sum of the coordination counts."""
+    return (
+        neighbours * SWARM_NEIGHBOUR_WEIGHT
+        + co_loitering * SWARM_COLOITER_WEIGHT
+        + converging * SWARM_CONVERGE_WEIGHT
+    )
+
+
+def _neighbour_pairs(
+    frame: np.ndarray, lat: np.ndarray, lon: np.ndarray, radius_km: float
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(i, j, distance_km) for ordered pairs i != j in the same frame within radius."""
+    y = (lat - PORT_BOTANY_CENTER_LAT) * _KY
+    x = (lon - PORT_BOTANY_CENTER_LON) * _KX
+    row = np.floor((y - y.min()) / radius_km).astype(np.int64) + 1
+    col = np.floor((x - x.min()) / radius_km).astype(np.int64) + 1
+    cols = int(col.max()) + 2
+    rows = int(row.max()) + 2
+    keys = (frame * rows + row) * cols + col
+    order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+
+    pairs_i, pairs_j = [], []
+    for dr in (-1, 0, 1):
+        for dc in (-1, 0, 1):
+            k = keys + dr * cols + dc
+            lo = np.searchsorted(sorted_keys, k, side="left")
+            hi = np.searchsorted(sorted_keys, k, side="right")
+            counts = hi - lo
+            i = np.repeat(np.arange(keys.shape[0]), counts)
+            offsets = np.arange(i.shape[0]) - np.repeat(np.cumsum(counts) - counts, counts)
+            pairs_i.append(i)
+            pairs_j.append(order[lo[i] + offsets])
+    i = np.concatenate(pairs_i)
+    j = np.concatenate(pairs_j)
+    d = np.hypot(x[i] - x[j], y[i] - y[j])
+    keep = (i != j) & (d <= radius_km)
+    return i[keep], j[keep], d[keep]
+
+
+def swarm_features(
+    frame: np.ndarray,
+    lat: np.ndarray,
+    lon: np.ndarray,
+    hovering: np.ndarray,
+    poi: np.ndarray,
+    closing: np.ndarray,
+) -> SwarmFeatures:
+    """
+    Features for fixes grouped by frame (step): only fixes of the same frame
+    interact. closing marks fixes approaching poi (their nearest POI) within
+    SWARM_CONVERGE_KM.
+    """
+    n = lat.shape[0]
+    nearest = np.full(n, np.inf)
+    neighbours = np.zeros(n, dtype=np.int64)
+    co_loitering = np.zeros(n, dtype=np.int64)
+    if n:
+        i, j, d = _neighbour_pairs(frame, lat, lon, SWARM_RADIUS_KM)
+        np.minimum.at(nearest, i, d * 1000.0)
+        neighbours = np.bincount(i, minlength=n)
+        both = hovering[i] & hovering[j]
+        co_loitering = np.bincount(i[both], minlength=n)
+    nearest[np.isinf(nearest)] = np.nan
+
+    # Drones closing on the same POI in the same frame
+    converging = np.zeros(n, dtype=np.int64)
+    if closing.any():
+        group = frame[closing] * (int(poi.max()) + 1) + poi[closing]
+        _, inverse, sizes = np.unique(group, return_inverse=True, return_counts=True)
+        converging[closing] = sizes[inverse] - 1
+
+    score = swarm_score(neighbours, co_loitering, converging)
+    return SwarmFeatures(nearest, neighbours, co_loitering, converging, score)
+
+
+def compute_swarm_scores(drones: list) -> None:
+    """
+    Attach nearest_drone_m and swarm_score to every position of enriched
+    tracks, comparing drones at the same step. Writes the columns of each
+    drone.positions in place.
+    """
+    tracks = [drone.positions for drone in drones]
+    lengths = np.array([len(t) for t in tracks], dtype=np.int64)
+    total = int(lengths.sum())
+    if total == 0:
+        return
+    count("positions_swarm_scored", total)
+    offsets = np.concatenate([[0], np.cumsum(lengths)])
+    step = np.concatenate([t.column("step") for t in tracks])
+    lat = np.concatenate([t.column("lat") for t in tracks])
+    lon = np.concatenate([t.column("lon") for t in tracks])
+    hovering = np.concatenate([t.column("hovering_duration_s") for t in tracks]) > 0.0
+
+    poi, poi_km = get_poi_index().nearest_many(lat, lon)
+    # Closing: nearer to the same POI than at the track's previous fix
+    first = np.zeros(total, dtype=bool)
+    first[offsets[:-1][lengths > 0]] = True
+    closing = (
+        ~first
+        & (poi == np.roll(poi, 1))
+        & (poi_km < np.roll(poi_km, 1))
+        & (poi_km <= SWARM_CONVERGE_KM)
+    )
+
+    nearest = np.empty(total)
+    score = np.empty(total)
+    # Batches of whole steps, so every pair of a step shares a batch
+    order = np.argsort(step, kind="stable")
+    steps_sorted = step[order]
+    unique_steps = np.unique(steps_sorted)
+    per_batch = max(1, _BATCH_POSITIONS // len(tracks))
+    for b in range(0, unique_steps.shape[0], per_batch):
+        lo = np.searchsorted(steps_sorted, unique_steps[b], side="left")
+        last = unique_steps[min(b + per_batch, unique_steps.shape[0]) - 1]
+        hi = np.searchsorted(steps_sorted, last, side="right")
+        idx = order[lo:hi]
+        features = swarm_features(
+            step[idx], lat[idx], lon[idx], hovering[idx], poi[idx], closing[idx]
+        )
+        nearest[idx] = features.nearest_drone_m
+        score[idx] = features.swarm_score
+
+    for k, track in enumerate(tracks):
+        track.set_column("nearest_drone_m", nearest[offsets[k] : offsets[k + 1]])
+        track.set_column("swarm_score", score[offsets[k] : offsets[k + 1]])
+
+
+class SwarmFeatureState:
+    """
+    Streaming swarm features: one frame of fixes per call, for a fleet whose
+    fixes arrive in the same order every frame.
+    """
+
+    def __init__(self, num_drones: int) -> None:
+        self.prev_poi = np.full(num_drones, -1, dtype=np.int64)
+        self.prev_km = np.full(num_drones, np.inf)
+
+    def update(
+        self, lat: np.ndarray, lon: np.ndarray, hovering: np.ndarray
+    ) -> SwarmFeatures:
+        """Features of one frame; hovering marks fixes with a hover streak."""
+        lat = np.asarray(lat, dtype=np.float64)
+        lon = np.asarray(lon, dtype=np.float64)
+        count("positions_swarm_scored", lat.shape[0])
+        poi, poi_km = get_poi_index().nearest_many(lat, lon)
+        closing = (poi == self.prev_poi) & (poi_km < self.prev_km) & (poi_km <= SWARM_CONVERGE_KM)
+        self.prev_poi = poi
+        self.prev_km = poi_km
+        frame = np.zeros(lat.shape[0], dtype=np.int64)
+        return swarm_features(
+            frame, lat, lon, np.asarray(hovering, dtype=bool), poi, closing
+        )
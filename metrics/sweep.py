@@ -0,0 +1,230 @@
+"""
+Weight / threshold sweeps of the linear threat scorer over cached features.
+
+Each configuration is a weight per FEATURE_NAMES column plus an alert
+threshold: a drone is alerted at its first fix scoring above the threshold.
+Against the labelled roles, a configuration gets drone-level precision and
+recall (threat drones alerted vs inspection drones alerted) and the mean
+time-to-detect of the threats it catches. Scores of a block of weight sets
+come out as one (sets, fixes) array. First alerts per drone come from one
+minimum.reduceat per threshold, so thousands of configurations cost a few
+array passes over the feature matrix rather than a simulation each.
+"""
+
+import argparse
+import json
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from config.constants import SECONDS_PER_STEP
+from metrics.features import FEATURE_NAMES, FeatureMatrix, scenario_features
+from metrics.scoring import SCORE_FEATURES, SCORE_WEIGHTS, linear_scores
+
+DEFAULT_RUNS = 20
+DEFAULT_DRONES = 20
+DEFAULT_THREATS = 5
+DEFAULT_SAMPLES = 1000
+DEFAULT_THRESHOLDS = tuple(float(t) for t in range(2, 31))
+
+# Weight sets x fixes scored per block; bounds temporary memory
+_SCORE_BLOCK = 1 << 22
+
+# Sampling range (upper bound; lower is 0) of the features the default
+# scorer leaves out, for --all-features: about one threshold step over each
+# feature's usual spread
+_EXTRA_RANGES: Dict[str, float] = {
+    "heading_change_mean_deg": 0.05,
+    "heading_change_var_deg2": 0.001,
+    "hover_fraction": 5.0,
+    "fixation_dwell_s": 0.5,
+    "speed_jitter_mps": 0.2,
+    "swarm_score": 1.0,
+}
+
+
+def default_weights() -> np.ndarray:
+    """SCORE_WEIGHTS over FEATURE_NAMES (0 for the other features)."""
+    weights = np.zeros(len(FEATURE_NAMES))
+    weights[: len(SCORE_FEATURES)] = SCORE_WEIGHTS
+    return weights
+
+
+def sample_weights(
+    count: int, rng: np.random.Generator, all_features: bool = False
+) -> np.ndarray:
+    """
+    count weight sets: the default first, then uniform draws in [0, 2x] the
+    default weights (and _EXTRA_RANGES for the other features if asked).
+    """
+    upper = np.zeros(len(FEATURE_NAMES))
+    upper[: len(SCORE_FEATURES)] = 2.0 * SCORE_WEIGHTS
+    if all_features:
+        for name, high in _EXTRA_RANGES.items():
+            upper[FEATURE_NAMES.index(name)] = high
+    weights = rng.uniform(0.0, 1.0, (max(count, 1), len(FEATURE_NAMES))) * upper
+    weights[0] = default_weights()
+    return weights
+
+
+@dataclass
+class SweepResult:
+    """Per-configuration outcomes, shape (weight sets, thresholds)."""
+
+    weights: np.ndarray
+    thresholds: np.ndarray
+    true_alerts: np.ndarray
+    false_alerts: np.ndarray
+    missed: np.ndarray
+    mean_time_to_detect_s: np.ndarray  # NaN when no threat was caught
+
+    @property
+    def precision(self) -> np.ndarray:
+        alerted = self.true_alerts + self.false_alerts
+        return np.divide(
+            self.true_alerts, alerted, out=np.full(alerted.shape, np.nan), where=alerted > 0
+        )
+
+    @property
+    def recall(self) -> np.ndarray:
+        threats = self.true_alerts + self.missed
+        return np.divide(
+            self.true_alerts, threats, out=np.full(threats.shape, np.nan), where=threats > 0
+        )
+
+    @property
+    def f1(self) -> np.ndarray:
+        p = np.nan_to_num(self.precision)
+        r = np.nan_to_num(self.recall)
+        return np.divide(2 * p * r, p + r, out=np.zeros(p.shape), where=p + r > 0)
+
+
+def evaluate(
+    features: FeatureMatrix, weights: np.ndarray, thresholds: Sequence[float]
+) -> SweepResult:
+    """Score every (weight set, threshold) configuration against the roles."""
+    weights = np.atleast_2d(np.asarray(weights, dtype=np.float64))
+    thresholds = np.asarray(thresholds, dtype=np.float64)
+    shape = (weights.shape[0], thresholds.shape[0])
+    true_alerts = np.zeros(shape, dtype=np.int64)
+    false_alerts = np.zeros(shape, dtype=np.int64)
+    missed = np.zeros(shape, dtype=np.int64)
+    ttd = np.full(shape, np.nan)
+
+    fixes = features.values.shape[0]
+    if fixes:
+        starts = features.starts
+        threat = features.threat
+        steps = features.step.astype(np.float64)
+        block = max(1, _SCORE_BLOCK // fixes)
+        for lo in range(0, weights.shape[0], block):
+            hi = min(lo + block, weights.shape[0])
+            scores = linear_scores(features.values, weights[lo:hi])
+            for k, threshold in enumerate(thresholds):
+                first = np.minimum.reduceat(
+                    np.where(scores > threshold, steps, np.inf), starts, axis=1
+                )
+                detected = np.isfinite(first)
+                caught = detected & threat
+                true_alerts[lo:hi, k] = caught.sum(axis=1)
+                false_alerts[lo:hi, k] = (detected & ~threat).sum(axis=1)
+                missed[lo:hi, k] = (~detected & threat).sum(axis=1)
+                total = np.where(caught, first, 0.0).sum(axis=1)
+                n = true_alerts[lo:hi, k]
+                ttd[lo:hi, k] = np.divide(
+                    total * SECONDS_PER_STEP, n, out=np.full(n.shape, np.nan), where=n > 0
+                )
+    return SweepResult(weights, thresholds, true_alerts, false_alerts, missed, ttd)
+
+
+def _rounded(value: float, digits: int = 4) -> Optional[float]:
+    return None if np.isnan(value) else round(float(value), digits)
+
+
+def configuration(result: SweepResult, i: int, k: int) -> Dict[str, Any]:
+    """One configuration's weights, threshold and outcome, JSON-ready."""
+    return {
+        "weights": {
+            name: round(float(w), 6)
+            for name, w in zip(FEATURE_NAMES, result.weights[i])
+            if w != 0.0
+        },
+        "threshold": float(result.thresholds[k]),
+        "precision": _rounded(result.precision[i, k]),
+        "recall": _rounded(result.recall[i, k]),
+        "f1": _rounded(result.f1[i, k]),
+        "mean_time_to_detect_s": _rounded(result.mean_time_to_detect_s[i, k], 2),
+        "true_alerts": int(result.true_alerts[i, k]),
+        "false_alerts": int(result.false_alerts[i, k]),
+        "missed": int(result.missed[i, k]),
+    }
+
+
+def ranked(result: SweepResult, top: int) -> List[Dict[str, Any]]:
+    """Best configurations: highest F1, then fastest detection."""
+    ttd = np.nan_to_num(result.mean_time_to_detect_s, nan=np.inf).ravel()
+    order = np.lexsort((ttd, -result.f1.ravel()))[:top]
+    rows = result.thresholds.shape[0]
+    return [configuration(result, int(j) // rows, int(j) % rows) for j in order]
+
+
+def best_for_weights(result: SweepResult, i: int) -> Dict[str, Any]:
+    """Best threshold of one weight set (by F1, then time-to-detect)."""
+    ttd = np.nan_to_num(result.mean_time_to_detect_s[i], nan=np.inf)
+    k = int(np.lexsort((ttd, -result.f1[i]))[0])
+    return configuration(result, i, k)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Sweep threat-score weights and thresholds.")
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS, help="seeded scenarios")
+    parser.add_argument("--seed", type=int, default=0, help="first seed")
+    parser.add_argument("--drones", type=int, default=DEFAULT_DRONES, help="fleet size")
+    parser.add_argument("--threats", type=int, default=DEFAULT_THREATS)
+    parser.add_argument("--samples", type=int, default=DEFAULT_SAMPLES, help="weight sets")
+    parser.add_argument(
+        "--thresholds", type=float, nargs="+", default=list(DEFAULT_THRESHOLDS)
+    )
+    parser.add_argument(
+        "--all-features", action="store_true", help="also weigh rolling and swarm features"
+    )
+    parser.add_argument("--top", type=int, default=10, help="configurations to report")
+    parser.add_argument("--no-cache", action="store_true", help="recompute features")
+    parser.add_argument("--output", metavar="PATH", help="also write every configuration (JSON)")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    features = scenario_features(
+        range(args.seed, args.seed + args.runs),
+        args.drones,
+        min(args.threats, args.drones),
+        cache=not args.no_cache,
+    )
+    features_s = time.perf_counter() - start
+
+    weights = sample_weights(
+        args.samples, np.random.default_rng(args.seed), args.all_features
+    )
+    start = time.perf_counter()
+    result = evaluate(features, weights, args.thresholds)
+    sweep_s = time.perf_counter() - start
+
+    configs = result.f1.size
+    summary = {
+        "runs": args.runs,
+        "drones": int(features.drone_ids.shape[0]),
+        "threat_drones": int(features.threat.sum()),
+        "fixes": int(features.values.shape[0]),
+        "configurations": configs,
+        "features_s": round(features_s, 3),
+        "sweep_s": round(sweep_s, 3),
+        "configurations_per_s": round(configs / sweep_s, 1) if sweep_s else None,
+        "default": best_for_weights(result, 0),
+        "best": ranked(result, args.top),
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(ranked(result, configs), f)
+    print(json.dumps(summary, indent=2))
@@ -0,0 +1,10 @@
+"""
+UAV Threat Classification – Monte Carlo entry point.
+
+Runs many seeded scenarios in parallel and prints aggregate statistics.
+"""
+
+from simulation.montecarlo import main
+
+if __name__ == "__main__":
+    main()
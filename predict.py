@@ -0,0 +1,11 @@
+"""
+UAV Threat Classification – track prediction entry point.
+
+Filters a simulated fleet and prints each drone's predicted position,
+uncertainty ellipse and earliest risk-zone entry.
+"""
+
+from prediction.kalman import main
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+# Prediction package
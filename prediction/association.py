@@ -0,0 +1,403 @@
+"""
+Detection-to-track association for anonymous sensor fixes.
+
+Each frame, every live track is predicted to the frame time and bucketed in
+a spatial hash grid on the local plane, with cells ASSOC_GATE_M across. A
+detection only looks at tracks in its own and the 8 neighbouring cells, so
+finding candidates costs about the same per detection however many tracks
+exist. Candidates within the distance gate are costed by Mahalanobis
+distance against the predicted position covariance (a hard Mahalanobis gate
+would drop tracks on every sharp turn of a constant-velocity filter), then
+assigned either greedily (cheapest pair first) or globally (most pairs at
+least total cost, within each cluster of detections and tracks connected by
+gated pairs).
+
+Tracker wraps a KalmanBank: matched detections update their track, unmatched
+ones start new tracks, and tracks missed more than ASSOC_MAX_MISSES frames
+in a row are dropped.
+"""
+
+import argparse
+import json
+import math
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from config.constants import (
+    ASSOC_GATE_M,
+    ASSOC_MAX_MISSES,
+    NUM_DRONES,
+    NUM_THREAT_DRONES,
+    PREDICT_MEASUREMENT_NOISE_M,
+    SECONDS_PER_STEP,
+)
+from config.port_botany import PORT_BOTANY_CENTER_LAT, PORT_BOTANY_CENTER_LON
+from metrics.poi_index import KM_PER_DEG
+from prediction.kalman import KalmanBank, to_local
+from simulation.simulator import simulate_fleet
+
+METHODS = ("greedy", "global")
+
+# Cost matrix entries for pairs outside the gate (never chosen) and for
+# leaving a detection unassigned (only when no gated track is free)
+_FORBIDDEN = 1e18
+_UNASSIGNED = 1e9
+
+# Spatial hash key: row * _HASH_STRIDE + col
+_HASH_STRIDE = 1 << 32
+
+
+def _expand_ranges(lo: np.ndarray, hi: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """(owner, position) for every position in each [lo, hi) range."""
+    counts = hi - lo
+    owner = np.repeat(np.arange(lo.shape[0]), counts)
+    offsets = np.arange(owner.shape[0]) - np.repeat(np.cumsum(counts) - counts, counts)
+    return owner, lo[owner] + offsets
+
+
+class SpatialHash:
+    """Points bucketed in square cells; neighbour queries cover +-1 cell."""
+
+    def __init__(self, east: np.ndarray, north: np.ndarray, cell_km: float) -> None:
+        self.cell_km = cell_km
+        keys = self._keys(east, north)
+        self.order = np.argsort(keys, kind="stable")
+        self.keys = keys[self.order]
+
+    def _keys(self, east: np.ndarray, north: np.ndarray) -> np.ndarray:
+        row = np.floor(north / self.cell_km).astype(np.int64)
+        col = np.floor(east / self.cell_km).astype(np.int64)
+        return row * _HASH_STRIDE + col
+
+    def candidates(
+        self, east: np.ndarray, north: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """(query, point) index pairs for points in each query's 3x3 cells."""
+        keys = self._keys(east, north)
+        queries, points = [], []
+        for dr in (-1, 0, 1):
+            for dc in (-1, 0, 1):
+                k = keys + dr * _HASH_STRIDE + dc
+                lo = np.searchsorted(self.keys, k, side="left")
+                hi = np.searchsorted(self.keys, k, side="right")
+                q, pos = _expand_ranges(lo, hi)
+                queries.append(q)
+                points.append(self.order[pos])
+        return np.concatenate(queries), np.concatenate(points)
+
+
+def _hungarian(cost: np.ndarray) -> np.ndarray:
+    """
+    Minimum-cost assignment for rows <= columns (shortest augmenting path
+    with potentials); returns the column of each row.
+    """
+    n, m = cost.shape
+    u = np.zeros(n + 1)
+    v = np.zeros(m + 1)
+    p = np.zeros(m + 1, dtype=np.int64)  # row (1-based) matched to column j
+    way = np.zeros(m + 1, dtype=np.int64)
+    for i in range(1, n + 1):
+        p[0] = i
+        j0 = 0
+        minv = np.full(m + 1, np.inf)
+        used = np.zeros(m + 1, dtype=bool)
+        while True:
+            used[j0] = True
+            i0 = p[j0]
+            free = ~used[1:]
+            cur = cost[i0 - 1] - u[i0] - v[1:]
+            better = free & (cur < minv[1:])
+            minv[1:][better] = cur[better]
+            way[1:][better] = j0
+            cand = np.where(free, minv[1:], np.inf)
+            j1 = int(np.argmin(cand)) + 1
+            delta = cand[j1 - 1]
+            u[p[used]] += delta
+            v[used] -= delta
+            minv[1:][free] -= delta
+            j0 = j1
+            if p[j0] == 0:
+                break
+        while j0:
+            j1 = way[j0]
+            p[j0] = p[j1]
+            j0 = j1
+    rows = np.empty(n, dtype=np.int64)
+    rows[p[1:][p[1:] > 0] - 1] = np.flatnonzero(p[1:] > 0)
+    return rows
+
+
+def _clusters(det: np.ndarray, trk: np.ndarray, num_det: int, num_trk: int) -> np.ndarray:
+    """Connected-component label of each detection over gated pairs."""
+    det_label = np.arange(num_det)
+    trk_label = np.full(num_trk, num_det)
+    while True:
+        np.minimum.at(trk_label, trk, det_label[det])
+        new = det_label.copy()
+        np.minimum.at(new, det, trk_label[trk])
+        if np.array_equal(new, det_label):
+            return det_label
+        det_label = new
+
+
+def assign(
+    det: np.ndarray,
+    trk: np.ndarray,
+    cost: np.ndarray,
+    num_det: int,
+    num_trk: int,
+    method: str = "greedy",
+) -> np.ndarray:
+    """
+    Track index for each detection (-1 when unassigned) from gated
+    (detection, track, cost) pairs; each track takes at most one detection.
+    """
+    if method not in METHODS:
+        raise ValueError(f"unknown association method {method!r}; expected one of {METHODS}")
+    match = np.full(num_det, -1, dtype=np.int64)
+    if det.size == 0:
+        return match
+
+    if method == "greedy":
+        taken = np.zeros(num_trk, dtype=bool)
+        for k in np.argsort(cost, kind="stable"):
+            d, t = det[k], trk[k]
+            if match[d] < 0 and not taken[t]:
+                match[d] = t
+                taken[t] = True
+        return match
+
+    labels = _clusters(det, trk, num_det, num_trk)
+    pair_label = labels[det]
+    order = np.argsort(pair_label, kind="stable")
+    bounds = np.flatnonzero(np.diff(pair_label[order])) + 1
+    for group in np.split(order, bounds):
+        d_ids, d_local = np.unique(det[group], return_inverse=True)
+        t_ids, t_local = np.unique(trk[group], return_inverse=True)
+        if d_ids.size == 1 and t_ids.size == 1:
+            match[d_ids[0]] = t_ids[0]
+            continue
+        # One "unassigned" column per detection
+        matrix = np.full((d_ids.size, t_ids.size + d_ids.size), _FORBIDDEN)
+        matrix[d_local, t_local] = cost[group]
+        matrix[:, t_ids.size:] = _UNASSIGNED
+        cols = _hungarian(matrix)
+        real = cols < t_ids.size
+        match[d_ids[real]] = t_ids[cols[real]]
+    return match
+
+
+@dataclass
+class FrameResult:
+    """Track id per detection of one frame, and the frame's counts."""
+
+    track_ids: np.ndarray
+    matched: int
+    started: int
+    dropped: int
+
+
+class Tracker:
+    """Multi-target tracker over anonymous detections."""
+
+    def __init__(
+        self,
+        gate_m: float = ASSOC_GATE_M,
+        max_misses: int = ASSOC_MAX_MISSES,
+        method: str = "greedy",
+        bank: Optional[KalmanBank] = None,
+    ) -> None:
+        if method not in METHODS:
+            raise ValueError(f"unknown association method {method!r}; expected one of {METHODS}")
+        self.gate_km = gate_m / 1000.0
+        self.max_misses = max_misses
+        self.method = method
+        self.bank = KalmanBank() if bank is None else bank
+        self.track_id = np.zeros(0, dtype=np.int64)  # per slot
+        self.misses = np.zeros(0, dtype=np.int64)
+        self.free: List[int] = []
+        self.next_id = 0
+
+    def live_slots(self) -> np.ndarray:
+        return np.flatnonzero(self.bank.active[: self.bank.size])
+
+    def candidates(
+        self, east: np.ndarray, north: np.ndarray, t_s: float
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Gated (detection, slot, cost) pairs and the live slots they index."""
+        slots = self.live_slots()
+        empty = np.zeros(0, dtype=np.int64)
+        if slots.size == 0 or east.size == 0:
+            return empty, empty, np.zeros(0), slots
+        bank = self.bank
+        dt = np.maximum(t_s - bank.t[slots], 0.0)
+        x, P = bank._predict(bank.x[slots], bank.P[slots], dt)
+        grid = SpatialHash(x[:, 0], x[:, 1], self.gate_km)
+        det, trk = grid.candidates(east, north)
+
+        de = east[det] - x[trk, 0]
+        dn = north[det] - x[trk, 1]
+        near = de * de + dn * dn <= self.gate_km * self.gate_km
+        det, trk, de, dn = det[near], trk[near], de[near], dn[near]
+        # Mahalanobis distance with S = P_pos + R
+        a = P[trk, 0, 0] + bank.r
+        b = P[trk, 0, 1]
+        c = P[trk, 1, 1] + bank.r
+        cost = (c * de * de - 2.0 * b * de * dn + a * dn * dn) / (a * c - b * b)
+        return det, trk, cost, slots
+
+    def _new_slots(self, n: int) -> np.ndarray:
+        reuse = [self.free.pop() for _ in range(min(n, len(self.free)))]
+        start = max(self.bank.size, self.track_id.shape[0])
+        fresh = list(range(start, start + n - len(reuse)))
+        slots = np.array(reuse + fresh, dtype=np.int64)
+        if fresh:
+            grow = fresh[-1] + 1 - self.track_id.shape[0]
+            self.track_id = np.concatenate([self.track_id, np.zeros(grow, dtype=np.int64)])
+            self.misses = np.concatenate([self.misses, np.zeros(grow, dtype=np.int64)])
+        self.track_id[slots] = np.arange(self.next_id, self.next_id + n)
+        self.misses[slots] = 0
+        self.next_id += n
+        return slots
+
+    def step(self, lat: np.ndarray, lon: np.ndarray, t_s: float) -> FrameResult:
+        """Associate one frame of detections, update, start and drop tracks."""
+        east, north = to_local(lat, lon)
+        det, trk, cost, slots = self.candidates(east, north, t_s)
+        match = assign(det, trk, cost, east.size, slots.size, self.method)
+
+        hit = match >= 0
+        det_slot = np.full(east.size, -1, dtype=np.int64)
+        det_slot[hit] = slots[match[hit]]
+        det_slot[~hit] = self._new_slots(int((~hit).sum()))
+        self.bank.update_slots(det_slot, lat, lon, t_s)
+
+        missed = np.ones(slots.size, dtype=bool)
+        missed[match[hit]] = False
+        self.misses[slots[~missed]] = 0
+        self.misses[slots[missed]] += 1
+        drop = slots[missed & (self.misses[slots] > self.max_misses)]
+        self.bank.active[drop] = False
+        self.free.extend(drop.tolist())
+        return FrameResult(self.track_id[det_slot], int(hit.sum()), int((~hit).sum()), drop.size)
+
+
+def fleet_frames(drones: list) -> List[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """Per-step (lat, lon, drone index) detections of a fleet, shuffled."""
+    lats = [d.positions.column("lat") for d in drones]
+    lons = [d.positions.column("lon") for d in drones]
+    steps = max((len(d.positions) for d in drones), default=0)
+    rng = np.random.default_rng(0)
+    frames = []
+    for step in range(steps):
+        owners = np.array([j for j in range(len(drones)) if step < len(lats[j])], dtype=np.int64)
+        owners = owners[rng.permutation(owners.size)]
+        frames.append(
+            (
+                np.array([lats[j][step] for j in owners]),
+                np.array([lons[j][step] for j in owners]),
+                owners,
+            )
+        )
+    return frames
+
+
+def track_fleet(drones: list, method: str = "greedy") -> Dict[str, Any]:
+    """
+    Re-identify a simulated fleet from anonymous per-step fixes and score
+    it: purity is the share of fixes that lie on their track's majority
+    drone (drones flying the same route at once are indistinguishable, so a
+    fix on any drone at the same position counts).
+    """
+    tracker = Tracker(method=method)
+    records: List[Tuple[int, int, int]] = []
+    started = 0
+    for step, (lat, lon, owners) in enumerate(fleet_frames(drones)):
+        result = tracker.step(lat, lon, step * SECONDS_PER_STEP)
+        started += result.started
+        records.extend((t, o, step) for t, o in zip(result.track_ids.tolist(), owners.tolist()))
+    per_track: Dict[int, Counter] = {}
+    for track_id, owner, _ in records:
+        per_track.setdefault(track_id, Counter())[owner] += 1
+    majority = {t: c.most_common(1)[0][0] for t, c in per_track.items()}
+
+    lats = [d.positions.column("lat") for d in drones]
+    lons = [d.positions.column("lon") for d in drones]
+    on_track = sum(
+        1
+        for track_id, owner, step in records
+        if (lats[owner][step], lons[owner][step])
+        == (lats[majority[track_id]][step], lons[majority[track_id]][step])
+    )
+    return {
+        "drones": len(drones),
+        "fixes": len(records),
+        "tracks": len(per_track),
+        "tracks_started": started,
+        "purity": round(on_track / len(records), 4) if records else None,
+    }
+
+
+def bench_association(
+    num_tracks: int, num_frames: int, method: str = "greedy", seed: int = 0
+) -> Dict[str, Any]:
+    """Time association of num_tracks synthetic straight-line movers."""
+    rng = np.random.default_rng(seed)
+    # Spread to keep the mean density of a small harbour picture
+    spread = 0.02 * math.sqrt(max(num_tracks, 1) / 100.0)
+    lat0 = PORT_BOTANY_CENTER_LAT + rng.uniform(-spread, spread, num_tracks)
+    lon0 = PORT_BOTANY_CENTER_LON + rng.uniform(-spread, spread, num_tracks)
+    v_lat = rng.uniform(-1.5e-4, 1.5e-4, num_tracks)
+    v_lon = rng.uniform(-1.5e-4, 1.5e-4, num_tracks)
+    noise = PREDICT_MEASUREMENT_NOISE_M / 1000.0 / KM_PER_DEG
+    tracker = Tracker(method=method)
+    correct = total = 0
+    first_ids = None
+    start = time.perf_counter()
+    for frame in range(num_frames):
+        t = frame * SECONDS_PER_STEP
+        order = rng.permutation(num_tracks)
+        lat = lat0[order] + v_lat[order] * t + rng.normal(0.0, noise, num_tracks)
+        lon = lon0[order] + v_lon[order] * t + rng.normal(0.0, noise, num_tracks)
+        ids = tracker.step(lat, lon, t).track_ids
+        by_mover = np.empty(num_tracks, dtype=np.int64)
+        by_mover[order] = ids
+        if first_ids is None:
+            first_ids = by_mover
+        else:
+            correct += int((by_mover == first_ids).sum())
+            total += num_tracks
+    elapsed = time.perf_counter() - start
+    return {
+        "tracks": num_tracks,
+        "frames": num_frames,
+        "method": method,
+        "ms_per_frame": round(elapsed / max(num_frames, 1) * 1000.0, 3),
+        "detections_per_s": round(num_tracks * num_frames / elapsed, 1) if elapsed else None,
+        "id_kept": round(correct / total, 4) if total else None,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Associate anonymous detections to tracks.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--drones", type=int, default=NUM_DRONES, help="fleet size")
+    parser.add_argument("--threats", type=int, default=NUM_THREAT_DRONES)
+    parser.add_argument("--method", choices=METHODS, default="greedy")
+    parser.add_argument(
+        "--benchmark", action="store_true", help="time association of synthetic movers"
+    )
+    parser.add_argument("--tracks", type=int, default=500, help="detections per frame (--benchmark)")
+    parser.add_argument("--frames", type=int, default=100, help="frames (--benchmark)")
+    args = parser.parse_args(argv)
+
+    if args.benchmark:
+        report = bench_association(args.tracks, args.frames, args.method, args.seed)
+    else:
+        drones = simulate_fleet(args.seed, args.drones, min(args.threats, args.drones))
+        report = track_fleet(drones, args.method)
+    print(json.dumps(report, indent=2))
@@ -0,0 +1,382 @@
+"""
+Batched constant-velocity Kalman filtering for track prediction.
+
+KalmanBank keeps one filter per track as rows of shared arrays (state
+[east, north, v_east, v_north] in km and km/s on a local plane around the
+port, 4x4 covariances), so a sensor frame of thousands of fixes is one set
+of NumPy operations rather than a loop over tracks. From the filtered state
+it predicts N-second-ahead positions with uncertainty ellipses, and the
+time until each track enters any POI's RISK_ZONE_RADIUS_KM bubble if it
+keeps its current velocity.
+"""
+
+import argparse
+import json
+import math
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from config.constants import (
+    NUM_DRONES,
+    NUM_THREAT_DRONES,
+    PREDICT_ACCEL_NOISE_MPS2,
+    PREDICT_ELLIPSE_CONFIDENCE,
+    PREDICT_HORIZON_S,
+    PREDICT_MAX_SPEED_MPS,
+    PREDICT_MEASUREMENT_NOISE_M,
+    SECONDS_PER_STEP,
+)
+from config.port_botany import PORT_BOTANY_CENTER_LAT, PORT_BOTANY_CENTER_LON
+from config.thresholds import RISK_ZONE_RADIUS_KM
+from metrics.poi_index import KM_PER_DEG, PoiIndex, get_poi_index
+from simulation.simulator import simulate_fleet
+
+# Local plane: equirectangular around the port centre (km)
+_KX = KM_PER_DEG * math.cos(math.radians(PORT_BOTANY_CENTER_LAT))
+_KY = KM_PER_DEG
+
+# Track x POI pairs per block in time_to_entry
+_ENTRY_BLOCK_PAIRS = 1 << 20
+
+
+def to_local(lat: np.ndarray, lon: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """(east_km, north_km) of positions on the local plane."""
+    return (
+        (np.asarray(lon, dtype=np.float64) - PORT_BOTANY_CENTER_LON) * _KX,
+        (np.asarray(lat, dtype=np.float64) - PORT_BOTANY_CENTER_LAT) * _KY,
+    )
+
+
+def from_local(east: np.ndarray, north: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """(lat, lon) of local-plane positions."""
+    return PORT_BOTANY_CENTER_LAT + north / _KY, PORT_BOTANY_CENTER_LON + east / _KX
+
+
+@dataclass
+class Prediction:
+    """Predicted position and uncertainty per track, horizon_s ahead."""
+
+    lat: np.ndarray
+    lon: np.ndarray
+    # Confidence ellipse: semi-axes (m) and bearing of the major axis (deg)
+    semi_major_m: np.ndarray
+    semi_minor_m: np.ndarray
+    orientation_deg: np.ndarray
+    speed_mps: np.ndarray
+    heading_deg: np.ndarray
+
+
+class KalmanBank:
+    """Constant-velocity Kalman filters for many tracks, updated in batches."""
+
+    def __init__(
+        self,
+        accel_noise_mps2: float = PREDICT_ACCEL_NOISE_MPS2,
+        measurement_noise_m: float = PREDICT_MEASUREMENT_NOISE_M,
+        max_speed_mps: float = PREDICT_MAX_SPEED_MPS,
+        capacity: int = 64,
+    ) -> None:
+        self.q = (accel_noise_mps2 / 1000.0) ** 2
+        self.r = (measurement_noise_m / 1000.0) ** 2
+        self.v0 = (max_speed_mps / 1000.0) ** 2
+        self.size = 0
+        self.x = np.zeros((capacity, 4))
+        self.P = np.zeros((capacity, 4, 4))
+        self.t = np.zeros(capacity)
+        self.active = np.zeros(capacity, dtype=bool)
+        self.slots: Dict[Hashable, int] = {}
+
+    def __len__(self) -> int:
+        return int(self.active.sum())
+
+    def _grow(self, size: int) -> None:
+        capacity = self.x.shape[0]
+        if size <= capacity:
+            return
+        capacity = max(size, capacity * 2)
+        self.x = np.resize(self.x, (capacity, 4))
+        self.P = np.resize(self.P, (capacity, 4, 4))
+        self.t = np.resize(self.t, capacity)
+        active = np.zeros(capacity, dtype=bool)
+        active[: self.active.shape[0]] = self.active
+        self.active = active
+
+    def slot_for(self, ids: Sequence[Hashable]) -> np.ndarray:
+        """Slot of each track id; unseen ids get new slots."""
+        slots = np.empty(len(ids), dtype=np.int64)
+        for i, track_id in enumerate(ids):
+            slot = self.slots.get(track_id)
+            if slot is None:
+                slot = self.slots[track_id] = len(self.slots)
+            slots[i] = slot
+        return slots
+
+    def update(
+        self,
+        ids: Sequence[Hashable],
+        lat: np.ndarray,
+        lon: np.ndarray,
+        t_s: np.ndarray,
+    ) -> np.ndarray:
+        """One frame of fixes keyed by track id; returns their slots."""
+        slots = self.slot_for(ids)
+        self.update_slots(slots, lat, lon, t_s)
+        return slots
+
+    def update_slots(
+        self,
+        slots: np.ndarray,
+        lat: np.ndarray,
+        lon: np.ndarray,
+        t_s: np.ndarray,
+    ) -> None:
+        """
+        Predict each slot to its fix time and fold the fix in. Slots not
+        seen before start new tracks; each slot may appear once per call.
+        """
+        slots = np.asarray(slots, dtype=np.int64)
+        if slots.size == 0:
+            return
+        if np.unique(slots).size != slots.size:
+            raise ValueError("a slot appears more than once in one update")
+        east, north = to_local(lat, lon)
+        t_s = np.broadcast_to(np.asarray(t_s, dtype=np.float64), slots.shape)
+
+        self._grow(int(slots.max()) + 1)
+        new = ~self.active[slots]
+        old = slots[~new]
+        if new.any():
+            s = slots[new]
+            self.size = max(self.size, int(s.max()) + 1)
+            self.active[s] = True
+            self.x[s] = 0.0
+            self.x[s, 0] = east[new]
+            self.x[s, 1] = north[new]
+            self.P[s] = np.diag([self.r, self.r, self.v0, self.v0])
+            self.t[s] = t_s[new]
+        if old.size == 0:
+            return
+
+        keep = ~new
+        dt = np.maximum(t_s[keep] - self.t[old], 0.0)
+        x, P = self._predict(self.x[old], self.P[old], dt)
+
+        # Update with a position fix: H = [I 0], R = r I
+        S = P[:, :2, :2] + self.r * np.eye(2)
+        det = S[:, 0, 0] * S[:, 1, 1] - S[:, 0, 1] * S[:, 1, 0]
+        S_inv = np.empty_like(S)
+        S_inv[:, 0, 0] = S[:, 1, 1] / det
+        S_inv[:, 1, 1] = S[:, 0, 0] / det
+        S_inv[:, 0, 1] = -S[:, 0, 1] / det
+        S_inv[:, 1, 0] = -S[:, 1, 0] / det
+        K = P[:, :, :2] @ S_inv
+        innovation = np.stack([east[keep] - x[:, 0], north[keep] - x[:, 1]], axis=1)
+        x = x + (K @ innovation[:, :, None])[:, :, 0]
+        P = P - K @ P[:, :2, :]
+        self.x[old] = x
+        self.P[old] = 0.5 * (P + P.transpose(0, 2, 1))
+        self.t[old] = t_s[keep]
+
+    def _predict(
+        self, x: np.ndarray, P: np.ndarray, dt: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Propagate states and covariances dt seconds (white-acceleration noise)."""
+        n = x.shape[0]
+        F = np.broadcast_to(np.eye(4), (n, 4, 4)).copy()
+        F[:, 0, 2] = dt
+        F[:, 1, 3] = dt
+        x = x.copy()
+        x[:, 0] += x[:, 2] * dt
+        x[:, 1] += x[:, 3] * dt
+
+        dt2 = dt * dt
+        Q = np.zeros((n, 4, 4))
+        Q[:, 0, 0] = Q[:, 1, 1] = self.q * dt2 * dt / 3.0
+        Q[:, 0, 2] = Q[:, 2, 0] = Q[:, 1, 3] = Q[:, 3, 1] = self.q * dt2 / 2.0
+        Q[:, 2, 2] = Q[:, 3, 3] = self.q * dt
+        return x, F @ P @ F.transpose(0, 2, 1) + Q
+
+    def _rows(self, slots: Optional[np.ndarray]) -> np.ndarray:
+        if slots is None:
+            return np.flatnonzero(self.active[: self.size])
+        return np.asarray(slots, dtype=np.int64)
+
+    def predict(
+        self,
+        horizon_s: float,
+        slots: Optional[np.ndarray] = None,
+        confidence: float = PREDICT_ELLIPSE_CONFIDENCE,
+    ) -> Prediction:
+        """Positions horizon_s after each track's last fix, with confidence ellipses."""
+        rows = self._rows(slots)
+        x, P = self._predict(self.x[rows], self.P[rows], np.full(rows.size, float(horizon_s)))
+        lat, lon = from_local(x[:, 0], x[:, 1])
+
+        # Eigen-decomposition of each 2x2 position covariance
+        a, b, c = P[:, 0, 0], P[:, 0, 1], P[:, 1, 1]
+        mean = 0.5 * (a + c)
+        spread = np.sqrt(np.maximum(0.25 * (a - c) ** 2 + b * b, 0.0))
+        # Chi-square quantile for 2 degrees of freedom
+        k = math.sqrt(-2.0 * math.log(1.0 - confidence))
+        major = k * np.sqrt(np.maximum(mean + spread, 0.0)) * 1000.0
+        minor = k * np.sqrt(np.maximum(mean - spread, 0.0)) * 1000.0
+        # Major-axis angle from east, counter-clockwise -> bearing from north
+        angle = 0.5 * np.arctan2(2.0 * b, a - c)
+        orientation = (90.0 - np.degrees(angle)) % 180.0
+
+        speed = np.hypot(x[:, 2], x[:, 3]) * 1000.0
+        heading = np.degrees(np.arctan2(x[:, 2], x[:, 3])) % 360.0
+        return Prediction(lat, lon, major, minor, orientation, speed, heading)
+
+    def time_to_entry(
+        self,
+        horizon_s: float,
+        slots: Optional[np.ndarray] = None,
+        index: Optional[PoiIndex] = None,
+        radius_km: float = RISK_ZONE_RADIUS_KM,
+    ) -> np.ndarray:
+        """
+        Seconds from each track's last fix until it enters each POI's risk
+        bubble at its filtered velocity: shape (tracks, POIs); 0 when
+        already inside, inf when not within horizon_s.
+        """
+        index = get_poi_index() if index is None else index
+        rows = self._rows(slots)
+        out = np.full((rows.size, len(index)), np.inf)
+        if rows.size == 0 or len(index) == 0:
+            return out
+        poi_e, poi_n = to_local(index.lat, index.lon)
+        block = max(1, _ENTRY_BLOCK_PAIRS // len(index))
+        for start in range(0, rows.size, block):
+            x = self.x[rows[start : start + block]]
+            # |p - c + v t|^2 = R^2, smallest t >= 0
+            de = x[:, 0:1] - poi_e
+            dn = x[:, 1:2] - poi_n
+            ve, vn = x[:, 2:3], x[:, 3:4]
+            qa = ve * ve + vn * vn
+            qb = 2.0 * (de * ve + dn * vn)
+            qc = de * de + dn * dn - radius_km * radius_km
+            disc = qb * qb - 4.0 * qa * qc
+            moving = (qa > 0.0) & (disc >= 0.0)
+            root = np.divide(
+                -qb - np.sqrt(np.where(moving, disc, 0.0)),
+                2.0 * qa,
+                out=np.full(disc.shape, np.inf),
+                where=moving,
+            )
+            t = np.where(qc <= 0.0, 0.0, np.where(root >= 0.0, root, np.inf))
+            out[start : start + block] = np.where(t <= horizon_s, t, np.inf)
+        return out
+
+
+def filter_fleet(drones: list, seconds_per_step: float) -> KalmanBank:
+    """Run one filter per drone over finished tracks, a step (frame) at a time."""
+    bank = KalmanBank(capacity=len(drones))
+    if not drones:
+        return bank
+    lengths = np.array([len(d.positions) for d in drones])
+    lats: List[np.ndarray] = [d.positions.column("lat") for d in drones]
+    lons: List[np.ndarray] = [d.positions.column("lon") for d in drones]
+    steps = int(lengths.max(initial=0))
+    lat = np.full((steps, len(drones)), np.nan)
+    lon = np.full((steps, len(drones)), np.nan)
+    for j in range(len(drones)):
+        lat[: lengths[j], j] = lats[j]
+        lon[: lengths[j], j] = lons[j]
+    for step in range(steps):
+        slots = np.flatnonzero(lengths > step)
+        bank.update_slots(slots, lat[step, slots], lon[step, slots], step * seconds_per_step)
+    return bank
+
+
+def predict_fleet(
+    drones: list, horizon_s: float = PREDICT_HORIZON_S
+) -> List[Dict[str, Any]]:
+    """Filter a simulated fleet and summarise each drone's prediction."""
+    bank = filter_fleet(drones, SECONDS_PER_STEP)
+    index = get_poi_index()
+    # filter_fleet gives drone i slot i
+    slots = np.arange(len(drones))
+    pred = bank.predict(horizon_s, slots)
+    entry = bank.time_to_entry(horizon_s, slots, index)
+    out = []
+    for i, drone in enumerate(drones):
+        first = int(np.argmin(entry[i])) if entry.shape[1] else -1
+        entry_s = float(entry[i, first]) if first >= 0 else math.inf
+        out.append(
+            {
+                "id": drone.id,
+                "role": drone.role,
+                "lat": round(float(pred.lat[i]), 6),
+                "lon": round(float(pred.lon[i]), 6),
+                "speed_mps": round(float(pred.speed_mps[i]), 2),
+                "heading_deg": round(float(pred.heading_deg[i]), 1),
+                "ellipse_m": [
+                    round(float(pred.semi_major_m[i]), 1),
+                    round(float(pred.semi_minor_m[i]), 1),
+                    round(float(pred.orientation_deg[i]), 1),
+                ],
+                "entry_s": round(entry_s, 1) if math.isfinite(entry_s) else None,
+                "entry_poi": index.names[first] if math.isfinite(entry_s) else None,
+            }
+        )
+    return out
+
+
+def bench_updates(
+    num_tracks: int, num_frames: int, seed: int = 0
+) -> Dict[str, Any]:
+    """Time batched updates of num_tracks synthetic straight-line tracks."""
+    rng = np.random.default_rng(seed)
+    lat0 = PORT_BOTANY_CENTER_LAT + rng.uniform(-0.02, 0.02, num_tracks)
+    lon0 = PORT_BOTANY_CENTER_LON + rng.uniform(-0.02, 0.02, num_tracks)
+    v_lat = rng.uniform(-1e-4, 1e-4, num_tracks)
+    v_lon = rng.uniform(-1e-4, 1e-4, num_tracks)
+    noise = PREDICT_MEASUREMENT_NOISE_M / 1000.0 / KM_PER_DEG
+    bank = KalmanBank(capacity=num_tracks)
+    slots = np.arange(num_tracks)
+    start = time.perf_counter()
+    for frame in range(num_frames):
+        t = frame * SECONDS_PER_STEP
+        bank.update_slots(
+            slots,
+            lat0 + v_lat * t + rng.normal(0.0, noise, num_tracks),
+            lon0 + v_lon * t + rng.normal(0.0, noise, num_tracks),
+            t,
+        )
+    update_s = time.perf_counter() - start
+    start = time.perf_counter()
+    bank.predict(PREDICT_HORIZON_S)
+    bank.time_to_entry(PREDICT_HORIZON_S)
+    predict_s = time.perf_counter() - start
+    return {
+        "tracks": num_tracks,
+        "frames": num_frames,
+        "update_ms_per_frame": round(update_s / max(num_frames, 1) * 1000.0, 3),
+        "fixes_per_s": round(num_tracks * num_frames / update_s, 1) if update_s else None,
+        "predict_ms": round(predict_s * 1000.0, 3),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Kalman track prediction.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--drones", type=int, default=NUM_DRONES, help="fleet size")
+    parser.add_argument("--threats", type=int, default=NUM_THREAT_DRONES)
+    parser.add_argument("--horizon", type=float, default=PREDICT_HORIZON_S, help="seconds ahead")
+    parser.add_argument(
+        "--benchmark", action="store_true", help="time batched updates of synthetic tracks"
+    )
+    parser.add_argument("--tracks", type=int, default=5000, help="tracks per frame (--benchmark)")
+    parser.add_argument("--frames", type=int, default=100, help="frames (--benchmark)")
+    args = parser.parse_args(argv)
+
+    if args.benchmark:
+        print(json.dumps(bench_updates(args.tracks, args.frames, args.seed), indent=2))
+        return
+
+    drones = simulate_fleet(args.seed, args.drones, min(args.threats, args.drones))
+    print(json.dumps(predict_fleet(drones, args.horizon), indent=2))
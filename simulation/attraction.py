@@ -0,0 +1,246 @@
+"""
+Asset attraction for threat movement over large POI catalogues.
+
+Threat drones are pulled toward POIs with weight w / (d^2 + 0.01): the pull
+is the weighted mean direction to the POIs, scaled by the total weight. Both
+come from three sums over POIs (north and east components, total weight),
+so they split into near and far parts:
+
+- near: POIs within ATTRACTION_CUTOFF_CELLS raster cells of the drone,
+  summed exactly in local projected coordinates over drone x candidate
+  pairs from a CSR (offsets + flat index) per-bucket candidate table;
+- far: everything else, which varies smoothly across the threat box, read
+  from a precompiled raster of whole-catalogue sums by bilinear
+  interpolation, minus the near POIs' share at the same raster nodes.
+
+The near set shrinks with the raster cell, so per-drone cost depends on the
+POIs within a few cells of the drone, not on catalogue size or on the
+densest bucket. The raster interpolation and projection errors are bounded
+by the cell size and cutoff (ATTRACTION_FIELD_TOLERANCE). Small catalogues skip all this and keep
+the exact great-circle evaluation in simulation.swarm.
+"""
+
+import math
+from functools import lru_cache
+from typing import Tuple
+
+import numpy as np
+
+from config.constants import ATTRACTION_CELL_DEG, ATTRACTION_CUTOFF_CELLS
+from config.port_botany import LAT_MIN, LAT_MAX, LON_MIN, LON_MAX
+from metrics.poi_index import KM_PER_DEG, PoiIndex, get_poi_index
+
+# Catalogues up to this size are evaluated exactly against every POI
+DIRECT_MAX_POIS = 32
+
+# Error bound of the attraction vector against the exact evaluation, as a
+# fraction of the attraction strength (measured: below 3e-4 over synthetic
+# catalogues of 1k-10k POIs, sparse and dense)
+ATTRACTION_FIELD_TOLERANCE = 1e-3
+
+# Same constants as simulation.swarm.asset_attraction_many
+_METERS_PER_DEG = 111_000.0
+_MIN_DISTANCE_KM = 0.01
+_SOFTENING_KM2 = 0.01
+
+# Raster nodes per block when summing the whole catalogue
+_BUILD_BLOCK = 1024
+
+# Drone x candidate pairs (at most) per block when evaluating the near field
+_PAIRS_BLOCK = 1 << 18
+
+
+def attraction_vector(
+    sum_north: np.ndarray,
+    sum_east: np.ndarray,
+    total_weight: np.ndarray,
+    lat: np.ndarray,
+    strength: float,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """(dlat, dlon) degrees per step from per-drone attraction sums."""
+    meters_per_deg_lon = _METERS_PER_DEG * np.cos(np.radians(lat))
+    total_dlat = sum_north * strength
+    total_dlat /= _METERS_PER_DEG
+    total_dlon = sum_east * strength
+    total_dlon /= meters_per_deg_lon
+
+    dlat = np.zeros(lat.shape[0])
+    dlon = np.zeros(lat.shape[0])
+    active = total_weight >= 0.001
+    tw = total_weight[active]
+    scale = np.minimum(1.0, strength / tw * 0.5)
+    dlat[active] = total_dlat[active] * scale / tw
+    dlon[active] = total_dlon[active] * scale / tw
+    return dlat, dlon
+
+
+def _kernel(
+    lat: np.ndarray, lon: np.ndarray, plat: np.ndarray, plon: np.ndarray, pw: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Per-pair (north, east, weight, distance_km) in the query's local projection."""
+    dy = (plat - lat) * KM_PER_DEG
+    dx = (plon - lon) * (KM_PER_DEG * np.cos(np.radians(lat)))
+    d2 = dx * dx + dy * dy
+    d = np.sqrt(d2)
+    w = np.where(d < _MIN_DISTANCE_KM, 0.0, pw / (d2 + _SOFTENING_KM2))
+    inv_d = np.divide(w, d, out=np.zeros_like(w), where=d >= _MIN_DISTANCE_KM)
+    return inv_d * dy, inv_d * dx, w, d
+
+
+class AttractionField:
+    """Near/far split attraction over a POI catalogue, for the threat box."""
+
+    def __init__(
+        self,
+        index: PoiIndex,
+        cutoff_cells: float = ATTRACTION_CUTOFF_CELLS,
+        cell_deg: float = ATTRACTION_CELL_DEG,
+    ) -> None:
+        self.cutoff_km = cutoff_cells * cell_deg * KM_PER_DEG
+        self.cell_deg = cell_deg
+        self.lat0, self.lon0 = LAT_MIN, LON_MIN
+        self.rows = int(math.ceil((LAT_MAX - LAT_MIN) / cell_deg)) + 1
+        self.cols = int(math.ceil((LON_MAX - LON_MIN) / cell_deg)) + 1
+        node_lat = self.lat0 + np.arange(self.rows) * cell_deg
+        node_lon = self.lon0 + np.arange(self.cols) * cell_deg
+        self.node_lat = np.repeat(node_lat, self.cols)
+        self.node_lon = np.tile(node_lon, self.rows)
+
+        self.plat, self.plon, self.pw = index.lat, index.lon, index.weight
+        self.sums = self._build_sums(index)
+        self._build_candidates(index)
+
+    def _build_sums(self, index: PoiIndex) -> np.ndarray:
+        """Whole-catalogue (north, east, weight) sums at every raster node."""
+        sums = np.zeros((3, self.node_lat.shape[0]))
+        for start in range(0, self.node_lat.shape[0], _BUILD_BLOCK):
+            sl = slice(start, start + _BUILD_BLOCK)
+            north, east, w, _ = _kernel(
+                self.node_lat[sl, None],
+                self.node_lon[sl, None],
+                index.lat,
+                index.lon,
+                index.weight,
+            )
+            sums[0, sl] = north.sum(axis=1)
+            sums[1, sl] = east.sum(axis=1)
+            sums[2, sl] = w.sum(axis=1)
+        return sums
+
+    def _build_candidates(self, index: PoiIndex) -> None:
+        """
+        CSR candidate table: for bucket cell k, candidate_index[
+        candidate_offsets[k]:candidate_offsets[k + 1]] lists every POI in it
+        or its 8 neighbours. Cells are at least cutoff_km across, so they
+        cover every POI within the cutoff.
+        """
+        worst_cos = min(math.cos(math.radians(LAT_MIN)), math.cos(math.radians(LAT_MAX)))
+        self.bucket_lat = self.cutoff_km / KM_PER_DEG
+        self.bucket_lon = self.cutoff_km / (KM_PER_DEG * worst_cos)
+        self.bucket_rows = int(math.floor((LAT_MAX - LAT_MIN) / self.bucket_lat)) + 1
+        self.bucket_cols = int(math.floor((LON_MAX - LON_MIN) / self.bucket_lon)) + 1
+
+        pr = np.floor((index.lat - LAT_MIN) / self.bucket_lat).astype(np.int64)
+        pc = np.floor((index.lon - LON_MIN) / self.bucket_lon).astype(np.int64)
+        cells, pois = [], []
+        for dr in (-1, 0, 1):
+            for dc in (-1, 0, 1):
+                r, c = pr + dr, pc + dc
+                ok = (r >= 0) & (r < self.bucket_rows) & (c >= 0) & (c < self.bucket_cols)
+                cells.append(r[ok] * self.bucket_cols + c[ok])
+                pois.append(np.flatnonzero(ok))
+        cells_flat = np.concatenate(cells)
+        pois_flat = np.concatenate(pois)
+        order = np.lexsort((pois_flat, cells_flat))
+
+        counts = np.bincount(cells_flat, minlength=self.bucket_rows * self.bucket_cols)
+        self.candidate_offsets = np.concatenate([[0], np.cumsum(counts)])
+        self.candidate_index = pois_flat[order]
+
+    def _buckets(self, lat: np.ndarray, lon: np.ndarray) -> np.ndarray:
+        """Bucket cell of each drone (clipped to the box)."""
+        br = np.clip(
+            np.floor((lat - LAT_MIN) / self.bucket_lat).astype(np.int64), 0, self.bucket_rows - 1
+        )
+        bc = np.clip(
+            np.floor((lon - LON_MIN) / self.bucket_lon).astype(np.int64), 0, self.bucket_cols - 1
+        )
+        return br * self.bucket_cols + bc
+
+    def sums_many(
+        self, lat: np.ndarray, lon: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Per-drone (north, east, weight) sums over the whole catalogue."""
+        n = lat.shape[0]
+
+        # Near field: exact sums over (drone, candidate) pairs within the cutoff
+        cell = self._buckets(lat, lon)
+        lo = self.candidate_offsets[cell]
+        counts = self.candidate_offsets[cell + 1] - lo
+        drone = np.repeat(np.arange(n), counts)
+        offsets = np.arange(drone.shape[0]) - np.repeat(np.cumsum(counts) - counts, counts)
+        poi = self.candidate_index[lo[drone] + offsets]
+        north, east, w, d = _kernel(
+            lat[drone], lon[drone], self.plat[poi], self.plon[poi], self.pw[poi]
+        )
+        near = d <= self.cutoff_km
+        drone, poi = drone[near], poi[near]
+        plat, plon, pw = self.plat[poi], self.plon[poi], self.pw[poi]
+        total = np.stack([
+            np.bincount(drone, north[near], minlength=n),
+            np.bincount(drone, east[near], minlength=n),
+            np.bincount(drone, w[near], minlength=n),
+        ])
+
+        # Far field: interpolated whole-catalogue sums minus the near POIs'
+        # share at the same nodes
+        fr = np.clip((lat - self.lat0) / self.cell_deg, 0.0, self.rows - 1.000001)
+        fc = np.clip((lon - self.lon0) / self.cell_deg, 0.0, self.cols - 1.000001)
+        r0 = fr.astype(np.int64)
+        c0 = fc.astype(np.int64)
+        ty, tx = fr - r0, fc - c0
+        for dr, dc, coef in (
+            (0, 0, (1 - ty) * (1 - tx)),
+            (0, 1, (1 - ty) * tx),
+            (1, 0, ty * (1 - tx)),
+            (1, 1, ty * tx),
+        ):
+            node = (r0 + dr) * self.cols + (c0 + dc)
+            pair_node = node[drone]
+            n_north, n_east, n_w, _ = _kernel(
+                self.node_lat[pair_node], self.node_lon[pair_node], plat, plon, pw
+            )
+            far = self.sums[:, node] - np.stack([
+                np.bincount(drone, n_north, minlength=n),
+                np.bincount(drone, n_east, minlength=n),
+                np.bincount(drone, n_w, minlength=n),
+            ])
+            total += coef * far
+        return total[0], total[1], total[2]
+
+    def attraction_many(
+        self, lat: np.ndarray, lon: np.ndarray, strength: float
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """(dlat, dlon) degrees per step for drones inside the threat box."""
+        dlat = np.empty(lat.shape[0])
+        dlon = np.empty(lat.shape[0])
+        # Blocks of drones with about _PAIRS_BLOCK candidate pairs each
+        cell = self._buckets(lat, lon)
+        pairs = np.cumsum(self.candidate_offsets[cell + 1] - self.candidate_offsets[cell])
+        start = 0
+        while start < lat.shape[0]:
+            base = pairs[start - 1] if start else 0
+            stop = max(start + 1, int(np.searchsorted(pairs, base + _PAIRS_BLOCK, side="right")))
+            sl = slice(start, stop)
+            sum_north, sum_east, total_weight = self.sums_many(lat[sl], lon[sl])
+            dlat[sl], dlon[sl] = attraction_vector(
+                sum_north, sum_east, total_weight, lat[sl], strength
+            )
+            start = stop
+        return dlat, dlon
+
+
+@lru_cache(maxsize=1)
+def get_attraction_field() -> AttractionField:
+    """Process-wide field over get_poi_index(), built on first use."""
+    return AttractionField(get_poi_index())
@@ -3,7 +3,11 @@ Drone dataclass: single source of truth for UAV state.
 """
 
 from dataclasses import dataclass, field
-from typing import List, Dict, Any
+from typing import Optional
+
+import numpy as np
+
+from simulation.track import Track
 
 
 @dataclass
@@ -13,4 +17,11 @@ class Drone:
     id: str
     role: str  # "inspection" or "threat"
     trajectory_id: int
-    positions: List[Dict[str, Any]] = field(default_factory=list)
+    positions: Track = field(default_factory=Track)
+    # Drone's own random stream (altitude etc.), spawned from the run seed
+    rng: Optional[np.random.Generator] = field(default=None, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # Accept legacy list-of-dict positions
+        if not isinstance(self.positions, Track):
+            self.positions = Track.from_rows(self.positions)
@@ -0,0 +1,162 @@
+"""
+Monte Carlo scenario runner: many seeded simulations, reduced to statistics.
+
+Each run builds, enriches and scores a fleet in memory (no HTML, logs or
+prints) and is reduced to a small ScenarioResult: when each threat drone
+first raised an alert, how many inspection drones raised a false alert, and
+the peak threat score. Seeds are sharded into chunks across a process pool,
+so only seeds go out and a few numbers per run come back.
+"""
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from config.constants import NUM_DRONES, NUM_THREAT_DRONES, SECONDS_PER_STEP
+from metrics.risk_raster import get_risk_raster
+from metrics.scoring import THREAT_LEVELS, threat_level_codes
+from simulation.simulator import simulate_fleet
+
+# Same alert rule as the streaming service: level rises to ELEVATED or above
+_ALERT_CODE = THREAT_LEVELS.index("ELEVATED")
+
+# Chunks per worker; more gives better balancing, fewer less overhead
+_CHUNKS_PER_WORKER = 4
+
+
+@dataclass
+class ScenarioResult:
+    """Reduced outcome of one seeded run."""
+
+    seed: int
+    # Seconds from launch to first alert per threat drone (None: never alerted)
+    threat_alert_s: List[Optional[float]] = field(default_factory=list)
+    inspection_drones: int = 0
+    inspection_alerts: int = 0
+    peak_threat_score: float = 0.0
+
+
+def run_scenario(
+    seed: int, num_drones: int = NUM_DRONES, num_threats: int = NUM_THREAT_DRONES
+) -> ScenarioResult:
+    """Simulate one seeded scenario in memory and reduce it."""
+    drones = simulate_fleet(seed, num_drones, num_threats)
+
+    result = ScenarioResult(seed=seed)
+    for drone in drones:
+        track = drone.positions
+        alerts = np.flatnonzero(threat_level_codes(track) >= _ALERT_CODE)
+        if drone.role == "threat":
+            first = float(alerts[0] * SECONDS_PER_STEP) if alerts.size else None
+            result.threat_alert_s.append(first)
+            if len(track):
+                peak = float(track.column("threat_score").max())
+                result.peak_threat_score = max(result.peak_threat_score, peak)
+        else:
+            result.inspection_drones += 1
+            result.inspection_alerts += int(alerts.size > 0)
+    return result
+
+
+def _run_chunk(
+    seeds: Sequence[int], num_drones: int, num_threats: int
+) -> List[ScenarioResult]:
+    return [run_scenario(seed, num_drones, num_threats) for seed in seeds]
+
+
+def _warm_worker() -> None:
+    # Map the risk raster once per worker instead of once per first run
+    get_risk_raster()
+
+
+def _percentiles(values: List[float]) -> Dict[str, Optional[float]]:
+    if not values:
+        return {"mean": None, "p50": None, "p90": None, "max": None}
+    arr = np.asarray(values, dtype=np.float64)
+    p50, p90 = np.percentile(arr, [50, 90]).tolist()
+    return {
+        "mean": round(float(arr.mean()), 4),
+        "p50": round(p50, 4),
+        "p90": round(p90, 4),
+        "max": round(float(arr.max()), 4),
+    }
+
+
+def summarise(results: List[ScenarioResult]) -> Dict[str, Any]:
+    """Aggregate statistics over many ScenarioResults."""
+    alert_times = [t for r in results for t in r.threat_alert_s if t is not None]
+    threats = sum(len(r.threat_alert_s) for r in results)
+    inspections = sum(r.inspection_drones for r in results)
+    false_alerts = sum(r.inspection_alerts for r in results)
+    return {
+        "runs": len(results),
+        "threat_drones": threats,
+        "detection_rate": round(len(alert_times) / threats, 4) if threats else None,
+        "time_to_first_alert_s": _percentiles(alert_times),
+        "inspection_drones": inspections,
+        "false_alert_rate": (
+            round(false_alerts / inspections, 4) if inspections else None
+        ),
+        "peak_threat_score": _percentiles([r.peak_threat_score for r in results]),
+    }
+
+
+def run_monte_carlo(
+    runs: int,
+    base_seed: int = 0,
+    workers: Optional[int] = None,
+    num_drones: int = NUM_DRONES,
+    num_threats: int = NUM_THREAT_DRONES,
+) -> List[ScenarioResult]:
+    """
+    Run seeds base_seed .. base_seed + runs - 1 across a process pool
+    (workers defaults to every core). Results come back ordered by seed.
+    """
+    workers = workers or os.cpu_count() or 1
+    seeds = list(range(base_seed, base_seed + runs))
+    _warm_worker()  # build and cache the raster once, before workers start
+    if workers == 1 or runs <= 1:
+        return _run_chunk(seeds, num_drones, num_threats)
+
+    chunk = max(1, -(-runs // (workers * _CHUNKS_PER_WORKER)))
+    results: List[ScenarioResult] = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_warm_worker) as pool:
+        futures = [
+            pool.submit(_run_chunk, seeds[i : i + chunk], num_drones, num_threats)
+            for i in range(0, runs, chunk)
+        ]
+        for future in as_completed(futures):
+            results.extend(future.result())
+    results.sort(key=lambda r: r.seed)
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Monte Carlo scenario statistics.")
+    parser.add_argument("--runs", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0, help="first seed")
+    parser.add_argument("--workers", type=int, help="processes (default: all cores)")
+    parser.add_argument("--drones", type=int, default=NUM_DRONES, help="fleet size")
+    parser.add_argument("--threats", type=int, default=NUM_THREAT_DRONES)
+    parser.add_argument("--output", metavar="PATH", help="also write per-run results (JSON)")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    results = run_monte_carlo(
+        args.runs, args.seed, args.workers, args.drones, args.threats
+    )
+    elapsed = time.perf_counter() - start
+
+    summary = summarise(results)
+    summary["elapsed_s"] = round(elapsed, 3)
+    summary["runs_per_s"] = round(len(results) / elapsed, 1) if elapsed else None
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump([r.__dict__ for r in results], f)
+    print(json.dumps(summary, indent=2))
@@ -5,10 +5,14 @@ No UI or file I/O logic here; delegates to export modules.
 """
 
 import datetime
-import random
+import math
+from typing import Optional
+
+import numpy as np
 
 from config.constants import (
     NUM_DRONES,
+    NUM_THREAT_DRONES,
     NUM_STEPS,
     ALTITUDE_MIN,
     ALTITUDE_MAX,
@@ -16,112 +20,280 @@ from config.constants import (
     MAP_FILE,
     METRICS_LOG_FILE,
     THREAT_JSON_FILE,
+    FLEET_COLUMNAR_PATH,
+    FLEET_COLUMNAR_FORMAT,
+    FLEET_NDJSON_FILE,
 )
-from config.port_botany import LAT_MIN, LAT_MAX, LON_MIN, LON_MAX
-from core.utils import generate_drone_id, generate_altitude, base_time
-from simulation.drone import Drone
-from simulation.trajectories import (
-    trajectory_from_north_to_ship,
-    trajectory_from_south_to_ship,
-    trajectory_from_west_to_cranes,
-    trajectory_from_east_to_ship2,
+from core.utils import (
+    generate_drone_id,
+    generate_altitude,
+    generate_altitudes,
+    base_time,
+    new_seed,
+    spawn_rngs,
 )
-from simulation.movement import step_threat_drone
-from metrics.risk import is_high_risk_zone
-from metrics.behavior import enrich_positions_with_metrics
+from core.instrument import annotate, count, stage
+from simulation.drone import Drone
+from simulation.track import StringPool, Track
+from simulation.trajectories import route_for
+from simulation.swarm import init_swarm, simulate_threat_swarm, step_threat_swarm
+from metrics.online import TrackState
+from metrics.fleet import enrich_fleet_metrics
+from metrics.rolling import compute_rolling_features
 from metrics.scoring import compute_threat_scores
-from export.logger import write_logs
+from metrics.swarm import SwarmFeatureState, compute_swarm_scores
+from export.logger import LOGGER, ProgressLine, write_logs
 from export.json_export import export_threat_telemetry
+from export.columnar import export_fleet_columnar
 from export.map_builder import build_map
+from export.sinks import CsvLogSink, NdjsonSink, StepSink
 
 
-def _create_drones() -> list[Drone]:
-    """Create initial drone fleet."""
+def _create_drones(
+    rngs: list[np.random.Generator], num_threats: int = NUM_THREAT_DRONES
+) -> list[Drone]:
+    """
+    Create initial drone fleet, one drone per random stream;
+    the last num_threats drones are threats.
+    """
+    num_drones = len(rngs)
+    # One string pool per fleet: timestamps and POI names stored once, and
+    # released with the fleet
+    pool = StringPool()
     drones = []
-    for i in range(NUM_DRONES):
+    for i, rng in enumerate(rngs):
         drones.append(
             Drone(
-                id=generate_drone_id(),
-                role="threat" if i == NUM_DRONES - 1 else "inspection",
+                id=generate_drone_id(rng),
+                role="threat" if i >= num_drones - num_threats else "inspection",
                 trajectory_id=i,
-                positions=[],
+                positions=Track(capacity=NUM_STEPS, pool=pool),
+                rng=rng,
             )
         )
     return drones
 
 
-def _run_simulation_loop(drones: list[Drone]) -> None:
-    """Advance all drones through NUM_STEPS."""
-    start_time = base_time()
-    threat_heading_deg = random.uniform(0.0, 360.0)
-    threat_speed_mps = random.uniform(10.0, 14.0)
-    threat_lat = random.uniform(LAT_MIN, LAT_MAX)
-    threat_lon = random.uniform(LON_MIN, LON_MAX)
-
-    for step in range(NUM_STEPS):
-        current_time = start_time + datetime.timedelta(seconds=step)
-        ts_str = current_time.strftime("%Y-%m-%d %H:%M:%S")
-
-        for idx, drone in enumerate(drones):
-            if drone.role == "inspection":
-                if drone.trajectory_id == 0:
-                    lat, lon = trajectory_from_north_to_ship(step, NUM_STEPS)
-                elif drone.trajectory_id == 1:
-                    lat, lon = trajectory_from_south_to_ship(step, NUM_STEPS)
-                elif drone.trajectory_id == 2:
-                    lat, lon = trajectory_from_west_to_cranes(step, NUM_STEPS)
-                else:
-                    lat, lon = trajectory_from_east_to_ship2(step, NUM_STEPS)
-            else:
+def _inspection_fix(drone: Drone, step: int, num_steps: int) -> tuple:
+    """(lat, lon, altitude) of an inspection drone at step, rounded as logged."""
+    lat, lon = route_for(drone.trajectory_id).position_at(step, num_steps)
+    altitude = generate_altitude(ALTITUDE_MIN, ALTITUDE_MAX, drone.rng)
+    return round(lat, 4), round(lon, 4), round(altitude, 4)
+
+
+def _timestamps(num_steps: int, start_time: datetime.datetime) -> list[str]:
+    return [
+        (start_time + datetime.timedelta(seconds=step)).strftime("%Y-%m-%d %H:%M:%S")
+        for step in range(num_steps)
+    ]
+
+
+def _run_simulation_loop(
+    drones: list[Drone],
+    swarm_rng: np.random.Generator,
+    start_time: datetime.datetime,
+    num_steps: int = NUM_STEPS,
+) -> None:
+    """
+    Advance all drones through num_steps from start_time. Each drone draws
+    from its own stream; the threat swarm moves on swarm_rng.
+    """
+    timestamps = _timestamps(num_steps, start_time)
+    count("positions", len(drones) * num_steps)
+    steps = np.arange(num_steps)
+
+    # Inspection routes come out whole; rounded as logged (Python round)
+    for drone in drones:
+        if drone.role != "inspection":
+            continue
+        lats, lons = route_for(drone.trajectory_id).positions(num_steps)
+        drone.positions.extend(
+            {
+                "lat": [round(v, 4) for v in lats.tolist()],
+                "lon": [round(v, 4) for v in lons.tolist()],
+                "altitude": generate_altitudes(
+                    ALTITUDE_MIN, ALTITUDE_MAX, num_steps, drone.rng
+                ),
+                "timestamp": timestamps,
+                "step": steps,
+            }
+        )
+
+    # Threat drones move as one vectorised swarm, stored a column at a time
+    threats = [drone for drone in drones if drone.role == "threat"]
+    if not threats:
+        return
+    threat_lats, threat_lons = simulate_threat_swarm(
+        len(threats), num_steps, swarm_rng
+    )
+    for j, drone in enumerate(threats):
+        drone.positions.extend(
+            {
+                "lat": np.round(threat_lats[:, j], 4),
+                "lon": np.round(threat_lons[:, j], 4),
+                "altitude": generate_altitudes(
+                    ALTITUDE_MIN, ALTITUDE_MAX, num_steps, drone.rng
+                ),
+                "timestamp": timestamps,
+                "step": steps,
+            }
+        )
+
+
+def simulate_fleet(
+    seed: int,
+    num_drones: int = NUM_DRONES,
+    num_threats: int = NUM_THREAT_DRONES,
+) -> list[Drone]:
+    """
+    Create, fly, enrich and score a fleet in memory; no file output.
+    The same seed reproduces the same tracks and timestamps.
+    """
+    # One stream per drone plus one for the swarm
+    rngs = spawn_rngs(seed, num_drones + 1)
+    drones = _create_drones(rngs[:num_drones], num_threats)
+    with stage("simulate"):
+        _run_simulation_loop(drones, rngs[num_drones], base_time(seed))
+    with stage("enrich"):
+        enrich_fleet_metrics(drones)
+    with stage("rolling"):
+        compute_rolling_features(drones)
+    with stage("score"):
+        compute_threat_scores(drones)
+    with stage("swarm"):
+        compute_swarm_scores(drones)
+    return drones
+
+
+def stream_simulation(
+    sinks: list[StepSink],
+    seed: int,
+    num_drones: int = NUM_DRONES,
+    num_threats: int = NUM_THREAT_DRONES,
+    num_steps: int = NUM_STEPS,
+    progress: bool = False,
+) -> None:
+    """
+    Run the same seeded scenario as simulate_fleet one step at a time,
+    enriching and scoring each fix online and handing every step's rows to
+    the sinks. Tracks are not kept, so memory does not grow with num_steps.
+    """
+    progress_line = ProgressLine(num_steps, "Simulating steps") if progress else None
+    rngs = spawn_rngs(seed, num_drones + 1)
+    drones = _create_drones(rngs[:num_drones], num_threats)
+    states = [TrackState() for _ in drones]
+    swarm_state = SwarmFeatureState(len(drones))
+    threats = [i for i, drone in enumerate(drones) if drone.role == "threat"]
+    swarm = init_swarm(len(threats), rngs[num_drones]) if threats else None
+    start_time = base_time(seed)
+
+    try:
+        for step in range(num_steps):
+            ts_str = (start_time + datetime.timedelta(seconds=step)).strftime(
+                "%Y-%m-%d %H:%M:%S"
+            )
+            fixes = {}
+            if swarm is not None:
                 if step > 0:
-                    threat_lat, threat_lon, threat_heading_deg, threat_speed_mps = (
-                        step_threat_drone(
-                            threat_lat,
-                            threat_lon,
-                            threat_heading_deg,
-                            threat_speed_mps,
-                            step,
-                        )
-                    )
-                lat, lon = threat_lat, threat_lon
-
-            altitude = generate_altitude(ALTITUDE_MIN, ALTITUDE_MAX)
-            lat = round(lat, 4)
-            lon = round(lon, 4)
-            altitude = round(altitude, 4)
-
-            drone.positions.append(
-                {
-                    "lat": lat,
-                    "lon": lon,
-                    "altitude": altitude,
-                    "timestamp": ts_str,
-                    "step": step,
-                }
+                    step_threat_swarm(swarm, rngs[num_drones])
+                lats = np.round(swarm.lat, 4).tolist()
+                lons = np.round(swarm.lon, 4).tolist()
+                for j, i in enumerate(threats):
+                    altitude = generate_altitude(ALTITUDE_MIN, ALTITUDE_MAX, drones[i].rng)
+                    fixes[i] = (lats[j], lons[j], altitude)
+
+            rows = []
+            for i, drone in enumerate(drones):
+                if drone.role == "inspection":
+                    lat, lon, altitude = _inspection_fix(drone, step, num_steps)
+                else:
+                    lat, lon, altitude = fixes[i]
+                rows.append((drone, states[i].update(lat, lon, altitude, ts_str, step)))
+            features = swarm_state.update(
+                [pos["lat"] for _, pos in rows],
+                [pos["lon"] for _, pos in rows],
+                [pos["hovering_duration_s"] > 0.0 for _, pos in rows],
             )
+            nearest = features.nearest_drone_m.tolist()
+            scores = features.swarm_score.tolist()
+            for k, (_, pos) in enumerate(rows):
+                pos["nearest_drone_m"] = None if math.isnan(nearest[k]) else nearest[k]
+                pos["swarm_score"] = scores[k]
+            count("positions", len(rows))
+            for sink in sinks:
+                sink.write_step(rows)
+            if progress_line is not None:
+                progress_line.update()
+    finally:
+        for sink in sinks:
+            sink.close()
+        if progress_line is not None:
+            progress_line.close()
 
 
-def run_simulation() -> None:
+def run_simulation(
+    num_drones: int = NUM_DRONES,
+    num_threats: int = NUM_THREAT_DRONES,
+    seed: Optional[int] = None,
+    stream: bool = False,
+    progress: bool = False,
+) -> None:
     """
     Run full simulation: drones, metrics, logs, map, JSON export.
+    num_threats > 1 runs a vectorised threat swarm. Without a seed a fresh
+    one is drawn; either way it is recorded in every export for replay.
+    stream=True writes the logs and NDJSON step by step instead (no map or
+    whole-run exports), so memory stays flat for long missions.
+    progress draws a rate-limited progress line on stderr. Inside
+    core.instrument.instrumented() every stage is timed and counted.
     """
-    drones = _create_drones()
-    _run_simulation_loop(drones)
+    seed = new_seed() if seed is None else seed
+    annotate(
+        seed=seed,
+        drones=num_drones,
+        threats=num_threats,
+        steps=NUM_STEPS,
+        mode="stream" if stream else "batch",
+    )
+    if stream:
+        with stage("stream"):
+            stream_simulation(
+                [
+                    CsvLogSink(LOG_FILE, METRICS_LOG_FILE, seed),
+                    NdjsonSink(FLEET_NDJSON_FILE, seed),
+                ],
+                seed,
+                num_drones,
+                num_threats,
+                progress=progress,
+            )
+        LOGGER.info("Log saved to %s", LOG_FILE)
+        LOGGER.info("Fleet telemetry saved to %s", FLEET_NDJSON_FILE)
+        LOGGER.info("Seed: %s", seed)
+        return
 
-    enrich_positions_with_metrics(drones)
-    compute_threat_scores(drones)
+    drones = simulate_fleet(seed, num_drones, num_threats)
 
-    write_logs(
-        drones,
-        LOG_FILE,
-        METRICS_LOG_FILE,
-    )
+    with stage("write_logs"):
+        write_logs(
+            drones,
+            LOG_FILE,
+            METRICS_LOG_FILE,
+            seed,
+            progress=progress,
+        )
 
-    build_map(drones, MAP_FILE)
+    with stage("build_map"):
+        build_map(drones, MAP_FILE, seed)
 
     threat_drone = next((d for d in drones if d.role == "threat"), None)
     if threat_drone:
-        export_threat_telemetry(threat_drone, THREAT_JSON_FILE)
+        with stage("export_json"):
+            export_threat_telemetry(threat_drone, THREAT_JSON_FILE, seed)
+    with stage("export_columnar"):
+        export_fleet_columnar(drones, FLEET_COLUMNAR_PATH, FLEET_COLUMNAR_FORMAT, seed)
 
-    print(f"\nMap saved to {MAP_FILE}")
-    print(f"Log saved to {LOG_FILE}")
+    LOGGER.info("Map saved to %s", MAP_FILE)
+    LOGGER.info("Log saved to %s", LOG_FILE)
+    LOGGER.info("Fleet telemetry saved to %s/", FLEET_COLUMNAR_PATH)
+    LOGGER.info("Seed: %s", seed)
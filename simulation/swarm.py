@@ -0,0 +1,139 @@
+"""
+Threat swarm movement: N threat drones advanced together as arrays.
+
+Erratic but purposeful threat behaviour (heading micro-drifts, hover /
+creep / sprint speed modulation, attraction toward high-value POIs,
+bounding-box bounce). One vectorised step moves the whole swarm, a single
+threat included, so thousands of hostile tracks cost a handful of NumPy
+calls per step.
+"""
+
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import numpy as np
+
+from config.port_botany import LAT_MIN, LAT_MAX, LON_MIN, LON_MAX
+from core.geo import bearing_deg_matrix, haversine_km_matrix
+from metrics.poi_index import get_poi_index
+from simulation.attraction import (
+    DIRECT_MAX_POIS,
+    attraction_vector,
+    get_attraction_field,
+)
+
+# Drones per block when evaluating drone x POI attraction matrices
+_ATTRACTION_BLOCK = 4096
+
+
+@dataclass
+class SwarmState:
+    """Per-drone kinematic state, one array element per threat drone."""
+
+    lat: np.ndarray
+    lon: np.ndarray
+    heading_deg: np.ndarray
+    speed_mps: np.ndarray
+
+    def __len__(self) -> int:
+        return self.lat.shape[0]
+
+
+def init_swarm(n: int, rng: np.random.Generator) -> SwarmState:
+    """Random start positions, headings and cruise speeds inside the port box."""
+    return SwarmState(
+        lat=rng.uniform(LAT_MIN, LAT_MAX, n),
+        lon=rng.uniform(LON_MIN, LON_MAX, n),
+        heading_deg=rng.uniform(0.0, 360.0, n),
+        speed_mps=rng.uniform(10.0, 14.0, n),
+    )
+
+
+def asset_attraction_many(
+    lat: np.ndarray, lon: np.ndarray, strength: float
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Weighted attraction toward the risk POIs: weight w / (d^2 + 0.01) per
+    POI (POIs within 10 m ignored), averaged over bearings.
+    Returns (dlat, dlon) arrays in degrees per step. Catalogues above
+    DIRECT_MAX_POIS use the cutoff / precompiled AttractionField instead.
+    """
+    index = get_poi_index()
+    if not len(index):
+        return np.zeros(lat.shape[0]), np.zeros(lat.shape[0])
+    if len(index) > DIRECT_MAX_POIS:
+        return get_attraction_field().attraction_many(lat, lon, strength)
+
+    dlat = np.empty(lat.shape[0])
+    dlon = np.empty(lat.shape[0])
+    for start in range(0, lat.shape[0], _ATTRACTION_BLOCK):
+        sl = slice(start, start + _ATTRACTION_BLOCK)
+        d_km = haversine_km_matrix(lat[sl], lon[sl], index.lat, index.lon)
+        weight = np.where(d_km < 0.01, 0.0, index.weight / (d_km * d_km + 0.01))
+        bearing_rad = np.radians(
+            bearing_deg_matrix(lat[sl], lon[sl], index.lat, index.lon)
+        )
+        dlat[sl], dlon[sl] = attraction_vector(
+            (np.cos(bearing_rad) * weight).sum(axis=1),
+            (np.sin(bearing_rad) * weight).sum(axis=1),
+            weight.sum(axis=1),
+            lat[sl],
+            strength,
+        )
+    return dlat, dlon
+
+
+def step_threat_swarm(state: SwarmState, rng: np.random.Generator) -> None:
+    """Advance every drone in the swarm by one step, in place."""
+    n = len(state)
+    lat = state.lat
+    meters_per_deg_lat = 111_000.0
+    meters_per_deg_lon = 111_000.0 * np.cos(np.radians(lat))
+
+    # Heading noise: micro-drifts, up to ±30°
+    heading = (state.heading_deg + rng.uniform(-30.0, 30.0, n)) % 360.0
+
+    # Speed modulation: hover (20 %), sprint (15 %), otherwise creep
+    r = rng.random(n)
+    hover = rng.uniform(0.0, 2.0, n)
+    sprint = rng.uniform(12.0, 18.0, n)
+    creep = np.clip(state.speed_mps + rng.uniform(-0.5, 0.5, n), 4.0, 18.0)
+    speed = np.where(r < 0.20, hover, np.where(r < 0.35, sprint, creep))
+
+    # Base movement from heading + speed, plus attraction toward POIs
+    heading_rad = np.radians(heading)
+    dlat = speed * np.cos(heading_rad) / meters_per_deg_lat
+    dlon = speed * np.sin(heading_rad) / meters_per_deg_lon
+    att_dlat, att_dlon = asset_attraction_many(lat, state.lon, 15.0)
+    new_lat = lat + dlat + att_dlat
+    new_lon = state.lon + dlon + att_dlon
+
+    # Bounding box: bounce heading on edge
+    bounced = (
+        (new_lat < LAT_MIN) | (new_lat > LAT_MAX) | (new_lon < LON_MIN) | (new_lon > LON_MAX)
+    )
+    heading = np.where(bounced, (heading + 180.0) % 360.0, heading)
+
+    state.lat = np.clip(new_lat, LAT_MIN, LAT_MAX)
+    state.lon = np.clip(new_lon, LON_MIN, LON_MAX)
+    state.heading_deg = heading
+    state.speed_mps = speed
+
+
+def simulate_threat_swarm(
+    n: int, num_steps: int, rng: Optional[np.random.Generator] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Run a swarm for num_steps. Returns (lat, lon) arrays shaped
+    (num_steps, n); row 0 is the start position.
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    state = init_swarm(n, rng)
+    lats = np.empty((num_steps, n))
+    lons = np.empty((num_steps, n))
+    for step in range(num_steps):
+        if step > 0:
+            step_threat_swarm(state, rng)
+        lats[step] = state.lat
+        lons[step] = state.lon
+    return lats, lons
@@ -0,0 +1,278 @@
+"""
+Columnar track storage: one typed NumPy array per position field.
+
+Replaces the list of per-step dicts on Drone.positions. String fields are
+interned in a StringPool and stored as int32 codes (-1 for None); optional
+floats store None as NaN. A pool is scoped to its tracks (one per fleet), so
+long-running processes release interned strings with the fleet. Indexing or iterating a Track yields PositionView
+objects, dict-like windows onto one row, so ``pos["lat"]`` callers keep
+working while bulk readers and writers use whole columns.
+"""
+
+from collections.abc import MutableMapping
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional
+
+import numpy as np
+
+FLOAT = "float"
+OPTIONAL_FLOAT = "optional_float"
+INT = "int"
+BOOL = "bool"
+STRING = "string"
+
+# Position schema: field name -> storage kind
+FIELDS: Dict[str, str] = {
+    "lat": FLOAT,
+    "lon": FLOAT,
+    "altitude": FLOAT,
+    "timestamp": STRING,
+    "step": INT,
+    "in_risk_zone": BOOL,
+    "distance_km": FLOAT,
+    "hovering_duration_s": FLOAT,
+    "flight_deviation_deg": FLOAT,
+    "sensor_orientation_deg": OPTIONAL_FLOAT,
+    "sensor_target": STRING,
+    "heading_deg": OPTIONAL_FLOAT,
+    "ground_speed_mps": FLOAT,
+    "threat_time_s": FLOAT,
+    "heading_change_mean_deg": FLOAT,
+    "heading_change_var_deg2": FLOAT,
+    "hover_fraction": FLOAT,
+    "fixation_dwell_s": FLOAT,
+    "speed_jitter_mps": FLOAT,
+    "threat_score": FLOAT,
+    "nearest_drone_m": OPTIONAL_FLOAT,
+    "swarm_score": FLOAT,
+}
+
+_DTYPES = {
+    FLOAT: np.float64,
+    OPTIONAL_FLOAT: np.float64,
+    INT: np.int64,
+    BOOL: np.bool_,
+    STRING: np.int32,
+}
+
+_MISSING = {
+    FLOAT: 0.0,
+    OPTIONAL_FLOAT: np.nan,
+    INT: 0,
+    BOOL: False,
+    STRING: -1,
+}
+
+
+class StringPool:
+    """Interns strings to dense int32 codes; code -1 stands for None."""
+
+    def __init__(self) -> None:
+        self._codes: Dict[str, int] = {}
+        self._strings: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self._strings)
+
+    def intern(self, value: Optional[str]) -> int:
+        """Return the code for value, adding it to the pool if new."""
+        if value is None:
+            return -1
+        code = self._codes.get(value)
+        if code is None:
+            code = len(self._strings)
+            self._codes[value] = code
+            self._strings.append(value)
+        return code
+
+    def intern_many(self, values: Iterable[Optional[str]]) -> np.ndarray:
+        """Vector of codes for an iterable of strings / None."""
+        intern = self.intern
+        return np.fromiter((intern(v) for v in values), dtype=np.int32)
+
+    def lookup(self, code: int) -> Optional[str]:
+        """String for a code (None for -1)."""
+        return None if code < 0 else self._strings[code]
+
+    def lookup_many(self, codes: np.ndarray) -> List[Optional[str]]:
+        """Decode a vector of codes to a list of strings / None."""
+        strings = self._strings
+        return [None if c < 0 else strings[c] for c in codes.tolist()]
+
+    def table(self) -> List[str]:
+        """All interned strings, indexed by code."""
+        return list(self._strings)
+
+
+class PositionView(MutableMapping):
+    """Dict-like view of one row of a Track; reads and writes go to the columns."""
+
+    __slots__ = ("_track", "_index")
+
+    def __init__(self, track: "Track", index: int) -> None:
+        self._track = track
+        self._index = index
+
+    def __getitem__(self, key: str) -> Any:
+        return self._track._get(key, self._index)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._track._set(key, self._index, value)
+
+    def __delitem__(self, key: str) -> None:
+        raise TypeError("position fields cannot be deleted")
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._track.fields())
+
+    def __len__(self) -> int:
+        return len(self._track._columns)
+
+    def __repr__(self) -> str:
+        return f"PositionView({dict(self)!r})"
+
+
+class Track:
+    """Growable struct-of-arrays store for one drone's positions."""
+
+    def __init__(self, capacity: int = 0, pool: Optional[StringPool] = None) -> None:
+        # Tracks of a fleet share one pool; a lone track gets its own
+        self.pool = StringPool() if pool is None else pool
+        self._capacity = max(0, capacity)
+        self._size = 0
+        self._columns: Dict[str, np.ndarray] = {}
+
+    @classmethod
+    def from_rows(
+        cls, rows: Iterable[Mapping[str, Any]], pool: Optional[StringPool] = None
+    ) -> "Track":
+        """Build a Track from per-step dicts (e.g. legacy position lists)."""
+        rows = list(rows)
+        track = cls(capacity=len(rows), pool=pool)
+        for row in rows:
+            track.append(row)
+        return track
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, index: int) -> PositionView:
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("track index out of range")
+        return PositionView(self, index)
+
+    def __iter__(self) -> Iterator[PositionView]:
+        for i in range(self._size):
+            yield PositionView(self, i)
+
+    def __repr__(self) -> str:
+        return f"Track(len={self._size}, fields={self.fields()})"
+
+    def fields(self) -> List[str]:
+        """Fields present in this track, in schema order."""
+        return [name for name in FIELDS if name in self._columns]
+
+    def has_column(self, name: str) -> bool:
+        return name in self._columns
+
+    def reserve(self, capacity: int) -> None:
+        """Grow storage so at least capacity rows fit without reallocation."""
+        if capacity <= self._capacity:
+            return
+        for name, col in self._columns.items():
+            grown = np.full(capacity, _MISSING[FIELDS[name]], dtype=col.dtype)
+            grown[: self._size] = col[: self._size]
+            self._columns[name] = grown
+        self._capacity = capacity
+
+    def append(self, row: Mapping[str, Any]) -> None:
+        """Append one position given as a mapping of field -> value."""
+        if self._size == self._capacity:
+            self.reserve(max(16, self._capacity * 2))
+        index = self._size
+        self._size += 1
+        for key, value in row.items():
+            self._set(key, index, value)
+
+    def extend(self, columns: Mapping[str, Any]) -> None:
+        """Append many positions given as field -> equal-length sequences."""
+        lengths = {len(values) for values in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError("columns passed to extend() differ in length")
+        count = lengths.pop() if lengths else 0
+        if self._size + count > self._capacity:
+            self.reserve(max(self._size + count, self._capacity * 2))
+        start = self._size
+        self._size += count
+        for name, values in columns.items():
+            kind = FIELDS.get(name)
+            if kind is None:
+                raise KeyError(f"unknown position field {name!r}")
+            if kind == STRING and not isinstance(values, np.ndarray):
+                values = self.pool.intern_many(values)
+            elif kind == OPTIONAL_FLOAT and not isinstance(values, np.ndarray):
+                values = [np.nan if v is None else v for v in values]
+            self._storage(name)[start : self._size] = values
+
+    def column(self, name: str) -> np.ndarray:
+        """Raw storage for a field (string codes, NaN for None); a writable view."""
+        return self._storage(name)[: self._size]
+
+    def values(self, name: str) -> List[Any]:
+        """Field decoded to a list of Python values, None where missing."""
+        kind = FIELDS[name]
+        col = self.column(name)
+        if kind == STRING:
+            return self.pool.lookup_many(col)
+        if kind == OPTIONAL_FLOAT:
+            return [None if v != v else v for v in col.tolist()]
+        return col.tolist()
+
+    def set_column(self, name: str, values: Any) -> None:
+        """Overwrite a whole field; values may hold None for optional fields."""
+        kind = FIELDS[name]
+        if kind == STRING and not isinstance(values, np.ndarray):
+            values = self.pool.intern_many(values)
+        elif kind == OPTIONAL_FLOAT and not isinstance(values, np.ndarray):
+            values = [np.nan if v is None else v for v in values]
+        values = np.asarray(values, dtype=_DTYPES[kind])
+        if values.shape != (self._size,):
+            raise ValueError(
+                f"column {name!r} needs {self._size} values, got {values.shape}"
+            )
+        self._storage(name)[: self._size] = values
+
+    def _storage(self, name: str) -> np.ndarray:
+        col = self._columns.get(name)
+        if col is None:
+            kind = FIELDS.get(name)
+            if kind is None:
+                raise KeyError(f"unknown position field {name!r}")
+            col = np.full(self._capacity, _MISSING[kind], dtype=_DTYPES[kind])
+            self._columns[name] = col
+        return col
+
+    def _get(self, name: str, index: int) -> Any:
+        col = self._columns.get(name)
+        if col is None:
+            raise KeyError(name)
+        kind = FIELDS[name]
+        value = col[index].item()
+        if kind == STRING:
+            return self.pool.lookup(value)
+        if kind == OPTIONAL_FLOAT and value != value:
+            return None
+        return value
+
+    def _set(self, name: str, index: int, value: Any) -> None:
+        col = self._storage(name)
+        kind = FIELDS[name]
+        if kind == STRING:
+            col[index] = self.pool.intern(value)
+        elif value is None:
+            if kind != OPTIONAL_FLOAT:
+                raise ValueError(f"field {name!r} cannot be None")
+            col[index] = np.nan
+        else:
+            col[index] = value
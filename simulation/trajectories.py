@@ -1,10 +1,17 @@
 """
 Inspection drone trajectories over Port Botany.
 
-Deterministic paths that stay tightly over infrastructure.
+Deterministic paths that stay tightly over infrastructure. Each route is
+declared as waypoints in a registry; positions for a whole run come out as
+arrays in one go (cached per route and run length), so the simulator needs
+no per-step dispatch and new routes need no simulator changes.
 """
 
-from typing import Tuple
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import List, Tuple
+
+import numpy as np
 
 from config.port_botany import (
     PORT_BOTANY_CENTER_LAT,
@@ -20,76 +27,129 @@ from config.port_botany import (
 )
 from core.geo import clamp
 
+# Cached (route, num_steps) position arrays
+_ROUTE_CACHE_SIZE = 1024
+
 
 def lerp(a: float, b: float, t: float) -> float:
     """Linear interpolation."""
     return a + (b - a) * t
 
 
-def trajectory_from_north_to_ship(step: int, num_steps: int) -> Tuple[float, float]:
+@dataclass(frozen=True)
+class Route:
     """
-    Drone 1: Approaches from NORTH into Port Botany.
-    Flies over CRANE_1 then inspects SHIP_1.
+    Straight legs between waypoints, flown once over a run. The run's steps
+    are split evenly between legs and each leg ends exactly on its waypoint.
     """
-    mid = num_steps // 2
-    if step <= mid:
-        t = step / mid
-        start_lat, start_lon = LAT_MAX + 0.01, PORT_BOTANY_CENTER_LON
-        lat = lerp(start_lat, CRANE_1[0], t)
-        lon = lerp(start_lon, CRANE_1[1], t)
-    else:
-        t = (step - mid) / (num_steps - 1 - mid)
-        lat = lerp(CRANE_1[0], SHIP_1[0], t)
-        lon = lerp(CRANE_1[1], SHIP_1[1], t)
-    return clamp(lat, LAT_MIN, LAT_MAX), clamp(lon, LON_MIN, LON_MAX)
+
+    name: str
+    waypoints: Tuple[Tuple[float, float], ...]
+
+    def leg_bounds(self, num_steps: int) -> List[int]:
+        """Step index where each leg starts, plus the last step."""
+        legs = len(self.waypoints) - 1
+        bounds = [(i * num_steps) // legs for i in range(legs)]
+        bounds.append(max(num_steps - 1, 0))
+        return bounds
+
+    def positions(self, num_steps: int) -> Tuple[np.ndarray, np.ndarray]:
+        """(lats, lons) for every step, clamped to the map; read-only arrays."""
+        return _route_positions(self, num_steps)
+
+    def position_at(self, step: int, num_steps: int) -> Tuple[float, float]:
+        """One step of positions(), computed without building the arrays."""
+        bounds = self.leg_bounds(num_steps)
+        leg = 0
+        while leg < len(bounds) - 2 and step > bounds[leg + 1]:
+            leg += 1
+        length = bounds[leg + 1] - bounds[leg]
+        t = (step - bounds[leg]) / length if length > 0 else 0.0
+        (a_lat, a_lon), (b_lat, b_lon) = self.waypoints[leg], self.waypoints[leg + 1]
+        lat = lerp(a_lat, b_lat, t)
+        lon = lerp(a_lon, b_lon, t)
+        return clamp(lat, LAT_MIN, LAT_MAX), clamp(lon, LON_MIN, LON_MAX)
+
+
+@lru_cache(maxsize=_ROUTE_CACHE_SIZE)
+def _route_positions(route: Route, num_steps: int) -> Tuple[np.ndarray, np.ndarray]:
+    bounds = np.asarray(route.leg_bounds(num_steps))
+    steps = np.arange(num_steps)
+    # A step on a boundary belongs to the leg it ends (t == 1)
+    leg = np.minimum(np.searchsorted(bounds[1:], steps), len(bounds) - 2)
+    start = bounds[leg]
+    length = bounds[leg + 1] - start
+    t = np.divide(steps - start, length, out=np.zeros(num_steps), where=length > 0)
+    waypoints = np.asarray(route.waypoints, dtype=np.float64)
+    a, b = waypoints[leg], waypoints[leg + 1]
+    lats = np.clip(a[:, 0] + (b[:, 0] - a[:, 0]) * t, LAT_MIN, LAT_MAX)
+    lons = np.clip(a[:, 1] + (b[:, 1] - a[:, 1]) * t, LON_MIN, LON_MAX)
+    lats.flags.writeable = False
+    lons.flags.writeable = False
+    return lats, lons
+
+
+# Drone 1: approaches from NORTH into Port Botany; flies over CRANE_1, then SHIP_1
+NORTH_TO_SHIP = Route(
+    "north_to_ship",
+    ((LAT_MAX + 0.01, PORT_BOTANY_CENTER_LON), CRANE_1, SHIP_1),
+)
+
+# Drone 2: approaches from SOUTH; inspects SHIP_1, then CRANE_2
+SOUTH_TO_SHIP = Route(
+    "south_to_ship",
+    ((LAT_MIN - 0.01, PORT_BOTANY_CENTER_LON + 0.01), SHIP_1, CRANE_2),
+)
+
+# Drone 3: approaches from WEST; flies along the quay, CRANE_1 then CRANE_2
+WEST_TO_CRANES = Route(
+    "west_to_cranes",
+    ((PORT_BOTANY_CENTER_LAT, LON_MIN - 0.01), CRANE_1, CRANE_2),
+)
+
+# Drone 4: approaches from EAST; short inspection run across SHIP_2
+EAST_TO_SHIP2 = Route(
+    "east_to_ship2",
+    ((PORT_BOTANY_CENTER_LAT - 0.005, LON_MAX + 0.01), SHIP_2),
+)
+
+# Route per trajectory_id; ids past the end fly the last route
+INSPECTION_ROUTES: List[Route] = [
+    NORTH_TO_SHIP,
+    SOUTH_TO_SHIP,
+    WEST_TO_CRANES,
+    EAST_TO_SHIP2,
+]
+
+
+def register_route(route: Route) -> int:
+    """Add an inspection route; returns its trajectory_id."""
+    if len(route.waypoints) < 2:
+        raise ValueError("a route needs at least two waypoints")
+    INSPECTION_ROUTES.append(route)
+    return len(INSPECTION_ROUTES) - 1
+
+
+def route_for(trajectory_id: int) -> Route:
+    """Registered route flown by an inspection drone."""
+    return INSPECTION_ROUTES[min(trajectory_id, len(INSPECTION_ROUTES) - 1)]
+
+
+def trajectory_from_north_to_ship(step: int, num_steps: int) -> Tuple[float, float]:
+    """Drone 1 position at step (NORTH_TO_SHIP)."""
+    return NORTH_TO_SHIP.position_at(step, num_steps)
 
 
 def trajectory_from_south_to_ship(step: int, num_steps: int) -> Tuple[float, float]:
-    """
-    Drone 2: Approaches from SOUTH.
-    Inspects SHIP_1 then CRANE_2.
-    """
-    mid = num_steps // 2
-    if step <= mid:
-        t = step / mid
-        start_lat, start_lon = LAT_MIN - 0.01, PORT_BOTANY_CENTER_LON + 0.01
-        lat = lerp(start_lat, SHIP_1[0], t)
-        lon = lerp(start_lon, SHIP_1[1], t)
-    else:
-        t = (step - mid) / (num_steps - 1 - mid)
-        lat = lerp(SHIP_1[0], CRANE_2[0], t)
-        lon = lerp(SHIP_1[1], CRANE_2[1], t)
-    return clamp(lat, LAT_MIN, LAT_MAX), clamp(lon, LON_MIN, LON_MAX)
+    """Drone 2 position at step (SOUTH_TO_SHIP)."""
+    return SOUTH_TO_SHIP.position_at(step, num_steps)
 
 
 def trajectory_from_west_to_cranes(step: int, num_steps: int) -> Tuple[float, float]:
-    """
-    Drone 3: Approaches from WEST.
-    Flies along quay: CRANE_1 then CRANE_2.
-    
-    
-    """
-    mid = num_steps // 2
-    if step <= mid:
-        t = step / mid
-        start_lat, start_lon = PORT_BOTANY_CENTER_LAT, LON_MIN - 0.01
-        lat = lerp(start_lat, CRANE_1[0], t)
-        lon = lerp(start_lon, CRANE_1[1], t)
-    else:
-        t = (step - mid) / (num_steps - 1 - mid)
-        lat = lerp(CRANE_1[0], CRANE_2[0], t)
-        lon = lerp(CRANE_1[1], CRANE_2[1], t)
-    return clamp(lat, LAT_MIN, LAT_MAX), clamp(lon, LON_MIN, LON_MAX)
+    """Drone 3 position at step (WEST_TO_CRANES)."""
+    return WEST_TO_CRANES.position_at(step, num_steps)
 
 
 def trajectory_from_east_to_ship2(step: int, num_steps: int) -> Tuple[float, float]:
-    """
-    Drone 4: Approaches from EAST.
-    Performs short inspection run across SHIP_2.
-    """
-    t = step / (num_steps - 1)
-    start_lat, start_lon = PORT_BOTANY_CENTER_LAT - 0.005, LON_MAX + 0.01
-    end_lat, end_lon = SHIP_2
-    lat = lerp(start_lat, end_lat, t)
-    lon = lerp(start_lon, end_lon, t)
-    return clamp(lat, LAT_MIN, LAT_MAX), clamp(lon, LON_MIN, LON_MAX)
+    """Drone 4 position at step (EAST_TO_SHIP2)."""
+    return EAST_TO_SHIP2.position_at(step, num_steps)
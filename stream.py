@@ -0,0 +1,10 @@
+"""
+UAV Threat Classification – Streaming entry point.
+
+Scores live drone fixes (JSONL on stdin, a tailed file or a local socket).
+"""
+
+from streaming.service import main
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,418 @@
+"""
+Live map server: runs a seeded simulation in real time and pushes each step
+to browsers over Server-Sent Events (stdlib asyncio, no extra dependencies).
+
+GET / serves the map page; GET /events is the SSE stream. A new viewer gets
+an "init" event (drone ids, colours, headline table) and the latest frame,
+then one "step" event per simulation step carrying only that step: positions,
+scores, risk flags, the top-K ranking and the headline code. Each step is
+serialised once and the same bytes go to every viewer. A viewer that falls
+behind is not queued up: its pending frame is simply replaced by the newest
+one (frames are whole-fleet snapshots of a step), so slow clients coalesce
+updates and memory stays bounded however many viewers connect.
+"""
+
+import argparse
+import asyncio
+import json
+import threading
+import time
+from typing import Any, Dict, List, Optional, Set
+
+from config.constants import (
+    LIVE_MAP_PORT,
+    MAP_TOP_K,
+    NUM_DRONES,
+    NUM_STEPS,
+    NUM_THREAT_DRONES,
+    SECONDS_PER_STEP,
+)
+from config.port_botany import PORT_BOTANY_CENTER_LAT, PORT_BOTANY_CENTER_LON
+from core.utils import new_seed
+from export.logger import LOGGER, configure_console
+from export.sinks import StepRows, StepSink
+from metrics.ranking import TopKTracker
+from metrics.risk import generate_risk_heat_points
+from metrics.scoring import THREAT_HEADLINES, threat_level
+from simulation.simulator import stream_simulation
+
+_COLORS = ("blue", "green", "orange", "purple", "red")
+
+# Request line + headers larger than this are rejected
+_MAX_REQUEST_BYTES = 8192
+
+
+def _sse(event: str, payload: Any) -> bytes:
+    data = json.dumps(payload, separators=(",", ":"))
+    return f"event: {event}\ndata: {data}\n\n".encode("utf-8")
+
+
+class _Stopped(Exception):
+    """Raised from LiveMapSink.write_step to end the simulation thread."""
+
+
+class _Viewer:
+    """
+    One connected browser: an init slot, a single pending step slot and a
+    wake-up event. Only steps coalesce; init is always sent before them.
+    """
+
+    __slots__ = ("init", "pending", "ready", "coalesced")
+
+    def __init__(self) -> None:
+        self.init: Optional[bytes] = None
+        self.pending: Optional[bytes] = None
+        self.ready = asyncio.Event()
+        self.coalesced = 0
+
+    def offer_init(self, frame: bytes) -> None:
+        self.init = frame
+        self.ready.set()
+
+    def offer(self, frame: bytes) -> None:
+        if self.pending is not None:
+            # Still sending an older step: replace it with the newest
+            self.coalesced += 1
+        self.pending = frame
+        self.ready.set()
+
+    def take(self) -> List[bytes]:
+        """Frames to send now, init first; empties both slots."""
+        frames = [f for f in (self.init, self.pending) if f is not None]
+        self.init = self.pending = None
+        return frames
+
+
+class Broadcaster:
+    """Fan-out of serialised frames to viewers; lives on the event loop."""
+
+    def __init__(self) -> None:
+        self.viewers: Set[_Viewer] = set()
+        self.init_frame: Optional[bytes] = None
+        self.latest: Optional[bytes] = None
+        self.frames = 0
+
+    def set_init(self, frame: bytes) -> None:
+        self.init_frame = frame
+        for viewer in self.viewers:
+            viewer.offer_init(frame)
+
+    def publish(self, frame: bytes) -> None:
+        self.latest = frame
+        self.frames += 1
+        for viewer in self.viewers:
+            viewer.offer(frame)
+
+    def join(self) -> _Viewer:
+        viewer = _Viewer()
+        if self.init_frame is not None:
+            viewer.offer_init(self.init_frame)
+        if self.latest is not None:
+            viewer.offer(self.latest)
+        self.viewers.add(viewer)
+        return viewer
+
+    def leave(self, viewer: _Viewer) -> None:
+        self.viewers.discard(viewer)
+
+
+class LiveMapSink(StepSink):
+    """
+    Step sink feeding a Broadcaster from the simulation thread: ranks the
+    step with an incremental top-K heap, serialises it once, paces to real
+    time and hands the bytes to the event loop.
+    """
+
+    def __init__(
+        self,
+        broadcaster: Broadcaster,
+        loop: asyncio.AbstractEventLoop,
+        stop: threading.Event,
+        top_k: int = MAP_TOP_K,
+        step_interval_s: float = SECONDS_PER_STEP,
+    ) -> None:
+        self.broadcaster = broadcaster
+        self.loop = loop
+        self.stop = stop
+        self.top_k = top_k
+        self.step_interval_s = step_interval_s
+        self.ranking = TopKTracker()
+        self._next_due = time.monotonic()
+        self._sent_init = False
+
+    def _init_payload(self, rows: StepRows) -> Dict[str, Any]:
+        return {
+            "drones": [
+                {"id": drone.id, "type": drone.role, "color": _COLORS[i % len(_COLORS)]}
+                for i, (drone, _) in enumerate(rows)
+            ],
+            "headlines": [list(h) for h in THREAT_HEADLINES],
+            "top_k": self.top_k,
+        }
+
+    def write_step(self, rows: StepRows) -> None:
+        if self.stop.is_set():
+            raise _Stopped
+        if not self._sent_init:
+            init = _sse("init", self._init_payload(rows))
+            self.loop.call_soon_threadsafe(self.broadcaster.set_init, init)
+            self._sent_init = True
+
+        for i, (_, pos) in enumerate(rows):
+            self.ranking.update(i, pos["threat_score"])
+        top = [i for i, _ in self.ranking.top(self.top_k)]
+        headline = THREAT_HEADLINES.index(threat_level(rows[top[0]][1])) if top else 0
+        first = rows[0][1] if rows else {}
+        frame = _sse(
+            "step",
+            {
+                "step": first.get("step", 0),
+                "timestamp": first.get("timestamp"),
+                "lat": [pos["lat"] for _, pos in rows],
+                "lon": [pos["lon"] for _, pos in rows],
+                "score": [round(pos["threat_score"], 2) for _, pos in rows],
+                "risk": [1 if pos["in_risk_zone"] else 0 for _, pos in rows],
+                "target": [pos["sensor_target"] for _, pos in rows],
+                "top": top,
+                "headline": headline,
+            },
+        )
+
+        # Real-time pacing: one step per step_interval_s
+        self._next_due += self.step_interval_s
+        delay = self._next_due - time.monotonic()
+        if delay > 0:
+            self.stop.wait(delay)
+        self.loop.call_soon_threadsafe(self.broadcaster.publish, frame)
+
+
+async def _send_events(
+    broadcaster: Broadcaster, writer: asyncio.StreamWriter
+) -> None:
+    writer.write(
+        b"HTTP/1.1 200 OK\r\n"
+        b"Content-Type: text/event-stream\r\n"
+        b"Cache-Control: no-cache\r\n"
+        b"Connection: keep-alive\r\n\r\n"
+    )
+    viewer = broadcaster.join()
+    try:
+        while True:
+            await viewer.ready.wait()
+            viewer.ready.clear()
+            for frame in viewer.take():
+                writer.write(frame)
+            # Backpressure: while this drains, new steps coalesce in pending
+            await writer.drain()
+    finally:
+        broadcaster.leave(viewer)
+
+
+def _respond(writer: asyncio.StreamWriter, status: str, content_type: str, body: bytes) -> None:
+    writer.write(
+        f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\n"
+        f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode("ascii")
+        + body
+    )
+
+
+async def _handle(
+    broadcaster: Broadcaster,
+    page: bytes,
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+) -> None:
+    try:
+        head = await reader.readuntil(b"\r\n\r\n")
+        method, path, _ = head.split(b"\r\n", 1)[0].decode("latin-1").split(" ", 2)
+        path = path.split("?", 1)[0]
+        if method != "GET":
+            _respond(writer, "405 Method Not Allowed", "text/plain", b"GET only\n")
+        elif path == "/":
+            _respond(writer, "200 OK", "text/html; charset=utf-8", page)
+        elif path == "/events":
+            await _send_events(broadcaster, writer)
+        else:
+            _respond(writer, "404 Not Found", "text/plain", b"not found\n")
+        await writer.drain()
+    except (
+        asyncio.IncompleteReadError,
+        asyncio.LimitOverrunError,
+        ConnectionError,
+        ValueError,
+    ):
+        pass
+    finally:
+        writer.close()
+
+
+def render_page(top_k: int = MAP_TOP_K) -> bytes:
+    """Live map HTML: Leaflet map fed by the /events stream."""
+    heat_json = json.dumps(generate_risk_heat_points())
+    html = f"""<!DOCTYPE html>
+<html>
+<head>
+  <meta charset="utf-8" />
+  <meta name="viewport" content="width=device-width, initial-scale=1.0">
+  <title>Port Botany UAV Threat Classification – Live</title>
+  <link rel="stylesheet" href="https://cdn.jsdelivr.net/npm/leaflet@1.9.3/dist/leaflet.css" />
+  <style>html, body, #map {{ height: 100%; margin: 0; padding: 0; }}</style>
+</head>
+<body>
+  <div id="map"></div>
+  <div id="sidebar" style="position:absolute;top:10px;right:10px;z-index:1000;background:white;padding:10px 12px;border-radius:6px;box-shadow:0 0 10px rgba(0,0,0,0.25);max-width:340px;font-family:Arial, sans-serif;font-size:13px;">
+    <h3 style="margin:0 0 6px 0;font-size:16px;">Live Drone Telemetry</h3>
+    <div id="status" style="color:#555;">Connecting…</div>
+    <div id="metrics-summary" style="max-height:300px;overflow-y:auto;"></div>
+  </div>
+
+  <script src="https://cdn.jsdelivr.net/npm/leaflet@1.9.3/dist/leaflet.js"></script>
+  <script src="https://unpkg.com/leaflet.heat/dist/leaflet-heat.js"></script>
+  <script>
+    const HEAT_POINTS = {heat_json};
+    const map = L.map('map').setView([{PORT_BOTANY_CENTER_LAT}, {PORT_BOTANY_CENTER_LON}], 13);
+    L.tileLayer('https://{{s}}.tile.openstreetmap.org/{{z}}/{{x}}/{{y}}.png', {{
+      maxZoom: 19,
+      attribution: '&copy; OpenStreetMap contributors'
+    }}).addTo(map);
+    L.heatLayer(HEAT_POINTS.map(p => [p.lat, p.lon, p.intensity * 1.5]), {{
+      radius: 14, blur: 12, maxZoom: 18, minOpacity: 0.5, max: 2.0,
+      gradient: {{ 0.0: '#330000', 0.4: '#990000', 0.7: '#cc0000', 1.0: '#ff0000' }}
+    }}).addTo(map);
+
+    // Trails keep the last TRAIL_POINTS fixes per drone
+    const TRAIL_POINTS = 120;
+    let drones = [];
+    let headlines = [];
+    const markers = [];
+    const trails = [];
+    const statusDiv = document.getElementById('status');
+    const metricsDiv = document.getElementById('metrics-summary');
+
+    const events = new EventSource('/events');
+    events.onerror = () => {{ statusDiv.textContent = 'Disconnected – retrying…'; }};
+
+    events.addEventListener('init', (e) => {{
+      const init = JSON.parse(e.data);
+      drones = init.drones;
+      headlines = init.headlines;
+      markers.forEach((m) => m.remove());
+      trails.forEach((t) => t.remove());
+      markers.length = 0;
+      trails.length = 0;
+      drones.forEach((d) => {{
+        const marker = L.circleMarker(map.getCenter(), {{
+          radius: 6, color: d.color, fillColor: d.color, fillOpacity: 0.9, weight: 2
+        }}).addTo(map);
+        marker.bindPopup(d.id + ' (' + (d.type === 'threat' ? 'THREAT' : 'INSPECTION') + ')');
+        markers.push(marker);
+        trails.push(L.polyline([], {{ color: d.color, weight: 3, opacity: 0.8 }}).addTo(map));
+      }});
+    }});
+
+    events.addEventListener('step', (e) => {{
+      if (!drones.length) return;  // no init yet
+      const s = JSON.parse(e.data);
+      for (let i = 0; i < drones.length; i++) {{
+        const latlng = [s.lat[i], s.lon[i]];
+        const isRisk = !!s.risk[i];
+        markers[i].setLatLng(latlng);
+        markers[i].setStyle({{ radius: isRisk ? 8 : 6, weight: isRisk ? 3 : 2 }});
+        const pts = trails[i].getLatLngs();
+        pts.push(L.latLng(latlng));
+        if (pts.length > TRAIL_POINTS) pts.shift();
+        trails[i].setLatLngs(pts);
+      }}
+      statusDiv.textContent = 'Step ' + (s.step + 1) + ' · ' + (s.timestamp || '');
+
+      const [level, action] = headlines[s.headline] || ['NONE', ''];
+      let html = '<div style="margin:6px 0 8px 0;padding:6px 8px;background:#111;color:#fff;border-radius:4px;font-size:12px;">' +
+        (level === 'NONE' || !s.top.length
+          ? 'Threat status: No active threat detected.'
+          : 'Highest threat: ' + drones[s.top[0]].id + ' – ' + level + '. ' + action) +
+        '</div>';
+      s.top.forEach((i) => {{
+        const d = drones[i];
+        html += '<div style="margin-bottom:6px;border-bottom:1px solid #eee;padding-bottom:4px;">' +
+          '<div style="font-weight:bold;">' + (d.type === 'threat' ? 'Threat' : 'Inspection') + ' – ' + d.id + '</div>' +
+          '<div>Status: ' + (s.risk[i] ? '<span style="color:#b30000;font-weight:bold;">HIGH‑RISK ZONE</span>' : 'Normal') + '</div>' +
+          '<div>Threat score: ' + s.score[i].toFixed(1) + '</div>' +
+          '<div>Sensor target: ' + (s.target[i] || '—') + '</div>' +
+          '</div>';
+      }});
+      metricsDiv.innerHTML = html;
+    }});
+  </script>
+</body>
+</html>
+"""
+    return html.encode("utf-8")
+
+
+async def run_live_map(
+    host: str,
+    port: int,
+    seed: int,
+    num_drones: int = NUM_DRONES,
+    num_threats: int = NUM_THREAT_DRONES,
+    num_steps: int = NUM_STEPS,
+    speed: float = 1.0,
+    top_k: int = MAP_TOP_K,
+) -> None:
+    """Serve the live map and run the simulation in real time (x speed)."""
+    loop = asyncio.get_running_loop()
+    broadcaster = Broadcaster()
+    page = render_page(top_k)
+    stop = threading.Event()
+    sink = LiveMapSink(broadcaster, loop, stop, top_k, SECONDS_PER_STEP / speed)
+
+    def simulate() -> None:
+        try:
+            stream_simulation([sink], seed, num_drones, num_threats, num_steps)
+        except _Stopped:
+            pass
+
+    server = await asyncio.start_server(
+        lambda r, w: _handle(broadcaster, page, r, w),
+        host,
+        port,
+        limit=_MAX_REQUEST_BYTES,
+    )
+    LOGGER.info("Live map on http://%s:%d/ (seed %s)", host, port, seed)
+    worker = threading.Thread(target=simulate, name="live-map-sim", daemon=True)
+    worker.start()
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        stop.set()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Serve a live map of a running simulation.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=LIVE_MAP_PORT)
+    parser.add_argument("--seed", type=int, help="scenario seed (default: random)")
+    parser.add_argument("--drones", type=int, default=NUM_DRONES)
+    parser.add_argument("--threats", type=int, default=NUM_THREAT_DRONES)
+    parser.add_argument("--steps", type=int, default=NUM_STEPS)
+    parser.add_argument("--speed", type=float, default=1.0, help="simulated seconds per second")
+    parser.add_argument("--top-k", type=int, default=MAP_TOP_K)
+    args = parser.parse_args(argv)
+    seed = new_seed() if args.seed is None else args.seed
+    configure_console()
+    try:
+        asyncio.run(
+            run_live_map(
+                args.host,
+                args.port,
+                seed,
+                args.drones,
+                args.threats,
+                args.steps,
+                args.speed,
+                args.top_k,
+            )
+        )
+    except KeyboardInterrupt:
+        pass
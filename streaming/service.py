@@ -0,0 +1,357 @@
+"""
+Streaming telemetry service: newline-delimited JSON fixes in, scored
+records and alerts out.
+
+Input lines use the threat_telemetry.json record schema (timestamp_utc, lat,
+lon, altitude_m, drone_id; step and drone_type optional; other keys ignored)
+and arrive on stdin, a tailed file, or a local TCP / Unix socket. Each fix is
+enriched and scored on arrival (metrics.online) and written out as one JSON
+line, plus an alert line whenever a drone's threat level rises to ELEVATED
+or above.
+
+Readers feed a bounded asyncio queue: when scoring falls behind, readers
+block (and socket senders see TCP backpressure) instead of memory growing.
+The track table and line length are bounded too.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import stat
+import sys
+import time
+from collections import OrderedDict
+from typing import BinaryIO, List, Optional, Union
+
+from config.constants import (
+    SECONDS_PER_STEP,
+    STREAM_MAX_LINE_BYTES,
+    STREAM_MAX_TRACKS,
+    STREAM_QUEUE_SIZE,
+    STREAM_TAIL_POLL_S,
+    STREAM_TARGET_FIXES_PER_S,
+)
+from config.port_botany import LAT_MIN, LAT_MAX, LON_MIN, LON_MAX
+from export.json_export import telemetry_record
+from metrics.online import OnlineTracker
+from metrics.scoring import THREAT_LEVELS, threat_level
+
+_ALERT_RANK = THREAT_LEVELS.index("ELEVATED")
+
+
+class FixProcessor:
+    """Parse, enrich and score single fixes; emit output lines."""
+
+    def __init__(
+        self, max_tracks: int = STREAM_MAX_TRACKS, alerts_only: bool = False
+    ) -> None:
+        self.tracker = OnlineTracker(max_tracks)
+        self.alerts_only = alerts_only
+        self._levels: "OrderedDict[str, int]" = OrderedDict()
+        self.fixes = 0
+        self.rejected = 0
+        self.alerts = 0
+
+    def process(self, line: bytes) -> List[bytes]:
+        """Handle one input line; return zero or more output lines."""
+        if not line.strip():
+            return []
+        try:
+            fix = json.loads(line)
+            drone_id = str(fix["drone_id"])
+            lat = float(fix["lat"])
+            lon = float(fix["lon"])
+            altitude = float(fix["altitude_m"])
+            timestamp = str(fix["timestamp_utc"])
+            step = fix.get("step")
+            step = None if step is None else int(step)
+            drone_type = str(fix.get("drone_type", "unknown"))
+        except (ValueError, KeyError, TypeError, AttributeError):
+            self.rejected += 1
+            return []
+        if not (math.isfinite(lat) and math.isfinite(lon) and math.isfinite(altitude)):
+            # NaN / Infinity / 1e400 parse as floats but have no position
+            self.rejected += 1
+            return []
+
+        pos = self.tracker.update(drone_id, lat, lon, altitude, timestamp, step)
+        self.fixes += 1
+        level, action = threat_level(pos)
+
+        out = []
+        if not self.alerts_only:
+            record = {"type": "fix"}
+            record.update(telemetry_record(drone_id, drone_type, pos))
+            record["threat_score"] = pos["threat_score"]
+            record["threat_level"] = level
+            out.append(json.dumps(record).encode("utf-8") + b"\n")
+
+        rank = THREAT_LEVELS.index(level)
+        last_rank = self._levels.pop(drone_id, 0)
+        self._levels[drone_id] = rank
+        if len(self._levels) > self.tracker.max_tracks:
+            self._levels.popitem(last=False)
+        if rank >= _ALERT_RANK and rank > last_rank:
+            self.alerts += 1
+            alert = {
+                "type": "alert",
+                "drone_id": drone_id,
+                "timestamp_utc": timestamp,
+                "step": pos["step"],
+                "threat_level": level,
+                "action": action,
+                "threat_score": pos["threat_score"],
+                "lat": lat,
+                "lon": lon,
+                "nearest_high_risk": pos["sensor_target"],
+            }
+            out.append(json.dumps(alert).encode("utf-8") + b"\n")
+        return out
+
+    def summary(self) -> dict:
+        stats = {
+            "fixes": self.fixes,
+            "rejected": self.rejected,
+            "alerts": self.alerts,
+            "tracks": len(self.tracker),
+            "evicted_tracks": self.tracker.evicted,
+        }
+        stats["latency"] = self.tracker.latency().summary()
+        return stats
+
+
+async def _pump(reader: asyncio.StreamReader, queue: asyncio.Queue) -> None:
+    """
+    Copy lines from a stream into the queue until EOF. Lines over
+    STREAM_MAX_LINE_BYTES are dropped whole, as in _read_file.
+    """
+    discarding = False
+    while True:
+        try:
+            line = await reader.readuntil(b"\n")
+        except asyncio.IncompleteReadError as e:
+            # EOF: the last line may lack its newline
+            if e.partial and not discarding:
+                await queue.put(e.partial)
+            return
+        except asyncio.LimitOverrunError as e:
+            # Over-long line: drop what is buffered, skip up to its newline
+            await reader.readexactly(e.consumed)
+            discarding = True
+            continue
+        if discarding:
+            # Rest of an over-long line
+            discarding = False
+            continue
+        await queue.put(line)
+
+
+async def _read_file(
+    source: Union[str, int],
+    queue: asyncio.Queue,
+    follow: bool,
+    poll_s: float = STREAM_TAIL_POLL_S,
+) -> None:
+    """
+    Read a file (path or fd) line by line; with follow, wait for appended
+    lines. Lines over STREAM_MAX_LINE_BYTES are dropped whole: once one is
+    seen, reads are skipped up to and including its newline.
+    """
+    with open(source, "rb", closefd=not isinstance(source, int)) as f:
+        pending = b""
+        discarding = False
+        while True:
+            chunk = f.readline(STREAM_MAX_LINE_BYTES)
+            if not chunk:
+                if not follow:
+                    break
+                await asyncio.sleep(poll_s)
+                continue
+            complete = chunk.endswith(b"\n")
+            if discarding:
+                # Rest of an over-long line
+                discarding = not complete
+                continue
+            size = len(pending) + len(chunk)
+            if size > STREAM_MAX_LINE_BYTES or (not complete and size >= STREAM_MAX_LINE_BYTES):
+                # Over-long line: drop it and resynchronise at its newline
+                pending = b""
+                discarding = not complete
+                continue
+            if not complete and follow:
+                # Writer is mid-line: hold the fragment until it completes
+                pending += chunk
+                continue
+            line, pending = pending + chunk, b""
+            await queue.put(line)
+        if pending:
+            await queue.put(pending)
+
+
+async def _read_stdin(queue: asyncio.Queue) -> None:
+    mode = os.fstat(sys.stdin.fileno()).st_mode
+    if stat.S_ISREG(mode):
+        await _read_file(sys.stdin.fileno(), queue, follow=False)
+        return
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader(limit=STREAM_MAX_LINE_BYTES)
+    await loop.connect_read_pipe(
+        lambda: asyncio.StreamReaderProtocol(reader), sys.stdin.buffer
+    )
+    await _pump(reader, queue)
+
+
+async def _serve(queue: asyncio.Queue, tcp: Optional[str], unix: Optional[str]) -> None:
+    """Accept any number of local senders; runs until cancelled."""
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            await _pump(reader, queue)
+        finally:
+            writer.close()
+
+    if tcp:
+        host, _, port = tcp.rpartition(":")
+        server = await asyncio.start_server(
+            handle, host or "127.0.0.1", int(port), limit=STREAM_MAX_LINE_BYTES
+        )
+    else:
+        server = await asyncio.start_unix_server(
+            handle, unix, limit=STREAM_MAX_LINE_BYTES
+        )
+    async with server:
+        await server.serve_forever()
+
+
+async def _consume(
+    queue: asyncio.Queue, processor: FixProcessor, out: BinaryIO
+) -> None:
+    """Score queued lines; flush output whenever the queue drains."""
+    while True:
+        line = await queue.get()
+        if line is None:
+            break
+        try:
+            chunks = processor.process(line)
+        except Exception:
+            # One bad fix must not end the service
+            processor.rejected += 1
+            chunks = []
+        for chunk in chunks:
+            out.write(chunk)
+        if queue.empty():
+            out.flush()
+    out.flush()
+
+
+async def run_service(
+    processor: FixProcessor,
+    out: BinaryIO,
+    tail: Optional[str] = None,
+    tcp: Optional[str] = None,
+    unix: Optional[str] = None,
+    queue_size: int = STREAM_QUEUE_SIZE,
+) -> None:
+    """Run one source into the processor until the source ends."""
+    queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+    consumer = asyncio.create_task(_consume(queue, processor, out))
+    if tcp or unix:
+        source = _serve(queue, tcp, unix)
+    elif tail:
+        source = _read_file(tail, queue, follow=True)
+    else:
+        source = _read_stdin(queue)
+    reader = asyncio.ensure_future(source)
+    try:
+        # The consumer only returns on the end-of-input sentinel, so if it
+        # finishes first it crashed: surface that rather than keep reading
+        await asyncio.wait({reader, consumer}, return_when=asyncio.FIRST_COMPLETED)
+        if consumer.done():
+            consumer.result()
+        reader.result()
+    finally:
+        reader.cancel()
+        if not consumer.done():
+            await queue.put(None)
+            await consumer
+
+
+def _synthetic_fixes(num_drones: int, num_steps: int, seed: int) -> List[bytes]:
+    """Interleaved random-walk fixes inside the port box, in arrival order."""
+    rng = random.Random(seed)
+    state = [
+        [rng.uniform(LAT_MIN, LAT_MAX), rng.uniform(LON_MIN, LON_MAX)]
+        for _ in range(num_drones)
+    ]
+    lines = []
+    for step in range(num_steps):
+        ts = time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(step * SECONDS_PER_STEP))
+        for i, p in enumerate(state):
+            p[0] = min(LAT_MAX, max(LAT_MIN, p[0] + rng.uniform(-1e-4, 1e-4)))
+            p[1] = min(LON_MAX, max(LON_MIN, p[1] + rng.uniform(-1e-4, 1e-4)))
+            fix = {
+                "timestamp_utc": ts,
+                "lat": round(p[0], 4),
+                "lon": round(p[1], 4),
+                "altitude_m": 60.0,
+                "drone_id": f"SIM-{i:05d}",
+                "step": step,
+            }
+            lines.append(json.dumps(fix).encode("utf-8") + b"\n")
+    return lines
+
+
+def benchmark(num_drones: int, num_steps: int, seed: int = 0) -> dict:
+    """Single-core throughput of parse + enrich + score + serialise."""
+    lines = _synthetic_fixes(num_drones, num_steps, seed)
+    processor = FixProcessor()
+    start = time.perf_counter()
+    produced = 0
+    for line in lines:
+        produced += len(processor.process(line))
+    elapsed = time.perf_counter() - start
+    result = processor.summary()
+    result["output_lines"] = produced
+    result["elapsed_s"] = round(elapsed, 3)
+    result["fixes_per_s"] = round(len(lines) / elapsed, 1)
+    result["target_fixes_per_s"] = STREAM_TARGET_FIXES_PER_S
+    result["meets_target"] = result["fixes_per_s"] >= STREAM_TARGET_FIXES_PER_S
+    return result
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Score streaming drone fixes (JSONL).")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--tail", metavar="PATH", help="follow a JSONL file")
+    source.add_argument("--tcp", metavar="HOST:PORT", help="listen on a TCP socket")
+    source.add_argument("--unix", metavar="PATH", help="listen on a Unix socket")
+    source.add_argument(
+        "--benchmark", action="store_true", help="measure single-core throughput"
+    )
+    parser.add_argument("--output", metavar="PATH", help="append output here (default stdout)")
+    parser.add_argument("--alerts-only", action="store_true", help="emit alert lines only")
+    parser.add_argument("--queue-size", type=int, default=STREAM_QUEUE_SIZE)
+    parser.add_argument("--max-tracks", type=int, default=STREAM_MAX_TRACKS)
+    parser.add_argument("--drones", type=int, default=500, help="benchmark fleet size")
+    parser.add_argument("--steps", type=int, default=20, help="benchmark steps per drone")
+    args = parser.parse_args(argv)
+
+    if args.benchmark:
+        print(json.dumps(benchmark(args.drones, args.steps), indent=2))
+        return
+
+    processor = FixProcessor(args.max_tracks, args.alerts_only)
+    out = open(args.output, "ab") if args.output else sys.stdout.buffer
+    try:
+        asyncio.run(
+            run_service(processor, out, args.tail, args.tcp, args.unix, args.queue_size)
+        )
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if args.output:
+            out.close()
+        print(json.dumps(processor.summary()), file=sys.stderr)
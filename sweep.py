@@ -0,0 +1,11 @@
+"""
+UAV Threat Classification – weight sweep entry point.
+
+Scores cached fleet features under thousands of weight sets and alert
+thresholds, and ranks them by precision / recall and time-to-detect.
+"""
+
+from metrics.sweep import main
+
+if __name__ == "__main__":
+    main()
@@ -6,52 +6,34 @@
  * - Headline shows highest current threat
  * - No assumption that role === "threat"
  *
- * Expects globals: DRONES, droneLabels, maxSteps, metricsDiv
+ * Ranking and headline are precomputed in Python (metrics/ranking.py) and
+ * shipped as RANKING: top-K drone indices per step plus a headline code, so
+ * each frame only indexes arrays.
+ *
+ * Expects globals: DRONES (decoded column tracks), RANKING, droneLabels,
+ * maxSteps, metricsDiv
  */
 
 (function () {
   'use strict';
 
   function getOrderedByThreatScore(stepIdx) {
-    return DRONES.map(function (_, i) {
-      return i;
-    }).sort(function (a, b) {
-      const pa = DRONES[a].positions[stepIdx] || {};
-      const pb = DRONES[b].positions[stepIdx] || {};
-      const sa = typeof pa.threat_score === 'number' ? pa.threat_score : 0;
-      const sb = typeof pb.threat_score === 'number' ? pb.threat_score : 0;
-      return sb - sa;
-    });
+    const out = [];
+    for (let r = 0; r < RANKING.k; r++) {
+      const idx = RANKING.top[stepIdx * RANKING.k + r];
+      if (idx >= 0) out.push(idx);
+    }
+    return out;
   }
 
   function getThreatHeadline(orderedIdx, stepIdx) {
-    const topIdx = orderedIdx[0];
-    const topDrone = DRONES[topIdx];
-    const topPos = topDrone && topDrone.positions[stepIdx];
-    let headline = 'Threat status: No active threat detected.';
-
-    if (topPos && (topPos.threat_score || 0) > 2) {
-      const tt = typeof topPos.threat_time_s === 'number' ? topPos.threat_time_s : 0;
-      const inRisk = !!topPos.in_risk_zone;
-      let level = 'LOW';
-      let action = 'Monitoring from command centre.';
-
-      if (inRisk && tt >= 5 && tt < 15) {
-        level = 'ELEVATED';
-        action = 'Dispatching friendly drones to shadow and inspect behaviour.';
-      } else if (inRisk && tt >= 15 && tt < 30) {
-        level = 'HIGH';
-        action = 'Authorising intercept; EW / jamming or non‑kinetic effects.';
-      } else if (inRisk && tt >= 30) {
-        level = 'CRITICAL';
-        action = 'Air strike / hard‑kill option on table; neutralise immediately.';
-      } else if ((topPos.threat_score || 0) > 5) {
-        level = 'ELEVATED';
-        action = 'Investigating suspicious behaviour.';
-      }
-      headline = 'Highest threat: ' + topDrone.id + ' – ' + level + '. ' + action;
+    const headline = RANKING.headlines[RANKING.headline[stepIdx]];
+    const level = headline[0];
+    const action = headline[1];
+    if (level === 'NONE' || !orderedIdx.length) {
+      return 'Threat status: No active threat detected.';
     }
-    return headline;
+    return 'Highest threat: ' + DRONES[orderedIdx[0]].id + ' – ' + level + '. ' + action;
   }
 
   window.telemetry = {